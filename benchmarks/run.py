@@ -0,0 +1,205 @@
+"""
+Benchmark of reCAPTCHA fields validation against a local siteverify stub.
+
+    python -m benchmarks.run --concurrency 1,8,32 --latency 0.05
+
+Prints throughput and p50/p99 latency of serializer validation for every
+field, mode and concurrency level.
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from benchmarks.stub import StubServer
+from django.conf import settings
+
+
+def _configure(domain, options):
+    settings.configure(
+        INSTALLED_APPS=["drf_recaptcha"],
+        DRF_RECAPTCHA_SECRET_KEY="BENCHMARK",  # noqa: S106
+        DRF_RECAPTCHA_DOMAIN=domain,
+        DRF_RECAPTCHA_SCHEME="http",
+        DRF_RECAPTCHA_POOL_MAXSIZE=max(options.concurrency),
+        DRF_RECAPTCHA_RETRIES=options.retries,
+    )
+    django.setup()
+    # Failed verifications are counted, not logged.
+    logging.getLogger("drf_recaptcha").setLevel(logging.CRITICAL)
+
+
+def _make_serializers():
+    from drf_recaptcha.fields import ReCaptchaV2Field, ReCaptchaV3Field
+    from drf_recaptcha.serializers import ReCaptchaSerializerMixin
+    from rest_framework.serializers import Serializer
+
+    class V2Serializer(ReCaptchaSerializerMixin, Serializer):
+        recaptcha = ReCaptchaV2Field()
+
+    class V3Serializer(ReCaptchaSerializerMixin, Serializer):
+        recaptcha = ReCaptchaV3Field(action="bench")
+
+    return {"v2": V2Serializer, "v3": V3Serializer}
+
+
+def _make_serializer(serializer_class, version, request):
+    return serializer_class(
+        data={"recaptcha": f"{version}-{uuid.uuid4().hex}"},
+        context={"request": request},
+    )
+
+
+def _run_sync(serializer_class, version, request, concurrency, total):
+    def validate(_):
+        serializer = _make_serializer(serializer_class, version, request)
+        started = time.perf_counter()
+        is_valid = serializer.is_valid()
+        return time.perf_counter() - started, is_valid
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(validate, range(total)))
+
+
+async def _run_async(serializer_class, version, request, concurrency, total):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def validate():
+        async with semaphore:
+            serializer = _make_serializer(serializer_class, version, request)
+            started = time.perf_counter()
+            is_valid = await serializer.ais_valid()
+            return time.perf_counter() - started, is_valid
+
+    return await asyncio.gather(*(validate() for _ in range(total)))
+
+
+def _percentile(durations, percent):
+    return statistics.quantiles(durations, n=100, method="inclusive")[percent - 1]
+
+
+def _report(row):
+    sys.stdout.write(
+        "{mode:<6} {version:<3} {concurrency:>11} {total:>8} {failed:>7}"
+        " {rps:>10.1f} {p50:>9.2f} {p99:>9.2f}\n".format(**row),
+    )
+    sys.stdout.flush()
+
+
+def benchmark(options):
+    from rest_framework.test import APIRequestFactory
+
+    serializers = _make_serializers()
+    request = APIRequestFactory().post("/benchmark")
+
+    sys.stdout.write(
+        "mode   ver concurrency requests  failed    req/sec   p50, ms   p99, ms\n",
+    )
+    for mode in options.modes:
+        for version in options.fields:
+            for concurrency in options.concurrency:
+                args = (serializers[version], version, request, concurrency)
+                # Warm up connections and caches.
+                if mode == "sync":
+                    _run_sync(*args, concurrency)
+                else:
+                    asyncio.run(_run_async(*args, concurrency))
+
+                started = time.perf_counter()
+                if mode == "sync":
+                    results = _run_sync(*args, options.requests)
+                else:
+                    results = asyncio.run(_run_async(*args, options.requests))
+                elapsed = time.perf_counter() - started
+
+                durations = [duration * 1000 for duration, _ in results]
+                _report(
+                    {
+                        "mode": mode,
+                        "version": version,
+                        "concurrency": concurrency,
+                        "total": len(results),
+                        "failed": sum(not is_valid for _, is_valid in results),
+                        "rps": len(results) / elapsed,
+                        "p50": _percentile(durations, 50),
+                        "p99": _percentile(durations, 99),
+                    },
+                )
+
+
+def _comma_separated(cast):
+    def parse(value):
+        return [cast(item) for item in value.split(",")]
+
+    return parse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=500,
+        help="validations per run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=_comma_separated(int),
+        default=[1, 8, 32],
+        help="comma separated concurrency levels (default: 1,8,32)",
+    )
+    parser.add_argument(
+        "--modes",
+        type=_comma_separated(str),
+        default=["sync", "async"],
+        help="comma separated modes: sync, async (default: sync,async)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=_comma_separated(str),
+        default=["v2", "v3"],
+        help="comma separated fields: v2, v3 (default: v2,v3)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="stub response latency in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="random latency added up to seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="share of 503 responses of the stub (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=0,
+        help="DRF_RECAPTCHA_RETRIES (default: %(default)s)",
+    )
+    options = parser.parse_args(argv)
+
+    with StubServer(
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+    ) as server:
+        _configure(server.domain, options)
+        benchmark(options)
+
+
+if __name__ == "__main__":
+    main()
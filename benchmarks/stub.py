@@ -0,0 +1,73 @@
+"""
+Local stub of Google siteverify for benchmarks.
+
+Tokens starting with ``v3`` get a reCAPTCHA v3 response with score and
+action, others get a v2 one.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from drf_recaptcha.client import SITEVERIFY_PATH
+
+
+class _SiteverifyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, don't delay the body.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        token = parse_qs(body.decode("utf-8")).get("response", [""])[0]
+
+        server = self.server
+        delay = server.latency + random.uniform(0, server.jitter)  # noqa: S311
+        if delay:
+            time.sleep(delay)
+
+        if self.path != SITEVERIFY_PATH:
+            status, payload = 404, {}
+        elif random.random() < server.error_rate:  # noqa: S311
+            status, payload = 503, {}
+        elif token.startswith("v3"):
+            status, payload = 200, {"success": True, "score": 0.9, "action": "bench"}
+        else:
+            status, payload = 200, {"success": True}
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, *, latency=0.0, jitter=0.0, error_rate=0.0):
+        super().__init__(("127.0.0.1", 0), _SiteverifyHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+    @property
+    def domain(self):
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        super().__exit__(*args)
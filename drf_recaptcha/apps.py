@@ -8,3 +8,13 @@ class DRFreCaptchaConfig(AppConfig):
     def ready(self):
         # Add System checks
         from .checks import recaptcha_system_check  # noqa: F401
+
+        # Build settings snapshot, it's rebuilt on settings change
+        from .conf import get_settings
+
+        get_settings()
+
+        # Compile trusted proxy networks of DRF_RECAPTCHA_CLIENT_IP
+        from .clientip import get_client_ip_resolver
+
+        get_client_ip_resolver()
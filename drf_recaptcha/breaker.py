@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from django.core.cache import caches
+
+from drf_recaptcha.conf import get_component
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "drf_recaptcha:breaker:open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for requests to Google siteverify.
+
+    Calls are counted in a rolling window of ``window`` seconds. A call fails
+    if it raises or takes ``slow_call_duration`` seconds or longer. Once at
+    least ``minimum_calls`` were made and the share of failed ones reaches
+    ``failure_rate``, the breaker opens and calls are short-circuited with
+    ``CircuitOpenError``. After ``recovery_timeout`` seconds up to
+    ``half_open_calls`` trial calls are let through: a succeeded trial closes
+    the breaker, a failed one opens it again.
+
+    If ``cache`` is an alias from ``CACHES``, the open state is shared with
+    other processes using the same cache.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        failure_rate=0.5,
+        minimum_calls=20,
+        window=30,
+        slow_call_duration=None,
+        recovery_timeout=30,
+        half_open_calls=1,
+        cache=None,
+    ):
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.slow_call_duration = slow_call_duration
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = half_open_calls
+        self.cache_alias = cache
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        # Per-second [second, calls, failures] counters.
+        self._buckets = deque()
+
+    @property
+    def state(self):
+        return self._state
+
+    def _enter(self):
+        """
+        Return whether the call is a trial, ``None`` if the open state shared
+        in the cache should be checked.
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    raise CircuitOpenError
+                self._state = self.HALF_OPEN
+                self._half_open_in_flight = 0
+
+            if self._state == self.HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_calls:
+                    raise CircuitOpenError
+                self._half_open_in_flight += 1
+                return True
+
+        return None if self.cache_alias else False
+
+    def before_call(self):
+        """
+        Raise ``CircuitOpenError`` or return whether the call is a trial.
+        """
+        trial = self._enter()
+        if trial is None:
+            if caches[self.cache_alias].get(CACHE_KEY):
+                raise CircuitOpenError
+            return False
+        return trial
+
+    async def abefore_call(self):
+        trial = self._enter()
+        if trial is None:
+            if await caches[self.cache_alias].aget(CACHE_KEY):
+                raise CircuitOpenError
+            return False
+        return trial
+
+    def release_trial(self):
+        """
+        Let another trial through instead of a cancelled one, its outcome
+        is unknown.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    def _is_slow(self, duration):
+        return self.slow_call_duration is not None and (
+            duration >= self.slow_call_duration
+        )
+
+    def record_success(self, duration):
+        self._record(failed=self._is_slow(duration))
+
+    def record_failure(self):
+        self._record(failed=True)
+
+    async def arecord_success(self, duration):
+        await self._arecord(failed=self._is_slow(duration))
+
+    async def arecord_failure(self):
+        await self._arecord(failed=True)
+
+    def _record(self, *, failed):
+        if self._count_call(failed=failed) and self.cache_alias:
+            caches[self.cache_alias].set(CACHE_KEY, 1, self.recovery_timeout)
+
+    async def _arecord(self, *, failed):
+        if self._count_call(failed=failed) and self.cache_alias:
+            await caches[self.cache_alias].aset(CACHE_KEY, 1, self.recovery_timeout)
+
+    def _count_call(self, *, failed):
+        """
+        Return whether the breaker has opened.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if not failed:
+                    self._state = self.CLOSED
+                    self._buckets.clear()
+                    return False
+                return self._open()
+            if self._state == self.OPEN:
+                # The call was started before the breaker has opened.
+                return False
+            return self._count(failed=failed) and self._open()
+
+    def _count(self, *, failed):
+        now = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == now:
+            bucket = self._buckets[-1]
+        else:
+            bucket = [now, 0, 0]
+            self._buckets.append(bucket)
+        bucket[1] += 1
+        bucket[2] += failed
+
+        while self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+
+        calls = sum(bucket[1] for bucket in self._buckets)
+        failures = sum(bucket[2] for bucket in self._buckets)
+        return calls >= self.minimum_calls and failures / calls >= self.failure_rate
+
+    def _open(self):
+        logger.warning("reCAPTCHA circuit breaker is open.")
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._buckets.clear()
+        return True
+
+
+def get_breaker():
+    return get_component(
+        "circuit_breaker",
+        CircuitBreaker,
+        "DRF_RECAPTCHA_CIRCUIT_BREAKER",
+    )
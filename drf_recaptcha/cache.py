@@ -0,0 +1,57 @@
+import hashlib
+
+from django.core.cache import caches
+
+from drf_recaptcha import timing
+from drf_recaptcha.conf import get_settings
+
+# Verification results are cached by a hash of (secret key, token), so that
+# a token validated twice, e.g. on a client retry, is verified by Google once.
+
+
+def _get_cache():
+    alias = get_settings().cache_alias
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def _get_timeout():
+    return get_settings().cache_timeout
+
+
+def make_key(secret_key, token):
+    digest = hashlib.sha256(f"{secret_key}\0{token}".encode()).hexdigest()
+    return f"drf_recaptcha:response:{digest}"
+
+
+def get_response_data(secret_key, token):
+    cache = _get_cache()
+    if cache is None:
+        return None
+    with timing.measure("cache"):
+        return cache.get(make_key(secret_key, token))
+
+
+def set_response_data(secret_key, token, data):
+    cache = _get_cache()
+    if cache is None:
+        return
+    with timing.measure("cache"):
+        cache.set(make_key(secret_key, token), data, _get_timeout())
+
+
+async def aget_response_data(secret_key, token):
+    cache = _get_cache()
+    if cache is None:
+        return None
+    with timing.measure("cache"):
+        return await cache.aget(make_key(secret_key, token))
+
+
+async def aset_response_data(secret_key, token, data):
+    cache = _get_cache()
+    if cache is None:
+        return
+    with timing.measure("cache"):
+        await cache.aset(make_key(secret_key, token), data, _get_timeout())
@@ -29,4 +29,32 @@ def recaptcha_system_check(app_configs, **kwargs):
                 id="drf_recaptcha.recaptcha_test_key_error",
             ),
         )
+
+    cache_alias = getattr(settings, "DRF_RECAPTCHA_CACHE", None)
+    if cache_alias is not None and cache_alias not in settings.CACHES:
+        errors.append(
+            checks.Error(
+                f"settings.DRF_RECAPTCHA_CACHE '{cache_alias}' is not defined"
+                " in settings.CACHES.",
+                id="drf_recaptcha.recaptcha_cache_error",
+            ),
+        )
+
+    for setting, check_id in (
+        ("DRF_RECAPTCHA_RATE_LIMIT", "recaptcha_rate_limit_cache_error"),
+        ("DRF_RECAPTCHA_NEGATIVE_CACHE", "recaptcha_negative_cache_cache_error"),
+    ):
+        options = getattr(settings, setting, None)
+        if not isinstance(options, dict):
+            continue
+
+        alias = options.get("cache", "default")
+        if alias not in settings.CACHES:
+            errors.append(
+                checks.Error(
+                    f"settings.{setting} cache '{alias}' is not defined"
+                    " in settings.CACHES.",
+                    id=f"drf_recaptcha.{check_id}",
+                ),
+            )
     return errors
@@ -1,46 +1,134 @@
+import asyncio
+import contextvars
 import json
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
-from urllib.request import ProxyHandler, Request, build_opener
 
-from django.conf import settings
+from drf_recaptcha import cache, concurrency, signals, singleflight, timing
+from drf_recaptcha.breaker import get_breaker
+from drf_recaptcha.conf import get_settings
+from drf_recaptcha.executor import get_executor
+from drf_recaptcha.pool import ConnectError
+from drf_recaptcha.shedding import get_load_shedder
+from drf_recaptcha.transports import get_transport
 
-from drf_recaptcha.constants import DEFAULT_RECAPTCHA_DOMAIN
+SITEVERIFY_PATH = "/recaptcha/api/siteverify"
+REQUEST_HEADERS = {
+    "Content-type": "application/x-www-form-urlencoded",
+    "User-agent": "DRF reCAPTCHA",
+}
+
+_deadline = ContextVar("drf_recaptcha_deadline", default=None)
+
+
+_UNPARSED = object()
+
+
+def _parse_timestamp(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        # Python < 3.11 doesn't parse "Z".
+        timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
 
 
 class RecaptchaResponse:
-    def __init__(self, is_valid, error_codes=None, extra_data=None):
+    """
+    Response of siteverify: ``score`` and ``action`` (reCAPTCHA v3),
+    ``hostname`` and ``challenge_ts`` are taken from ``extra_data``,
+    ``challenge_ts`` is parsed to an aware ``datetime`` on first access.
+    """
+
+    __slots__ = (
+        "_challenge_ts",
+        "action",
+        "cached",
+        "error_codes",
+        "extra_data",
+        "hostname",
+        "is_valid",
+        "score",
+    )
+
+    def __init__(self, is_valid, error_codes=None, extra_data=None, *, cached=False):
         self.is_valid = is_valid
         self.error_codes = error_codes or []
         self.extra_data = extra_data or {}
+        self.cached = cached
+
+        score = self.extra_data.get("score")
+        self.score: float | None = None if score is None else float(score)
+        self.action: str | None = self.extra_data.get("action")
+        self.hostname: str | None = self.extra_data.get("hostname")
+        self._challenge_ts = _UNPARSED
 
+    @property
+    def challenge_ts(self) -> datetime | None:
+        if self._challenge_ts is _UNPARSED:
+            self._challenge_ts = _parse_timestamp(self.extra_data.get("challenge_ts"))
+        return self._challenge_ts
 
-def recaptcha_request(params):
-    request_object = Request(
-        url="https://{}/recaptcha/api/siteverify".format(
-            getattr(settings, "DRF_RECAPTCHA_DOMAIN", DEFAULT_RECAPTCHA_DOMAIN)
-        ),
-        data=params,
-        headers={
-            "Content-type": "application/x-www-form-urlencoded",
-            "User-agent": "DRF reCAPTCHA",
-        },
+    def get_age(self, now=None) -> float | None:
+        """
+        Return seconds since the challenge was solved or ``None`` if unknown.
+        """
+        if self.challenge_ts is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        return (now - self.challenge_ts).total_seconds()
+
+
+def _get_timeouts(deadline):
+    recaptcha_settings = get_settings()
+    connect_timeout = recaptcha_settings.connect_timeout
+    read_timeout = recaptcha_settings.read_timeout
+
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            msg = "verification deadline exceeded"
+            raise URLError(TimeoutError(msg))
+        connect_timeout = min(connect_timeout, remaining)
+        read_timeout = min(read_timeout, remaining)
+
+    return {"connect_timeout": connect_timeout, "read_timeout": read_timeout}
+
+
+def _get_url():
+    recaptcha_settings = get_settings()
+    return f"{recaptcha_settings.scheme}://{recaptcha_settings.domain}{SITEVERIFY_PATH}"
+
+
+def recaptcha_request(params, deadline=None):
+    # POST to Google endpoint with DRF_RECAPTCHA_TRANSPORT.
+    return get_transport().send(
+        _get_url(),
+        params,
+        REQUEST_HEADERS,
+        **_get_timeouts(deadline),
     )
 
-    # Add proxy values to opener if needed.
-    opener_args = []
-    proxies = getattr(settings, "DRF_RECAPTCHA_PROXY", {})
-    if proxies:
-        opener_args = [ProxyHandler(proxies)]
-    opener = build_opener(*opener_args)
-
-    # Get response from POST to Google endpoint.
-    return opener.open(
-        request_object,
-        timeout=getattr(settings, "DRF_RECAPTCHA_VERIFY_REQUEST_TIMEOUT", 10),
+
+async def arecaptcha_request(params, deadline=None):
+    return await get_transport().asend(
+        _get_url(),
+        params,
+        REQUEST_HEADERS,
+        **_get_timeouts(deadline),
     )
 
 
-def submit(recaptcha_response, secret_key, remoteip):
+def _encode_params(recaptcha_response, secret_key, remoteip):
     params = urlencode(
         {
             "secret": secret_key,
@@ -49,13 +137,264 @@ def submit(recaptcha_response, secret_key, remoteip):
         }
     )
 
-    params = params.encode("utf-8")
+    return params.encode("utf-8")
+
 
-    response = recaptcha_request(params)
-    data = json.loads(response.read().decode("utf-8"))
-    response.close()
+def _parse_response(data, *, cached=False):
+    data = dict(data)
     return RecaptchaResponse(
         is_valid=data.pop("success"),
         error_codes=data.pop("error-codes", None),
         extra_data=data,
+        cached=cached,
+    )
+
+
+@contextmanager
+def deadline(value):
+    """
+    Limit verifications within the block, including retries, to finish
+    by ``value``, a ``time.monotonic()`` timestamp. The earlier deadline of
+    nested blocks is used, ``None`` keeps the outer one.
+    """
+    current = _deadline.get()
+    if value is None or (current is not None and current < value):
+        value = current
+    token = _deadline.set(value)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _get_deadline():
+    value = _deadline.get()
+    verify_deadline = get_settings().verify_deadline
+    if verify_deadline is not None:
+        settings_value = time.monotonic() + verify_deadline
+        value = settings_value if value is None else min(value, settings_value)
+    return value
+
+
+def _get_retry_delay(attempt, deadline):
+    """
+    Return delay before the next attempt or ``None`` if there is no time
+    or attempts left.
+    """
+    recaptcha_settings = get_settings()
+    if attempt >= recaptcha_settings.retries:
+        return None
+
+    # Exponential backoff with full jitter.
+    delay = random.uniform(0, recaptcha_settings.retry_backoff * 2**attempt)  # noqa: S311
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        return None
+    return delay
+
+
+def _is_retryable(error):
+    if isinstance(error, HTTPError):
+        return error.code >= 500  # noqa: PLR2004
+    # Otherwise the request could have been processed, the token is spent.
+    return isinstance(error, ConnectError)
+
+
+def _start_request(breaker, trial):
+    shedder = get_load_shedder()
+    if shedder is not None:
+        shedder.request_started()
+    return breaker, trial, shedder, time.monotonic()
+
+
+def _begin_request():
+    breaker = get_breaker()
+    trial = breaker.before_call() if breaker is not None else False
+    return _start_request(breaker, trial)
+
+
+async def _abegin_request():
+    breaker = get_breaker()
+    trial = await breaker.abefore_call() if breaker is not None else False
+    return _start_request(breaker, trial)
+
+
+def _end_request(request, attempt, error):
+    duration = time.monotonic() - request[3]
+    signals.siteverify_request_finished.send(
+        sender=None,
+        duration=duration,
+        attempt=attempt,
+        error=error,
+    )
+    return duration
+
+
+def _cancel_request(request):
+    # Cancelled, e.g. by a client disconnect, the outcome is unknown.
+    breaker, trial, _, _ = request
+    if trial:
+        breaker.release_trial()
+
+
+def _release_request(request):
+    # Called in ``finally``, the in-flight count must not leak on cancel.
+    _, _, shedder, started = request
+    if shedder is not None:
+        shedder.request_finished(time.monotonic() - started)
+
+
+def _finish_request(request, attempt, error=None):
+    breaker = request[0]
+    duration = _end_request(request, attempt, error)
+    if breaker is not None:
+        if error is None:
+            breaker.record_success(duration)
+        else:
+            breaker.record_failure()
+
+
+async def _afinish_request(request, attempt, error=None):
+    breaker = request[0]
+    duration = _end_request(request, attempt, error)
+    if breaker is not None:
+        if error is None:
+            await breaker.arecord_success(duration)
+        else:
+            await breaker.arecord_failure()
+
+
+def _verify_once(params, deadline, attempt):
+    request = _begin_request()
+    try:
+        with timing.measure("siteverify"):
+            response = recaptcha_request(params, deadline)
+    except Exception as exc:
+        _finish_request(request, attempt, exc)
+        raise
+    except BaseException:
+        _cancel_request(request)
+        raise
+    finally:
+        _release_request(request)
+    _finish_request(request, attempt)
+    with timing.measure("parse"):
+        return json.loads(response.data.decode("utf-8"))
+
+
+async def _averify_once(params, deadline, attempt):
+    request = await _abegin_request()
+    try:
+        with timing.measure("siteverify"):
+            response = await arecaptcha_request(params, deadline)
+    except Exception as exc:
+        await _afinish_request(request, attempt, exc)
+        raise
+    except BaseException:
+        _cancel_request(request)
+        raise
+    finally:
+        _release_request(request)
+    await _afinish_request(request, attempt)
+    with timing.measure("parse"):
+        return json.loads(response.data.decode("utf-8"))
+
+
+def _verify(params):
+    deadline = _get_deadline()
+    attempt = 0
+    while True:
+        try:
+            return _verify_once(params, deadline, attempt)
+        except URLError as err:
+            delay = _get_retry_delay(attempt, deadline) if _is_retryable(err) else None
+            if delay is None:
+                raise
+        timing.record("backoff", delay)
+        time.sleep(delay)
+        attempt += 1
+
+
+async def _averify(params):
+    deadline = _get_deadline()
+    attempt = 0
+    while True:
+        try:
+            return await _averify_once(params, deadline, attempt)
+        except URLError as err:
+            delay = _get_retry_delay(attempt, deadline) if _is_retryable(err) else None
+            if delay is None:
+                raise
+        timing.record("backoff", delay)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def submit(recaptcha_response, secret_key, remoteip):
+    data = cache.get_response_data(secret_key, recaptcha_response)
+    if data is not None:
+        return _parse_response(data, cached=True)
+
+    def verify():
+        with concurrency.limit():
+            data = _verify(_encode_params(recaptcha_response, secret_key, remoteip))
+        cache.set_response_data(secret_key, recaptcha_response, data)
+        return data
+
+    key = (cache.make_key(secret_key, recaptcha_response), remoteip)
+    return _parse_response(singleflight.do(key, verify))
+
+
+async def asubmit(recaptcha_response, secret_key, remoteip):
+    data = await cache.aget_response_data(secret_key, recaptcha_response)
+    if data is not None:
+        return _parse_response(data, cached=True)
+
+    async def averify():
+        async with concurrency.alimit():
+            data = await _averify(
+                _encode_params(recaptcha_response, secret_key, remoteip)
+            )
+        await cache.aset_response_data(secret_key, recaptcha_response, data)
+        return data
+
+    key = (cache.make_key(secret_key, recaptcha_response), remoteip)
+    return _parse_response(await singleflight.ado(key, averify))
+
+
+def submit_many(requests):
+    """
+    Verify ``(recaptcha_response, secret_key, remoteip)`` requests
+    concurrently on the background threads. Return a list of
+    ``RecaptchaResponse`` or raised exceptions in the order of requests.
+    """
+    executor = get_executor()
+    # Deadlines and timings of the caller apply to the background threads.
+    futures = [
+        executor.submit(contextvars.copy_context().run, submit, *request)
+        for request in requests
+    ]
+
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:  # noqa: BLE001, PERF203
+            results.append(exc)
+    return results
+
+
+async def asubmit_many(requests):
+    """
+    Same as ``submit_many``, but runs at most ``DRF_RECAPTCHA_MAX_WORKERS``
+    verifications at once without blocking the event loop.
+    """
+    semaphore = asyncio.Semaphore(get_settings().max_workers)
+
+    async def limited_asubmit(request):
+        async with semaphore:
+            return await asubmit(*request)
+
+    return await asyncio.gather(
+        *(limited_asubmit(request) for request in requests),
+        return_exceptions=True,
     )
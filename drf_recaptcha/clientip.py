@@ -0,0 +1,103 @@
+import ipaddress
+
+from ipware import get_client_ip
+from rest_framework.request import Request
+
+from drf_recaptcha.conf import get_component
+
+DEFAULT_HEADER = "HTTP_X_FORWARDED_FOR"
+
+_UNRESOLVED = object()
+
+
+class NetworkSet:
+    """
+    Networks compiled to sets of prefixes per prefix length, an address is
+    looked up with a set lookup per distinct prefix length.
+    """
+
+    def __init__(self, networks):
+        prefixes = {}
+        for value in networks:
+            network = ipaddress.ip_network(value, strict=False)
+            shift = network.max_prefixlen - network.prefixlen
+            prefixes.setdefault(network.version, {}).setdefault(shift, set()).add(
+                int(network.network_address) >> shift,
+            )
+        # {version: [(shift, {address >> shift of networks})]}
+        self._prefixes = {
+            version: sorted(shifts.items()) for version, shifts in prefixes.items()
+        }
+
+    def __contains__(self, address):
+        value = int(address)
+        return any(
+            value >> shift in prefixes
+            for shift, prefixes in self._prefixes.get(address.version, ())
+        )
+
+
+def _parse_address(value):
+    try:
+        address = ipaddress.ip_address(value.strip())
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped is not None:  # noqa: PLR2004
+        return address.ipv4_mapped
+    return address
+
+
+class ClientIPResolver:
+    """
+    Client IP address resolver behind trusted proxies.
+
+    If ``REMOTE_ADDR`` is within ``trusted_proxies`` networks, addresses of
+    ``header`` (``X-Forwarded-For`` by default) are walked from the right,
+    the first one not within ``trusted_proxies`` is the client. Otherwise
+    ``REMOTE_ADDR`` is the client, so the header can't be spoofed.
+    """
+
+    def __init__(self, *, trusted_proxies, header=DEFAULT_HEADER):
+        self.trusted_proxies = NetworkSet(trusted_proxies)
+        self.header = header
+
+    def resolve(self, meta):
+        address = _parse_address(meta.get("REMOTE_ADDR", ""))
+        if address is None or address not in self.trusted_proxies:
+            return None if address is None else str(address)
+
+        for value in reversed(meta.get(self.header, "").split(",")):
+            forwarded = _parse_address(value)
+            if forwarded is None:
+                break
+            address = forwarded
+            if address not in self.trusted_proxies:
+                break
+        return str(address)
+
+
+def get_client_ip_resolver():
+    return get_component(
+        "client_ip",
+        ClientIPResolver,
+        "DRF_RECAPTCHA_CLIENT_IP",
+    )
+
+
+def resolve(request):
+    """
+    Return the client IP address of ``request``, it's kept in
+    ``request.recaptcha_client_ip`` of the underlying ``HttpRequest``.
+    """
+    http_request = request._request if isinstance(request, Request) else request  # noqa: SLF001
+    client_ip = vars(http_request).get("recaptcha_client_ip", _UNRESOLVED)
+    if client_ip is not _UNRESOLVED:
+        return client_ip
+
+    resolver = get_client_ip_resolver()
+    if resolver is None:
+        client_ip, _ = get_client_ip(http_request)
+    else:
+        client_ip = resolver.resolve(http_request.META)
+    http_request.recaptcha_client_ip = client_ip
+    return client_ip
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from drf_recaptcha import timing
+from drf_recaptcha.conf import get_component
+
+
+class ConcurrencyLimitError(Exception):
+    pass
+
+
+class _AsyncWaiter:
+    # Waiter of an event loop, may be woken up from another thread.
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._granted = False
+        self.future = loop.create_future()
+
+    def set(self):
+        self._granted = True
+        self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        if not self.future.done():
+            self.future.set_result(True)
+
+    def is_set(self):
+        return self._granted
+
+
+class ConcurrencyLimiter:
+    """
+    Process-wide limit of verifications waiting for Google at once.
+
+    At most ``max_concurrent`` verifications run at once, threads and
+    coroutines alike. Up to ``max_queue`` more wait in a FIFO queue for
+    ``queue_timeout`` seconds at most, the rest is rejected right away.
+    """
+
+    def __init__(self, *, max_concurrent, max_queue=0, queue_timeout=1):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def active(self):
+        return self._active
+
+    @property
+    def queue_depth(self):
+        return len(self._waiters)
+
+    def _enter(self, waiter):
+        """
+        Return whether the slot is taken, ``None`` if queued.
+        """
+        with self._lock:
+            if self._active < self.max_concurrent:
+                self._active += 1
+                return True
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                return False
+            self._waiters.append(waiter)
+            return None
+
+    def _leave_queue(self, waiter):
+        # Return whether the slot was given to the waiter meanwhile.
+        with self._lock:
+            if waiter.is_set():
+                return True
+            self._waiters.remove(waiter)
+            self.timed_out += 1
+            return False
+
+    def acquire(self):
+        waiter = threading.Event()
+        acquired = self._enter(waiter)
+        if acquired is not None:
+            return acquired
+        return waiter.wait(self.queue_timeout) or self._leave_queue(waiter)
+
+    async def aacquire(self):
+        waiter = _AsyncWaiter(asyncio.get_running_loop())
+        acquired = self._enter(waiter)
+        if acquired is not None:
+            return acquired
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return self._leave_queue(waiter)
+        except asyncio.CancelledError:
+            if self._leave_queue(waiter):
+                self.release()
+            raise
+        return True
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                # The slot is handed over to the first waiter.
+                self._waiters.popleft().set()
+            else:
+                self._active -= 1
+
+
+def get_concurrency_limiter():
+    return get_component(
+        "concurrency_limit",
+        ConcurrencyLimiter,
+        "DRF_RECAPTCHA_CONCURRENCY_LIMIT",
+    )
+
+
+@contextmanager
+def limit():
+    """
+    Hold a slot of the limiter within the block, raise
+    ``ConcurrencyLimitError`` if it isn't available in time.
+    """
+    limiter = get_concurrency_limiter()
+    if limiter is None:
+        yield
+        return
+
+    with timing.measure("queue"):
+        acquired = limiter.acquire()
+    if not acquired:
+        raise ConcurrencyLimitError
+    try:
+        yield
+    finally:
+        limiter.release()
+
+
+@asynccontextmanager
+async def alimit():
+    limiter = get_concurrency_limiter()
+    if limiter is None:
+        yield
+        return
+
+    with timing.measure("queue"):
+        acquired = await limiter.aacquire()
+    if not acquired:
+        raise ConcurrencyLimitError
+    try:
+        yield
+    finally:
+        limiter.release()
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from drf_recaptcha.constants import (
+    DEFAULT_DNS_TTL,
+    DEFAULT_HAPPY_EYEBALLS_DELAY,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PASS_HEADER,
+    DEFAULT_PASS_MAX_AGE,
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_RECAPTCHA_DOMAIN,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_TOKEN_MAX_LENGTH,
+    DEFAULT_TOKEN_MIN_LENGTH,
+    DEFAULT_TOKEN_PATTERN,
+    DEFAULT_TRANSPORT,
+    RECAPTCHA_TOKEN_LIFETIME,
+)
+
+
+def validate_v3_settings_score_value(
+    value: int or float or None,
+    action: str | None = None,
+):
+    if value is None:
+        return
+
+    if not isinstance(value, int | float):
+        if action:
+            message = f"Score value for action '{action}' should be int or float"
+        else:
+            message = "Default score value should be int or float"
+
+        raise ImproperlyConfigured(message)
+
+    if value < 0.0 or value > 1.0:
+        if action:
+            message = f"Score value for action '{action}' should be between 0.0 - 1.0"
+        else:
+            message = "Default score value should be between 0.0 - 1.0"
+
+        raise ImproperlyConfigured(message)
+
+
+def _get_action_v3_scores():
+    scores = getattr(settings, "DRF_RECAPTCHA_ACTION_V3_SCORES", None)
+
+    if scores is None:
+        return MappingProxyType({})
+
+    if not isinstance(scores, dict):
+        msg = "DRF_RECAPTCHA_ACTION_V3_SCORES should be a dict."
+        raise ImproperlyConfigured(msg)
+
+    for action, score in scores.items():
+        validate_v3_settings_score_value(score, action)
+    return MappingProxyType(dict(scores))
+
+
+def _get_options(name):
+    options = getattr(settings, name, None)
+
+    if options is None:
+        return None
+
+    if not isinstance(options, dict):
+        msg = f"{name} should be a dict."
+        raise ImproperlyConfigured(msg)
+
+    return MappingProxyType(dict(options))
+
+
+def _get_pass_options():
+    options = _get_options("DRF_RECAPTCHA_PASS")
+
+    if options is None:
+        return None
+
+    unknown = set(options) - {"max_age", "header", "cookie"}
+    if unknown:
+        msg = f"DRF_RECAPTCHA_PASS has unknown options: {', '.join(sorted(unknown))}."
+        raise ImproperlyConfigured(msg)
+
+    return MappingProxyType(
+        {
+            "max_age": DEFAULT_PASS_MAX_AGE,
+            "header": DEFAULT_PASS_HEADER,
+            "cookie": None,
+            **options,
+        },
+    )
+
+
+def _get_transport_options():
+    options = getattr(settings, "DRF_RECAPTCHA_TRANSPORT_OPTIONS", {})
+
+    if not isinstance(options, dict):
+        msg = "DRF_RECAPTCHA_TRANSPORT_OPTIONS should be a dict."
+        raise ImproperlyConfigured(msg)
+
+    return MappingProxyType(dict(options))
+
+
+def _get_proxy(scheme, domain):
+    proxies = getattr(settings, "DRF_RECAPTCHA_PROXY", {})
+
+    if proxies:
+        proxy = proxies.get("https")
+    else:
+        # Like urllib, proxies of the environment are used by default.
+        proxy = getproxies().get(scheme)
+        if proxy and proxy_bypass(urlsplit(f"//{domain}").hostname):
+            proxy = None
+
+    if not proxy:
+        return None
+    # Schemeless "host:port" is an HTTP proxy, as for urllib.
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+def _get_token_pattern():
+    pattern = getattr(settings, "DRF_RECAPTCHA_TOKEN_PATTERN", DEFAULT_TOKEN_PATTERN)
+
+    if pattern is None:
+        return None
+
+    try:
+        return re.compile(pattern)
+    except (re.error, TypeError) as exc:
+        msg = f"DRF_RECAPTCHA_TOKEN_PATTERN is invalid: {exc}"
+        raise ImproperlyConfigured(msg) from exc
+
+
+def _get_allowed_hostnames():
+    hostnames = getattr(settings, "DRF_RECAPTCHA_ALLOWED_HOSTNAMES", None)
+
+    if hostnames is None:
+        return None
+
+    if isinstance(hostnames, str) or not all(isinstance(h, str) for h in hostnames):
+        msg = "DRF_RECAPTCHA_ALLOWED_HOSTNAMES should be a list of hostnames."
+        raise ImproperlyConfigured(msg)
+
+    return frozenset(hostname.lower() for hostname in hostnames)
+
+
+@dataclass(frozen=True)
+class RecaptchaSettings:
+    secret_key: str | None
+    testing: bool
+    testing_pass: bool
+    default_v3_score: int | float | None
+    action_v3_scores: MappingProxyType
+    domain: str
+    scheme: str
+    proxy: str | None
+    transport: str
+    transport_options: MappingProxyType
+    verify_request_timeout: int | float
+    connect_timeout: int | float
+    read_timeout: int | float
+    verify_deadline: int | float | None
+    retries: int
+    retry_backoff: int | float
+    pool_maxsize: int
+    pool_idle_timeout: int | float
+    dns_ttl: int | float | None
+    happy_eyeballs_delay: int | float | None
+    cache_alias: str | None
+    cache_timeout: int | float
+    circuit_breaker: MappingProxyType | None
+    rate_limit: MappingProxyType | None
+    negative_cache: MappingProxyType | None
+    load_shedding: MappingProxyType | None
+    concurrency_limit: MappingProxyType | None
+    client_ip: MappingProxyType | None
+    verified_pass: MappingProxyType | None
+    opentelemetry: bool
+    single_flight: bool
+    max_workers: int
+    token_min_length: int
+    token_max_length: int
+    token_pattern: re.Pattern | None
+    allowed_hostnames: frozenset | None
+    max_token_age: int | float | None
+
+    @classmethod
+    def from_django_settings(cls) -> RecaptchaSettings:
+        default_v3_score = getattr(settings, "DRF_RECAPTCHA_DEFAULT_V3_SCORE", None)
+        validate_v3_settings_score_value(default_v3_score)
+
+        domain = getattr(settings, "DRF_RECAPTCHA_DOMAIN", DEFAULT_RECAPTCHA_DOMAIN)
+        scheme = getattr(settings, "DRF_RECAPTCHA_SCHEME", "https")
+        timeout = getattr(settings, "DRF_RECAPTCHA_VERIFY_REQUEST_TIMEOUT", 10)
+
+        return cls(
+            secret_key=getattr(settings, "DRF_RECAPTCHA_SECRET_KEY", None),
+            testing=getattr(settings, "DRF_RECAPTCHA_TESTING", False),
+            testing_pass=getattr(settings, "DRF_RECAPTCHA_TESTING_PASS", True),
+            default_v3_score=default_v3_score,
+            action_v3_scores=_get_action_v3_scores(),
+            domain=domain,
+            scheme=scheme,
+            proxy=_get_proxy(scheme, domain),
+            transport=getattr(settings, "DRF_RECAPTCHA_TRANSPORT", DEFAULT_TRANSPORT),
+            transport_options=_get_transport_options(),
+            verify_request_timeout=timeout,
+            connect_timeout=getattr(settings, "DRF_RECAPTCHA_CONNECT_TIMEOUT", timeout),
+            read_timeout=getattr(settings, "DRF_RECAPTCHA_READ_TIMEOUT", timeout),
+            verify_deadline=getattr(settings, "DRF_RECAPTCHA_VERIFY_DEADLINE", None),
+            retries=getattr(settings, "DRF_RECAPTCHA_RETRIES", 0),
+            retry_backoff=getattr(
+                settings,
+                "DRF_RECAPTCHA_RETRY_BACKOFF",
+                DEFAULT_RETRY_BACKOFF,
+            ),
+            pool_maxsize=getattr(
+                settings,
+                "DRF_RECAPTCHA_POOL_MAXSIZE",
+                DEFAULT_POOL_MAXSIZE,
+            ),
+            pool_idle_timeout=getattr(
+                settings,
+                "DRF_RECAPTCHA_POOL_IDLE_TIMEOUT",
+                DEFAULT_POOL_IDLE_TIMEOUT,
+            ),
+            dns_ttl=getattr(settings, "DRF_RECAPTCHA_DNS_TTL", DEFAULT_DNS_TTL),
+            happy_eyeballs_delay=getattr(
+                settings,
+                "DRF_RECAPTCHA_HAPPY_EYEBALLS_DELAY",
+                DEFAULT_HAPPY_EYEBALLS_DELAY,
+            ),
+            cache_alias=getattr(settings, "DRF_RECAPTCHA_CACHE", None),
+            cache_timeout=min(
+                getattr(
+                    settings,
+                    "DRF_RECAPTCHA_CACHE_TIMEOUT",
+                    RECAPTCHA_TOKEN_LIFETIME,
+                ),
+                RECAPTCHA_TOKEN_LIFETIME,
+            ),
+            circuit_breaker=_get_options("DRF_RECAPTCHA_CIRCUIT_BREAKER"),
+            rate_limit=_get_options("DRF_RECAPTCHA_RATE_LIMIT"),
+            negative_cache=_get_options("DRF_RECAPTCHA_NEGATIVE_CACHE"),
+            load_shedding=_get_options("DRF_RECAPTCHA_LOAD_SHEDDING"),
+            concurrency_limit=_get_options("DRF_RECAPTCHA_CONCURRENCY_LIMIT"),
+            client_ip=_get_options("DRF_RECAPTCHA_CLIENT_IP"),
+            verified_pass=_get_pass_options(),
+            opentelemetry=getattr(settings, "DRF_RECAPTCHA_OPENTELEMETRY", False),
+            single_flight=getattr(settings, "DRF_RECAPTCHA_SINGLE_FLIGHT", False),
+            max_workers=getattr(
+                settings,
+                "DRF_RECAPTCHA_MAX_WORKERS",
+                DEFAULT_MAX_WORKERS,
+            ),
+            token_min_length=getattr(
+                settings,
+                "DRF_RECAPTCHA_TOKEN_MIN_LENGTH",
+                DEFAULT_TOKEN_MIN_LENGTH,
+            ),
+            token_max_length=getattr(
+                settings,
+                "DRF_RECAPTCHA_TOKEN_MAX_LENGTH",
+                DEFAULT_TOKEN_MAX_LENGTH,
+            ),
+            token_pattern=_get_token_pattern(),
+            allowed_hostnames=_get_allowed_hostnames(),
+            max_token_age=getattr(settings, "DRF_RECAPTCHA_MAX_TOKEN_AGE", None),
+        )
+
+
+_recaptcha_settings = None
+
+
+def get_settings() -> RecaptchaSettings:
+    """
+    Return the snapshot of DRF_RECAPTCHA_* settings.
+
+    The snapshot is built once and rebuilt after any of those settings is
+    changed, e.g. by ``override_settings``.
+    """
+    global _recaptcha_settings  # noqa: PLW0603
+    if _recaptcha_settings is None:
+        _recaptcha_settings = RecaptchaSettings.from_django_settings()
+    return _recaptcha_settings
+
+
+_components = {}
+_components_lock = threading.Lock()
+
+
+def get_keyed_component(name, key, factory, setting_name, *, close=None):
+    """
+    Return the process-wide component ``name`` built with ``factory()`` for
+    ``key``, a value of settings the component depends on.
+
+    The component is rebuilt once ``key`` changes, and the replaced one is
+    passed to ``close``. Errors of ``factory`` are reported as invalid
+    ``setting_name``.
+    """
+    component = _components.get(name)
+    if component is None or component[0] != key:
+        with _components_lock:
+            component = _components.get(name)
+            if component is None or component[0] != key:
+                if component is not None and close is not None:
+                    close(component[1])
+                try:
+                    component = (key, factory())
+                except (TypeError, ValueError) as exc:
+                    msg = f"{setting_name} is invalid: {exc}"
+                    raise ImproperlyConfigured(msg) from exc
+                _components[name] = component
+    return component[1]
+
+
+def get_component(setting_attr, factory, setting_name):
+    """
+    Return the process-wide ``factory(**options)`` built from options of the
+    ``setting_attr`` field of the snapshot or ``None`` if they aren't set.
+    """
+    options = getattr(get_settings(), setting_attr)
+    if options is None:
+        return None
+    return get_keyed_component(
+        setting_attr,
+        options,
+        lambda: factory(**options),
+        setting_name,
+    )
+
+
+def _reset_components_after_fork():
+    global _components, _components_lock  # noqa: PLW0603
+    _components = {}
+    _components_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_components_after_fork)
+
+
+@receiver(setting_changed)
+def reset_settings(*, setting, **kwargs):
+    global _recaptcha_settings  # noqa: PLW0603
+    if setting.startswith("DRF_RECAPTCHA_"):
+        _recaptcha_settings = None
@@ -10,6 +10,40 @@ TEST_V2_SECRET_KEY = "6LeIxAcTAAAAAGG-vFI1TnRWxMZNFuojJ4WifJWe"  # noqa: S105
 
 DEFAULT_RECAPTCHA_DOMAIN = "www.google.com"
 
+DEFAULT_TRANSPORT = "drf_recaptcha.transports.StdlibTransport"
+
+# Keep-alive connections to DRF_RECAPTCHA_DOMAIN are pooled per process.
+# Size is the number of idle connections kept, timeout is in seconds.
+
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_IDLE_TIMEOUT = 30
+
+# Addresses of DRF_RECAPTCHA_DOMAIN are cached per process for TTL seconds.
+# Connections to them are raced, the next address is tried after the delay
+# in seconds (RFC 8305 recommends 250 ms).
+
+DEFAULT_DNS_TTL = 60
+DEFAULT_HAPPY_EYEBALLS_DELAY = 0.25
+
+# Base delay in seconds between retries of failed requests, doubled on every
+# next retry, the actual delay is random between zero and that value.
+
+DEFAULT_RETRY_BACKOFF = 0.1
+
+# https://developers.google.com/recaptcha/docs/verify#token_restrictions
+#
+# Each reCAPTCHA user response token is valid for two minutes,
+# and can only be verified once.
+
+RECAPTCHA_TOKEN_LIFETIME = 120
+
+# User response tokens are URL-safe base64 strings of several hundred
+# characters. Malformed ones are rejected without a request to Google.
+
+DEFAULT_TOKEN_MIN_LENGTH = 1
+DEFAULT_TOKEN_MAX_LENGTH = 8192
+DEFAULT_TOKEN_PATTERN = r"[A-Za-z0-9_-]+"  # noqa: S105
+
 # https://developers.google.com/recaptcha/docs/v3
 #
 # reCAPTCHA v3 returns a score:
@@ -18,3 +52,34 @@ DEFAULT_RECAPTCHA_DOMAIN = "www.google.com"
 # Based on the score, you can take variable action in the context of your site.
 
 DEFAULT_V3_SCORE = 0.5
+
+# What to do with a verification while the circuit breaker is open:
+# reject it with "captcha_error" or let it through without verification.
+
+CIRCUIT_OPEN_REJECT = "reject"
+CIRCUIT_OPEN_ALLOW = "allow"
+
+# What to do with a verification skipped by load shedding: let it through
+# without verification or reject it with "captcha_error".
+
+SKIPPED_ALLOW = "allow"
+SKIPPED_REJECT = "reject"
+
+# When serializers with ReCaptchaSerializerMixin verify reCAPTCHA fields:
+# inline with field validation, last, only if all other fields and
+# validate() passed, or in background threads along with validation of
+# other fields.
+
+VERIFY_INLINE = "inline"
+VERIFY_LAST = "last"
+VERIFY_BACKGROUND = "background"
+
+# Signed "verified recently" passes are valid for max age seconds and sent
+# to clients in the header of responses.
+
+DEFAULT_PASS_MAX_AGE = 300
+DEFAULT_PASS_HEADER = "X-Recaptcha-Pass"  # noqa: S105
+
+# Threads verifying reCAPTCHA in background, per process.
+
+DEFAULT_MAX_WORKERS = 10
@@ -0,0 +1,268 @@
+"""
+Cached name resolution and Happy Eyeballs (RFC 8305) connection racing for
+connection pools.
+
+Addresses of a host are cached per process for ``ttl`` seconds. Connection
+attempts alternate between address families, the next attempt starts
+``delay`` seconds after the previous one or as soon as it fails, and the
+first established connection wins, so a black-holed address family costs
+``delay`` instead of the whole connect timeout.
+"""
+
+import asyncio
+import errno
+import os
+import selectors
+import socket
+import threading
+import time
+from itertools import chain, zip_longest
+
+from drf_recaptcha import timing
+from drf_recaptcha.constants import DEFAULT_DNS_TTL, DEFAULT_HAPPY_EYEBALLS_DELAY
+
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN}
+
+_addresses = {}
+_addresses_lock = threading.Lock()
+
+
+def _get_cached(host, port):
+    entry = _addresses.get((host, port))
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _set_cached(host, port, infos, ttl):
+    if ttl:
+        with _addresses_lock:
+            _addresses[host, port] = (time.monotonic() + ttl, infos)
+    return infos
+
+
+def resolve(host, port, ttl=DEFAULT_DNS_TTL):
+    """
+    Return ``getaddrinfo`` results for a TCP connection to the host, cached
+    for ``ttl`` seconds. Zero or ``None`` disables caching.
+    """
+    infos = _get_cached(host, port) if ttl else None
+    if infos is None:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        infos = _set_cached(host, port, infos, ttl)
+    return infos
+
+
+async def aresolve(host, port, ttl=DEFAULT_DNS_TTL):
+    infos = _get_cached(host, port) if ttl else None
+    if infos is None:
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        infos = _set_cached(host, port, infos, ttl)
+    return infos
+
+
+def clear():
+    with _addresses_lock:
+        _addresses.clear()
+
+
+def _interleave(infos):
+    # Alternate address families, starting with the first returned one.
+    families = {}
+    for info in infos:
+        families.setdefault(info[0], []).append(info)
+    return [
+        info
+        for info in chain.from_iterable(zip_longest(*families.values()))
+        if info is not None
+    ]
+
+
+def _raise_connect_error(errors):
+    if errors:
+        raise errors[-1]
+    msg = "getaddrinfo returns an empty list"
+    raise OSError(msg)
+
+
+def _start_attempt(info, source_address):
+    family, type_, proto, _, sockaddr = info
+    sock = socket.socket(family, type_, proto)
+    try:
+        sock.settimeout(0)
+        if source_address:
+            sock.bind(source_address)
+        error = sock.connect_ex(sockaddr)
+    except BaseException:
+        sock.close()
+        raise
+    if error and error not in _IN_PROGRESS:
+        sock.close()
+        raise OSError(error, os.strerror(error))
+    return sock
+
+
+def _start_next(infos, source_address, selector, attempts, errors):
+    # Start an attempt to the next address, False if none are left.
+    for info in infos:
+        try:
+            sock = _start_attempt(info, source_address)
+        except OSError as err:
+            errors.append(err)
+            continue
+        attempts.append(sock)
+        selector.register(sock, selectors.EVENT_WRITE)
+        return True
+    return False
+
+
+def _get_established(selector, attempts, errors, wait):
+    # Return the first established connection, collect failed attempts.
+    for key, _ in selector.select(wait):
+        sock = key.fileobj
+        selector.unregister(sock)
+        attempts.remove(sock)
+        error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if not error:
+            return sock
+        sock.close()
+        errors.append(OSError(error, os.strerror(error)))
+    return None
+
+
+def create_connection(
+    address,
+    timeout=None,
+    source_address=None,
+    *,
+    ttl=DEFAULT_DNS_TTL,
+    delay=DEFAULT_HAPPY_EYEBALLS_DELAY,
+):
+    """
+    Drop-in replacement of ``socket.create_connection`` racing connections
+    to the addresses of the host. ``timeout`` limits the whole race, ``None``
+    ``delay`` tries addresses one after another.
+    """
+    host, port = address
+    with timing.measure("dns"):
+        infos = resolve(host, port, ttl)
+    with timing.measure("connect"):
+        return _race(_interleave(infos), timeout, source_address, delay)
+
+
+def _race(infos, timeout, source_address, delay):
+    infos = iter(infos)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    errors = []
+    attempts = []
+    next_attempt_at = None
+
+    with selectors.DefaultSelector() as selector:
+        try:
+            while True:
+                now = time.monotonic()
+                if not attempts or (
+                    next_attempt_at is not None and now >= next_attempt_at
+                ):
+                    started = _start_next(
+                        infos, source_address, selector, attempts, errors
+                    )
+                    if not attempts:
+                        _raise_connect_error(errors)
+                    next_attempt_at = None
+                    if started and delay is not None:
+                        next_attempt_at = now + delay
+
+                if deadline is not None and now >= deadline:
+                    msg = "timed out"
+                    raise TimeoutError(msg)
+
+                waits = [
+                    at - now for at in (next_attempt_at, deadline) if at is not None
+                ]
+                failed = len(errors)
+                sock = _get_established(
+                    selector,
+                    attempts,
+                    errors,
+                    max(min(waits), 0) if waits else None,
+                )
+                if sock is not None:
+                    sock.settimeout(timeout)
+                    return sock
+                if len(errors) > failed:
+                    # Start the next attempt right away.
+                    next_attempt_at = now
+        finally:
+            for sock in attempts:
+                sock.close()
+
+
+async def _aconnect(info):
+    family, type_, proto, _, sockaddr = info
+    sock = socket.socket(family, type_, proto)
+    try:
+        sock.settimeout(0)
+        await asyncio.get_running_loop().sock_connect(sock, sockaddr)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+async def acreate_connection(
+    host,
+    port,
+    *,
+    ttl=DEFAULT_DNS_TTL,
+    delay=DEFAULT_HAPPY_EYEBALLS_DELAY,
+):
+    """
+    asyncio counterpart of ``create_connection`` returning a connected
+    non-blocking socket, limit it with ``asyncio.wait_for``.
+    """
+    with timing.measure("dns"):
+        infos = await aresolve(host, port, ttl)
+    with timing.measure("connect"):
+        return await _arace(_interleave(infos), delay)
+
+
+async def _arace(infos, delay):
+    infos = iter(infos)
+    errors = []
+    pending = set()
+    try:
+        while True:
+            info = next(infos, None)
+            if info is not None:
+                pending.add(asyncio.ensure_future(_aconnect(info)))
+            elif not pending:
+                _raise_connect_error(errors)
+
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=delay if info is not None else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            connected = [task.result() for task in done if not task.exception()]
+            errors.extend(task.exception() for task in done if task.exception())
+            if connected:
+                for sock in connected[1:]:
+                    sock.close()
+                return connected[0]
+    finally:
+        for task in pending:
+            task.cancel()
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, socket.socket):
+                result.close()
+
+
+def _reset_addresses_after_fork():
+    global _addresses_lock  # noqa: PLW0603
+    _addresses_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_addresses_after_fork)
@@ -0,0 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from drf_recaptcha.conf import get_keyed_component, get_settings
+
+
+def get_executor():
+    """
+    Return the process-wide thread pool of ``DRF_RECAPTCHA_MAX_WORKERS``
+    threads verifying reCAPTCHA in background.
+    """
+    max_workers = get_settings().max_workers
+    return get_keyed_component(
+        "executor",
+        max_workers,
+        partial(ThreadPoolExecutor, max_workers, thread_name_prefix="drf_recaptcha"),
+        "DRF_RECAPTCHA_MAX_WORKERS",
+        close=partial(ThreadPoolExecutor.shutdown, wait=False),
+    )
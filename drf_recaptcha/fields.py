@@ -1,80 +1,107 @@
 from __future__ import annotations
 
-from django.conf import settings
-from django.core.exceptions import ImproperlyConfigured
+from rest_framework.fields import empty
 from rest_framework.serializers import CharField
 
-from drf_recaptcha.constants import DEFAULT_V3_SCORE
-from drf_recaptcha.validators import ReCaptchaV2Validator, ReCaptchaV3Validator
-
-
-class ReCaptchaV2Field(CharField):
-    def __init__(self, secret_key: str | None = None, **kwargs):
-        super().__init__(**kwargs)
+from drf_recaptcha import passes
+from drf_recaptcha.conf import get_settings, validate_v3_settings_score_value
+from drf_recaptcha.constants import CIRCUIT_OPEN_REJECT, DEFAULT_V3_SCORE
+from drf_recaptcha.validators import (
+    RecaptchaResult,
+    ReCaptchaV2Validator,
+    ReCaptchaV3Validator,
+    ReCaptchaValidator,
+    defer_verifications,
+)
+
+
+class ReCaptchaField(CharField):
+    # Result of the last validation run, set by the validator.
+    recaptcha_result: RecaptchaResult | None = None
+
+    def run_validation(self, data=empty):
+        self.recaptcha_result = None
+        if self._has_accepted_pass():
+            # Verified recently, the token isn't needed.
+            return None if data is empty else data
+        return super().run_validation(data)
+
+    def _has_accepted_pass(self) -> bool:
+        if not passes.is_enabled():
+            return False
+
+        request = self.context.get("request")
+        pass_data = passes.load(request)
+        if pass_data is None:
+            return False
+
+        validators = [
+            validator
+            for validator in self.validators
+            if isinstance(validator, ReCaptchaValidator)
+        ]
+        if not validators or not all(
+            validator.accepts_pass(pass_data, self) for validator in validators
+        ):
+            return False
+
+        self.recaptcha_result = RecaptchaResult(
+            outcome="pass",
+            score=pass_data.get("score"),
+            action=pass_data.get("action"),
+            cached=True,
+        )
+        return True
 
-        self.write_only = True
+    async def arun_validation(self, data=empty):
+        """
+        Same as ``run_validation``, but verifies reCAPTCHA without blocking
+        the event loop.
+        """
+        with defer_verifications() as deferred:
+            value = self.run_validation(data)
 
-        secret_key = secret_key or settings.DRF_RECAPTCHA_SECRET_KEY
+        for validator, deferred_value, serializer_field in deferred:
+            await validator.acall(deferred_value, serializer_field)
 
-        validator = ReCaptchaV2Validator(secret_key=secret_key)
-        self.validators.append(validator)
+        return value
 
 
-def validate_v3_settings_score_value(
-    value: int or float or None,
-    action: str | None = None,
-):
-    if value is None:
-        return
-
-    if not isinstance(value, int | float):
-        if action:
-            message = f"Score value for action '{action}' should be int or float"
-        else:
-            message = "Default score value should be int or float"
+class ReCaptchaV2Field(ReCaptchaField):
+    def __init__(
+        self,
+        secret_key: str | None = None,
+        circuit_open_policy: str = CIRCUIT_OPEN_REJECT,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
 
-        raise ImproperlyConfigured(message)
+        self.write_only = True
 
-    if value < 0.0 or value > 1.0:
-        if action:
-            message = f"Score value for action '{action}' should be between 0.0 - 1.0"
-        else:
-            message = "Default score value should be between 0.0 - 1.0"
+        secret_key = secret_key or get_settings().secret_key
 
-        raise ImproperlyConfigured(message)
+        validator = ReCaptchaV2Validator(
+            secret_key=secret_key,
+            circuit_open_policy=circuit_open_policy,
+        )
+        self.validators.append(validator)
 
 
 def get_v3_action_score_from_settings(action: str) -> int or float or None:
-    scores_from_settings = getattr(settings, "DRF_RECAPTCHA_ACTION_V3_SCORES", None)
-
-    if scores_from_settings is None:
-        return None
-
-    if not isinstance(scores_from_settings, dict):
-        msg = "DRF_RECAPTCHA_ACTION_V3_SCORES should be a dict."
-        raise ImproperlyConfigured(msg)
-
-    action_score_from_settings = scores_from_settings.get(action, None)
-    validate_v3_settings_score_value(action_score_from_settings, action)
-    return action_score_from_settings
+    return get_settings().action_v3_scores.get(action, None)
 
 
 def get_v3_default_score_from_settings() -> int or float or None:
-    default_score_from_settings = getattr(
-        settings,
-        "DRF_RECAPTCHA_DEFAULT_V3_SCORE",
-        None,
-    )
-    validate_v3_settings_score_value(default_score_from_settings)
-    return default_score_from_settings
+    return get_settings().default_v3_score
 
 
-class ReCaptchaV3Field(CharField):
+class ReCaptchaV3Field(ReCaptchaField):
     def __init__(
         self,
         action: str,
         required_score: float | None = None,
         secret_key: str | None = None,
+        circuit_open_policy: str = CIRCUIT_OPEN_REJECT,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -99,22 +126,26 @@ class ReCaptchaV3Field(CharField):
             )
         )
 
-        secret_key = secret_key or settings.DRF_RECAPTCHA_SECRET_KEY
+        secret_key = secret_key or get_settings().secret_key
 
-        self.__validator = ReCaptchaV3Validator(
+        validator = ReCaptchaV3Validator(
             action=action,
             required_score=self.required_score,
             secret_key=secret_key,
+            circuit_open_policy=circuit_open_policy,
         )
-        self.validators.append(self.__validator)
+        self.validators.append(validator)
 
     @property
     def score(self):
-        score = self.__validator.score
-        if score is None:
+        """
+        Score of the last validation, ``None`` if Google wasn't asked for
+        it, e.g. on the ``circuit_open`` or ``skipped`` outcome.
+        """
+        if self.recaptcha_result is None:
             msg = (
                 "You must call the serializer `.is_valid()` method before "
                 "attempting to access the `.score` property of this field."
             )
             raise AssertionError(msg)
-        return score
+        return self.recaptcha_result.score
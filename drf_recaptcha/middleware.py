@@ -0,0 +1,55 @@
+from drf_recaptcha import timing
+from drf_recaptcha.conf import get_settings
+
+
+class ReCaptchaPassMiddleware:
+    """
+    Send passes issued while handling a request in the header and,
+    if ``cookie`` option is set, in the cookie of the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        token = getattr(request, "recaptcha_pass", None)
+        options = get_settings().verified_pass
+        if token is None or options is None:
+            return response
+
+        response[options["header"]] = token
+        if options["cookie"]:
+            response.set_cookie(
+                options["cookie"],
+                token,
+                max_age=options["max_age"],
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ReCaptchaServerTimingMiddleware:
+    """
+    Send durations of verification stages made while handling a request in
+    the ``Server-Timing`` header of the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        timings = getattr(request, "recaptcha_timings", None)
+        if not timings:
+            return response
+
+        server_timing = timing.format_server_timing(timings)
+        if response.has_header("Server-Timing"):
+            server_timing = f"{response['Server-Timing']}, {server_timing}"
+        response["Server-Timing"] = server_timing
+        return response
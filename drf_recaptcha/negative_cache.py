@@ -0,0 +1,115 @@
+from django.core.cache import caches
+
+from drf_recaptcha.conf import get_component
+
+
+class NegativeCache:
+    """
+    Negative cache of clients failing verifications again and again.
+
+    Once a client IP address (and action, if ``per_action``) failed
+    ``failures`` verifications within ``window`` seconds since the first of
+    them, it is blocked for ``cooldown`` seconds. Counters are stored in the
+    ``cache`` alias from ``CACHES``, so that they are shared between
+    processes using the same cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        failures=5,
+        window=300,
+        cooldown=600,
+        per_action=False,
+        cache="default",
+    ):
+        self.failures = failures
+        self.window = window
+        self.cooldown = cooldown
+        self.per_action = per_action
+        self.cache_alias = cache
+
+    def make_key(self, client_ip, action):
+        if not client_ip:
+            return None
+        if self.per_action:
+            return f"drf_recaptcha:negative:{client_ip}:{action or ''}"
+        return f"drf_recaptcha:negative:{client_ip}"
+
+    def is_blocked(self, client_ip, action):
+        key = self.make_key(client_ip, action)
+        return key is not None and bool(caches[self.cache_alias].get(f"{key}:blocked"))
+
+    async def ais_blocked(self, client_ip, action):
+        key = self.make_key(client_ip, action)
+        if key is None:
+            return False
+        return bool(await caches[self.cache_alias].aget(f"{key}:blocked"))
+
+    def record_failure(self, client_ip, action):
+        key = self.make_key(client_ip, action)
+        if key is None:
+            return
+
+        cache = caches[self.cache_alias]
+        cache.add(key, 0, self.window)
+        try:
+            failures = cache.incr(key)
+        except ValueError:
+            # Expired in between.
+            cache.set(key, 1, self.window)
+            failures = 1
+
+        if failures >= self.failures:
+            cache.set(f"{key}:blocked", 1, self.cooldown)
+            cache.delete(key)
+
+    async def arecord_failure(self, client_ip, action):
+        key = self.make_key(client_ip, action)
+        if key is None:
+            return
+
+        cache = caches[self.cache_alias]
+        await cache.aadd(key, 0, self.window)
+        try:
+            failures = await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, self.window)
+            failures = 1
+
+        if failures >= self.failures:
+            await cache.aset(f"{key}:blocked", 1, self.cooldown)
+            await cache.adelete(key)
+
+
+def get_negative_cache():
+    return get_component(
+        "negative_cache",
+        NegativeCache,
+        "DRF_RECAPTCHA_NEGATIVE_CACHE",
+    )
+
+
+def is_blocked(client_ip, action):
+    negative_cache = get_negative_cache()
+    return negative_cache is not None and negative_cache.is_blocked(client_ip, action)
+
+
+async def ais_blocked(client_ip, action):
+    negative_cache = get_negative_cache()
+    return negative_cache is not None and await negative_cache.ais_blocked(
+        client_ip,
+        action,
+    )
+
+
+def record_failure(client_ip, action):
+    negative_cache = get_negative_cache()
+    if negative_cache is not None:
+        negative_cache.record_failure(client_ip, action)
+
+
+async def arecord_failure(client_ip, action):
+    negative_cache = get_negative_cache()
+    if negative_cache is not None:
+        await negative_cache.arecord_failure(client_ip, action)
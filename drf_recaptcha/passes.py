@@ -0,0 +1,57 @@
+from django.core import signing
+
+from drf_recaptcha.conf import get_settings
+
+# A pass is issued after a successful verification, so that the client can
+# skip verifications for the same action from the same IP address until it
+# expires. Passes are signed with SECRET_KEY and carry the client IP address,
+# the action and the score of the verification.
+
+SALT = "drf_recaptcha.pass"
+
+
+def _get_options():
+    return get_settings().verified_pass
+
+
+def _get_http_request(request):
+    # The underlying HttpRequest of a DRF Request is seen by middlewares.
+    return getattr(request, "_request", request)
+
+
+def issue(request, *, client_ip, action, score):
+    """
+    Sign a pass and attach it to ``request.recaptcha_pass`` to be sent to
+    the client, e.g. by ``ReCaptchaPassMiddleware``.
+    """
+    token = signing.dumps(
+        {"ip": client_ip, "action": action, "score": score},
+        salt=SALT,
+    )
+    _get_http_request(request).recaptcha_pass = token
+    return token
+
+
+def load(request):
+    """
+    Return data of the valid pass sent with ``request`` or ``None``.
+    """
+    options = _get_options()
+    if options is None or request is None:
+        return None
+
+    http_request = _get_http_request(request)
+    token = http_request.headers.get(options["header"])
+    if not token and options["cookie"]:
+        token = http_request.COOKIES.get(options["cookie"])
+    if not token:
+        return None
+
+    try:
+        return signing.loads(token, salt=SALT, max_age=options["max_age"])
+    except signing.BadSignature:
+        return None
+
+
+def is_enabled():
+    return _get_options() is not None
@@ -0,0 +1,481 @@
+import asyncio
+import os
+import ssl
+import threading
+import time
+import weakref
+from base64 import b64encode
+from collections import deque
+from contextlib import nullcontext
+from functools import partial
+from http.client import (
+    HTTPConnection,
+    HTTPSConnection,
+    RemoteDisconnected,
+    parse_headers,
+)
+from io import BytesIO
+from urllib.error import HTTPError, URLError
+from urllib.parse import unquote, urlsplit
+
+from drf_recaptcha import dns, timing
+from drf_recaptcha.constants import (
+    DEFAULT_DNS_TTL,
+    DEFAULT_HAPPY_EYEBALLS_DELAY,
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_MAXSIZE,
+)
+
+
+class ConnectError(URLError):
+    """
+    Connection to the host couldn't be established, so the request wasn't
+    sent and is safe to retry.
+    """
+
+
+class PoolResponse:
+    def __init__(self, status, reason, headers, data):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.data = data
+
+
+class HTTPConnectionPool:
+    """
+    Thread-safe pool of HTTP/1.1 keep-alive connections to a single host.
+
+    Idle connections are reused most-recently-released first, connections
+    idle for longer than ``idle_timeout`` seconds are dropped, and at most
+    ``maxsize`` idle connections are kept. The pool never blocks: when no
+    idle connection is available a new one is opened.
+
+    New connections are made with ``dns.create_connection``, addresses are
+    cached for ``dns_ttl`` seconds and raced with ``happy_eyeballs_delay``.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host,
+        *,
+        scheme="https",
+        proxy=None,
+        maxsize=DEFAULT_POOL_MAXSIZE,
+        idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT,
+        dns_ttl=DEFAULT_DNS_TTL,
+        happy_eyeballs_delay=DEFAULT_HAPPY_EYEBALLS_DELAY,
+    ):
+        self.host = host
+        self.scheme = scheme
+        self.proxy = proxy
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._create_connection = partial(
+            dns.create_connection,
+            ttl=dns_ttl,
+            delay=happy_eyeballs_delay,
+        )
+
+    def _new_connection(self, connect_timeout):
+        connection = self._new_http_connection(connect_timeout)
+        # http.client resolves the host on every connect otherwise.
+        connection._create_connection = self._create_connection  # noqa: SLF001
+        return connection
+
+    def _new_http_connection(self, connect_timeout):
+        connection_class = HTTPSConnection if self.scheme == "https" else HTTPConnection
+        if not self.proxy:
+            return connection_class(self.host, timeout=connect_timeout)
+
+        proxy = urlsplit(self.proxy)
+        tunnel_headers = {}
+        if proxy.username:
+            credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+            tunnel_headers["Proxy-Authorization"] = "Basic {}".format(
+                b64encode(credentials.encode("utf-8")).decode("ascii"),
+            )
+        connection = connection_class(
+            proxy.hostname,
+            proxy.port,
+            timeout=connect_timeout,
+        )
+        connection.set_tunnel(self.host, headers=tunnel_headers)
+        return connection
+
+    def _connect(self, connect_timeout):
+        connection = self._new_connection(connect_timeout)
+        # Durations of resolution and connecting are recorded by
+        # dns.create_connection, the rest is the proxy tunnel and TLS.
+        measure_tls = (
+            timing.measure("tls", exclude=("dns", "connect"))
+            if self.scheme == "https"
+            else nullcontext()
+        )
+        try:
+            with measure_tls:
+                connection.connect()
+        except OSError as err:
+            connection.close()
+            raise ConnectError(err) from err
+        return connection
+
+    def _get_connection(self, connect_timeout):
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                connection, released_at = self._idle.pop()
+                if now - released_at < self.idle_timeout and connection.sock:
+                    return connection, True
+                connection.close()
+        return self._connect(connect_timeout), False
+
+    def _put_connection(self, connection):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def clear(self):
+        with self._lock:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                connection.close()
+
+    def urlopen(  # noqa: PLR0913
+        self,
+        method,
+        path,
+        body=None,
+        headers=None,
+        *,
+        connect_timeout=None,
+        read_timeout=None,
+    ):
+        """
+        Send request and read the whole response. ``connect_timeout`` limits
+        establishing of a new connection, ``read_timeout`` limits every
+        blocking socket operation after that.
+        """
+        connection, reused = self._get_connection(connect_timeout)
+        try:
+            try:
+                response, data = self._send(
+                    connection, method, path, body, headers, read_timeout
+                )
+            except ConnectionError:
+                if not reused:
+                    raise
+                # The server has closed the idle keep-alive connection,
+                # retry once on a freshly opened one.
+                connection = self._connect(connect_timeout)
+                response, data = self._send(
+                    connection, method, path, body, headers, read_timeout
+                )
+        except URLError:
+            raise
+        except OSError as err:
+            raise URLError(err) from err
+
+        return self._release(connection, response, data, path)
+
+    @staticmethod
+    def _send(connection, method, path, body, headers, read_timeout):  # noqa: PLR0913, PLR0917
+        try:
+            with timing.measure("wait"):
+                connection.sock.settimeout(read_timeout)
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+            with timing.measure("read"):
+                data = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        return response, data
+
+    def _release(self, connection, response, data, path):
+        if response.will_close:
+            connection.close()
+        else:
+            self._put_connection(connection)
+
+        if response.status >= 400:  # noqa: PLR2004
+            url = f"{self.scheme}://{self.host}{path}"
+            raise HTTPError(
+                url,
+                response.status,
+                response.reason,
+                response.headers,
+                None,
+            )
+
+        return PoolResponse(response.status, response.reason, response.headers, data)
+
+
+class AsyncHTTPConnectionPool:
+    """
+    asyncio counterpart of ``HTTPConnectionPool``.
+
+    A pool is bound to the event loop it is used from, so no locking is
+    needed. Proxies are not supported.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host,
+        *,
+        scheme="https",
+        maxsize=DEFAULT_POOL_MAXSIZE,
+        idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT,
+        dns_ttl=DEFAULT_DNS_TTL,
+        happy_eyeballs_delay=DEFAULT_HAPPY_EYEBALLS_DELAY,
+    ):
+        self.host = host
+        self.scheme = scheme
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.dns_ttl = dns_ttl
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self._idle = deque()
+
+        address = urlsplit(f"//{host}")
+        self._hostname = address.hostname
+        self._port = address.port or (443 if scheme == "https" else 80)
+        self._ssl_context = ssl.create_default_context() if scheme == "https" else None
+
+    async def _open_connection(self):
+        sock = await dns.acreate_connection(
+            self._hostname,
+            self._port,
+            ttl=self.dns_ttl,
+            delay=self.happy_eyeballs_delay,
+        )
+        try:
+            with timing.measure("tls") if self._ssl_context else nullcontext():
+                return await asyncio.open_connection(
+                    sock=sock,
+                    ssl=self._ssl_context,
+                    server_hostname=self._hostname if self._ssl_context else None,
+                )
+        except BaseException:
+            sock.close()
+            raise
+
+    async def _connect(self, connect_timeout):
+        try:
+            return await asyncio.wait_for(self._open_connection(), connect_timeout)
+        except (OSError, asyncio.TimeoutError) as err:
+            raise ConnectError(err) from err
+
+    async def _get_connection(self, connect_timeout):
+        now = time.monotonic()
+        while self._idle:
+            reader, writer, released_at = self._idle.pop()
+            if (
+                now - released_at < self.idle_timeout
+                and not reader.at_eof()
+                and not writer.is_closing()
+            ):
+                return reader, writer, True
+            writer.close()
+        reader, writer = await self._connect(connect_timeout)
+        return reader, writer, False
+
+    def _put_connection(self, reader, writer):
+        if len(self._idle) < self.maxsize:
+            self._idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    def clear(self):
+        while self._idle:
+            _, writer, _ = self._idle.pop()
+            writer.close()
+
+    async def urlopen(  # noqa: PLR0913
+        self,
+        method,
+        path,
+        body=None,
+        headers=None,
+        *,
+        connect_timeout=None,
+        read_timeout=None,
+    ):
+        """
+        Send request and read the whole response. ``connect_timeout`` limits
+        establishing of a new connection, ``read_timeout`` limits sending of
+        the request and reading of the response.
+        """
+        body = body or b""
+        headers = headers or {}
+        try:
+            reader, writer, reused = await self._get_connection(connect_timeout)
+            try:
+                response, will_close = await asyncio.wait_for(
+                    self._send(reader, writer, method, path, body, headers),
+                    read_timeout,
+                )
+            except ConnectionError:
+                if not reused:
+                    raise
+                # The server has closed the idle keep-alive connection,
+                # retry once on a freshly opened one.
+                reader, writer = await self._connect(connect_timeout)
+                response, will_close = await asyncio.wait_for(
+                    self._send(reader, writer, method, path, body, headers),
+                    read_timeout,
+                )
+        except URLError:
+            raise
+        except asyncio.TimeoutError as err:
+            msg = "timed out"
+            raise URLError(TimeoutError(msg)) from err
+        except OSError as err:
+            raise URLError(err) from err
+
+        if will_close:
+            writer.close()
+        else:
+            self._put_connection(reader, writer)
+
+        if response.status >= 400:  # noqa: PLR2004
+            url = f"{self.scheme}://{self.host}{path}"
+            raise HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+
+        return response
+
+    async def _send(self, reader, writer, method, path, body, headers):  # noqa: PLR0913, PLR0917
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}",
+            f"Content-Length: {len(body)}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        try:
+            with timing.measure("wait"):
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                status_line = await reader.readline()
+            with timing.measure("read"):
+                return await self._read_response(reader, status_line)
+        except asyncio.IncompleteReadError as err:
+            writer.close()
+            msg = "Remote end closed connection without response"
+            raise RemoteDisconnected(msg) from err
+        except BaseException:
+            writer.close()
+            raise
+
+    @staticmethod
+    async def _read_response(reader, status_line):
+        if not status_line:
+            msg = "Remote end closed connection without response"
+            raise RemoteDisconnected(msg)
+        version, status, *reason = status_line.decode("latin-1").strip().split(" ", 2)
+
+        header_lines = []
+        while True:
+            line = await reader.readline()
+            header_lines.append(line)
+            if line in {b"\r\n", b"\n", b""}:
+                break
+        headers = parse_headers(BytesIO(b"".join(header_lines)))
+
+        will_close = (
+            version == "HTTP/1.0" or headers.get("Connection", "").lower() == "close"
+        )
+        if headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readline()).split(b";", 1)[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            while (await reader.readline()) not in {b"\r\n", b"\n", b""}:
+                pass  # Skip trailers.
+            data = b"".join(chunks)
+        elif "Content-Length" in headers:
+            data = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            data = await reader.read()
+            will_close = True
+
+        response = PoolResponse(int(status), "".join(reason), headers, data)
+        return response, will_close
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_async_pools = weakref.WeakKeyDictionary()
+
+
+def get_pool(  # noqa: PLR0913
+    host,
+    *,
+    scheme="https",
+    proxy=None,
+    maxsize,
+    idle_timeout,
+    dns_ttl=DEFAULT_DNS_TTL,
+    happy_eyeballs_delay=DEFAULT_HAPPY_EYEBALLS_DELAY,
+):
+    key = (host, scheme, proxy, maxsize, idle_timeout, dns_ttl, happy_eyeballs_delay)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = HTTPConnectionPool(
+                    host,
+                    scheme=scheme,
+                    proxy=proxy,
+                    maxsize=maxsize,
+                    idle_timeout=idle_timeout,
+                    dns_ttl=dns_ttl,
+                    happy_eyeballs_delay=happy_eyeballs_delay,
+                )
+                _pools[key] = pool
+    return pool
+
+
+def get_async_pool(  # noqa: PLR0913
+    host,
+    *,
+    scheme="https",
+    maxsize,
+    idle_timeout,
+    dns_ttl=DEFAULT_DNS_TTL,
+    happy_eyeballs_delay=DEFAULT_HAPPY_EYEBALLS_DELAY,
+):
+    loop_pools = _async_pools.setdefault(asyncio.get_running_loop(), {})
+    key = (host, scheme, maxsize, idle_timeout, dns_ttl, happy_eyeballs_delay)
+    pool = loop_pools.get(key)
+    if pool is None:
+        pool = AsyncHTTPConnectionPool(
+            host,
+            scheme=scheme,
+            maxsize=maxsize,
+            idle_timeout=idle_timeout,
+            dns_ttl=dns_ttl,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+        )
+        loop_pools[key] = pool
+    return pool
+
+
+def _reset_pools_after_fork():
+    # Connections inherited from the parent process are shared sockets and
+    # must not be reused, locks may have been held by other threads.
+    global _pools_lock  # noqa: PLW0603
+    _pools_lock = threading.Lock()
+    _pools.clear()
+    _async_pools.clear()
+    dns.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
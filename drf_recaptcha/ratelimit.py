@@ -0,0 +1,103 @@
+import ipaddress
+import time
+
+from django.core.cache import caches
+
+from drf_recaptcha.conf import get_component
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter of verifications per client network.
+
+    Client IP addresses are aggregated to networks of ``ipv4_prefix`` and
+    ``ipv6_prefix`` bits. Every network gets a bucket of ``burst`` tokens
+    (``rate`` by default) refilled with ``rate`` tokens per ``period``
+    seconds, a verification takes one token. Buckets are stored in the
+    ``cache`` alias from ``CACHES``, so that limits are shared between
+    processes using the same cache. Updates of a bucket aren't atomic, so
+    concurrent verifications may slightly exceed the limit.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        rate,
+        period=60,
+        burst=None,
+        ipv4_prefix=32,
+        ipv6_prefix=64,
+        cache="default",
+    ):
+        self.rate = rate
+        self.period = period
+        self.burst = rate if burst is None else burst
+        self.ipv4_prefix = ipv4_prefix
+        self.ipv6_prefix = ipv6_prefix
+        self.cache_alias = cache
+
+    def make_key(self, client_ip):
+        try:
+            address = ipaddress.ip_address(client_ip)
+        except ValueError:
+            return None
+
+        prefix = self.ipv4_prefix if address.version == 4 else self.ipv6_prefix  # noqa: PLR2004
+        network = ipaddress.ip_network(f"{address}/{prefix}", strict=False)
+        return f"drf_recaptcha:ratelimit:{network}"
+
+    def _take(self, bucket, now):
+        """
+        Return whether a token is taken and the new state of the bucket.
+        """
+        tokens, updated_at = bucket or (self.burst, now)
+        tokens = min(
+            self.burst,
+            tokens + max(0.0, now - updated_at) * self.rate / self.period,
+        )
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        return allowed, (tokens, now)
+
+    def _get_timeout(self, tokens):
+        # The bucket is full again after that, so it can be dropped.
+        return max(1, int((self.burst - tokens) * self.period / self.rate) + 1)
+
+    def allow(self, client_ip):
+        key = self.make_key(client_ip)
+        if key is None:
+            return True
+
+        cache = caches[self.cache_alias]
+        allowed, bucket = self._take(cache.get(key), time.time())
+        cache.set(key, bucket, self._get_timeout(bucket[0]))
+        return allowed
+
+    async def aallow(self, client_ip):
+        key = self.make_key(client_ip)
+        if key is None:
+            return True
+
+        cache = caches[self.cache_alias]
+        allowed, bucket = self._take(await cache.aget(key), time.time())
+        await cache.aset(key, bucket, self._get_timeout(bucket[0]))
+        return allowed
+
+
+def get_rate_limiter():
+    return get_component(
+        "rate_limit",
+        RateLimiter,
+        "DRF_RECAPTCHA_RATE_LIMIT",
+    )
+
+
+def allow(client_ip):
+    limiter = get_rate_limiter()
+    return limiter is None or limiter.allow(client_ip)
+
+
+async def aallow(client_ip):
+    limiter = get_rate_limiter()
+    return limiter is None or await limiter.aallow(client_ip)
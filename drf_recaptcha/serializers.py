@@ -0,0 +1,229 @@
+import asyncio
+
+from rest_framework.fields import empty
+from rest_framework.serializers import (
+    ListSerializer,
+    ValidationError,
+    as_serializer_error,
+)
+from rest_framework.settings import api_settings
+from rest_framework.utils import html
+
+from drf_recaptcha.constants import VERIFY_BACKGROUND, VERIFY_INLINE, VERIFY_LAST
+from drf_recaptcha.executor import get_executor
+from drf_recaptcha.validators import defer_verifications, verify_in_background
+
+# ``ListSerializer.run_child_validation`` was added in DRF 3.15.
+HAS_RUN_CHILD_VALIDATION = hasattr(ListSerializer, "run_child_validation")
+
+
+def _add_error(errors, root, serializer_field, detail):
+    """
+    Add ``detail`` to ``errors`` of ``root`` under the path of the field,
+    e.g. ``{"inner": {"recaptcha": detail}}`` for a nested serializer.
+    Fields of list items aren't collected, so there are no list indexes
+    on the path.
+    """
+    path = []
+    field = serializer_field
+    while field is not None and field is not root:
+        path.append(field.field_name)
+        field = field.parent
+
+    *parents, name = reversed(path)
+    for parent in parents:
+        if not isinstance(errors.setdefault(parent, {}), dict):
+            # Other errors of the parent are kept instead.
+            return
+        errors = errors[parent]
+    errors[name] = detail
+
+
+def _merge_nested_errors(errors, other):
+    merged = dict(errors)
+    for name, detail in other.items():
+        if isinstance(merged.get(name), dict) and isinstance(detail, dict):
+            merged[name] = _merge_nested_errors(merged[name], detail)
+        else:
+            merged[name] = detail
+    return merged
+
+
+class ReCaptchaSerializerMixin:
+    """
+    Serializer mixin adding ``ais_valid``, an ``is_valid`` counterpart which
+    verifies reCAPTCHA fields without blocking the event loop, e.g. for
+    adrf async views.
+
+    With ``recaptcha_verify_mode = "last"`` reCAPTCHA fields are verified
+    only after all other fields and ``validate()`` passed, so invalid
+    payloads don't cost a request to Google. With ``"background"`` they are
+    verified in background threads while other fields are validated.
+    """
+
+    recaptcha_verify_mode = VERIFY_INLINE
+
+    def run_validation(self, data=empty):
+        if self.recaptcha_verify_mode == VERIFY_LAST:
+            return self._run_validation_verify_last(data)
+        if self.recaptcha_verify_mode == VERIFY_BACKGROUND:
+            return self._run_validation_in_background(data)
+        return super().run_validation(data)
+
+    def _run_validation_verify_last(self, data):
+        with defer_verifications(root=self) as deferred:
+            value = super().run_validation(data)
+
+        # Verified now, or deferred further e.g. by ``ais_valid``.
+        errors = {}
+        for validator, deferred_value, serializer_field in deferred:
+            try:
+                validator(deferred_value, serializer_field)
+            except ValidationError as exc:  # noqa: PERF203
+                _add_error(errors, self, serializer_field, exc.detail)
+
+        if errors:
+            raise ValidationError(errors)
+
+        return value
+
+    def _run_validation_in_background(self, data):
+        # Verifications deferred e.g. by ``ais_valid`` aren't started here.
+        errors = {}
+        with verify_in_background(get_executor(), root=self) as started:
+            try:
+                value = super().run_validation(data)
+            except ValidationError as exc:
+                errors = as_serializer_error(exc)
+
+        for serializer_field, future in started:
+            try:
+                future.result()
+            except ValidationError as exc:  # noqa: PERF203
+                _add_error(errors, self, serializer_field, exc.detail)
+
+        if errors:
+            raise ValidationError(errors)
+
+        return value
+
+    async def ais_valid(self, *, raise_exception=False):
+        with defer_verifications(root=self) as deferred:
+            self.is_valid()
+
+        results = await asyncio.gather(
+            *(
+                validator.acall(value, serializer_field)
+                for validator, value, serializer_field in deferred
+            ),
+            return_exceptions=True,
+        )
+
+        errors = {}
+        for (_, _, serializer_field), result in zip(deferred, results, strict=True):
+            if isinstance(result, ValidationError):
+                _add_error(errors, self, serializer_field, result.detail)
+            elif isinstance(result, BaseException):
+                raise result
+
+        if errors:
+            self._validated_data = {}
+            self._errors = _merge_nested_errors(self._errors, errors)
+
+        if self._errors and raise_exception:
+            raise ValidationError(self.errors)
+
+        return not bool(self._errors)
+
+
+class ReCaptchaListSerializer(ListSerializer):
+    """
+    List serializer verifying reCAPTCHA fields of all items concurrently in
+    background threads, instead of one item after another. Set it as
+    ``Meta.list_serializer_class`` of the item serializer.
+    """
+
+    def run_child_validation(self, data):
+        with verify_in_background(get_executor(), root=self.child) as started:
+            self._recaptcha_started.append(started)
+            if HAS_RUN_CHILD_VALIDATION:
+                return super().run_child_validation(data)
+            return self.child.run_validation(data)
+
+    def _fail(self, code, **params):
+        message = self.error_messages[code].format(**params)
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code=code)
+
+    def _validate_items(self, data):
+        """
+        ``ListSerializer.to_internal_value`` of DRF 3.14, items are validated
+        with ``run_child_validation``.
+        """
+        if html.is_html_input(data):
+            data = html.parse_html_list(data, default=[])
+
+        if not isinstance(data, list):
+            self._fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self._fail("empty")
+        if self.max_length is not None and len(data) > self.max_length:
+            self._fail("max_length", max_length=self.max_length)
+        if self.min_length is not None and len(data) < self.min_length:
+            self._fail("min_length", min_length=self.min_length)
+
+        value = []
+        errors = []
+        for item in data:
+            try:
+                value.append(self.run_child_validation(item))
+            except ValidationError as exc:  # noqa: PERF203
+                errors.append(exc.detail)
+            else:
+                errors.append({})
+
+        if any(errors):
+            raise ValidationError(errors)
+        return value
+
+    def to_internal_value(self, data):
+        self._recaptcha_started = []
+        try:
+            if HAS_RUN_CHILD_VALIDATION:
+                value = super().to_internal_value(data)
+            else:
+                value = self._validate_items(data)
+        except ValidationError as exc:
+            error = exc
+        else:
+            error = None
+
+        errors = {}
+        for index, started in enumerate(self._recaptcha_started):
+            for serializer_field, future in started:
+                try:
+                    future.result()
+                except ValidationError as exc:  # noqa: PERF203
+                    item_errors = errors.setdefault(index, {})
+                    _add_error(item_errors, self.child, serializer_field, exc.detail)
+
+        if errors:
+            raise ValidationError(self._merge_errors(error, errors, len(data)))
+        if error is not None:
+            raise error
+
+        return value
+
+    @staticmethod
+    def _merge_errors(error, errors, length):
+        detail = error.detail if error is not None else None
+        if detail is None:
+            if getattr(api_settings, "LIST_SERIALIZER_ERRORS_AS_DICT", False):
+                return errors
+            return [errors.get(index, {}) for index in range(length)]
+
+        for index, item_errors in errors.items():
+            item_detail = (
+                detail[index] if isinstance(detail, list) else detail.get(index)
+            )
+            detail[index] = _merge_nested_errors(item_detail or {}, item_errors)
+        return detail
@@ -0,0 +1,122 @@
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+
+from drf_recaptcha.conf import get_component
+from drf_recaptcha.constants import SKIPPED_ALLOW, SKIPPED_REJECT
+
+logger = logging.getLogger(__name__)
+
+# Latency percentile is recomputed at most once per interval in seconds.
+CHECK_INTERVAL = 1.0
+
+
+class LoadShedder:
+    """
+    Sampling of verifications while Google siteverify is under pressure.
+
+    Durations of requests to Google within the last ``window`` seconds are
+    tracked. Google is under pressure when at least ``minimum_calls`` were
+    made and their ``percentile`` reaches ``latency_threshold`` seconds, or
+    when ``max_in_flight`` requests are in flight. Under pressure only the
+    ``sample_rates`` share of verifications of an action is made (``"*"``
+    for other actions, ``1`` by default), the rest is skipped and let
+    through or rejected according to ``skipped``.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        sample_rates,
+        latency_threshold=None,
+        percentile=0.95,
+        max_in_flight=None,
+        window=30,
+        minimum_calls=20,
+        skipped=SKIPPED_ALLOW,
+    ):
+        if skipped not in {SKIPPED_ALLOW, SKIPPED_REJECT}:
+            msg = f"skipped should be '{SKIPPED_ALLOW}' or '{SKIPPED_REJECT}'"
+            raise TypeError(msg)
+
+        self.sample_rates = dict(sample_rates)
+        self.latency_threshold = latency_threshold
+        self.percentile = percentile
+        self.max_in_flight = max_in_flight
+        self.window = window
+        self.minimum_calls = minimum_calls
+        self.skipped = skipped
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # (finished at, duration) of requests within the window.
+        self._durations = deque()
+        self._slow = False
+        self._checked_at = 0.0
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def request_started(self):
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self, duration):
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            # Durations are tracked only for the latency threshold.
+            if self.latency_threshold is not None:
+                self._durations.append((now, duration))
+                self._trim(now)
+
+    def _trim(self, now):
+        while self._durations and self._durations[0][0] <= now - self.window:
+            self._durations.popleft()
+
+    def _is_slow(self, now):
+        if now - self._checked_at < CHECK_INTERVAL:
+            return self._slow
+
+        with self._lock:
+            self._trim(now)
+            durations = sorted(duration for _, duration in self._durations)
+
+        slow = False
+        if len(durations) >= max(self.minimum_calls, 1):
+            index = math.ceil(self.percentile * len(durations)) - 1
+            slow = durations[max(index, 0)] >= self.latency_threshold
+        if slow and not self._slow:
+            logger.warning("reCAPTCHA siteverify is slow, verifications are sampled.")
+
+        self._slow, self._checked_at = slow, now
+        return slow
+
+    def is_under_pressure(self):
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return True
+        return self.latency_threshold is not None and self._is_slow(time.monotonic())
+
+    def should_verify(self, action):
+        if not self.is_under_pressure():
+            return True
+
+        rate = self.sample_rates.get(action, self.sample_rates.get("*", 1))
+        return rate >= 1 or random.random() < rate  # noqa: S311
+
+
+def get_load_shedder():
+    return get_component(
+        "load_shedding",
+        LoadShedder,
+        "DRF_RECAPTCHA_LOAD_SHEDDING",
+    )
+
+
+def should_verify(action):
+    shedder = get_load_shedder()
+    return shedder is None or shedder.should_verify(action)
@@ -0,0 +1,12 @@
+from django.dispatch import Signal
+
+# Sent after every request to Google siteverify, retries included.
+# Arguments: duration, attempt, error (exception or None).
+siteverify_request_finished = Signal()
+
+# Sent after every verification by a reCAPTCHA validator.
+# Arguments: validator, version ("v2" or "v3"), action, outcome ("pass",
+# "captcha_invalid", "captcha_error", "circuit_open", "overloaded",
+# "rate_limited", "blocked" or "skipped"), error_codes, score, cached,
+# duration, timings (durations of stages, see drf_recaptcha.timing).
+verification_finished = Signal()
@@ -0,0 +1,216 @@
+"""
+Scriptable siteverify simulator for load tests without network.
+
+Unlike ``DRF_RECAPTCHA_TESTING`` the simulator is a transport, so requests
+go through the whole pipeline: token checks, rate limits, cache, retries,
+deadlines, the circuit breaker and response parsing.
+"""
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.error import URLError
+from urllib.parse import parse_qs
+
+from django.core.exceptions import ImproperlyConfigured
+
+from drf_recaptcha.pool import ConnectError, PoolResponse
+from drf_recaptcha.transports import BaseTransport, _check_status
+
+DEFAULT_SCORE = 0.9
+FAULTS = ("timeout", "connect_error", "server_error")
+
+
+def _get_distribution(name, spec):
+    """
+    Return a function drawing a value from ``spec``: a number, or
+    ``["uniform", low, high]``, ``["normal", mean, stddev]`` or
+    ``["exponential", mean]``.
+    """
+    if isinstance(spec, int | float):
+        return lambda _: spec
+
+    kind, *args = spec if isinstance(spec, list | tuple) and spec else [None]
+    try:
+        if kind == "uniform":
+            low, high = args
+            return lambda rng: rng.uniform(low, high)
+        if kind == "normal":
+            mean, stddev = args
+            return lambda rng: rng.gauss(mean, stddev)
+        if kind == "exponential":
+            (mean,) = args
+            return lambda rng: rng.expovariate(1 / mean)
+    except (TypeError, ValueError, ZeroDivisionError):
+        pass
+
+    msg = f"Simulator {name} distribution is invalid: {spec!r}."
+    raise ImproperlyConfigured(msg)
+
+
+def _get_probabilities(name, spec, choices=None):
+    if not isinstance(spec, dict) or sum(spec.values()) > 1:
+        msg = f"Simulator {name} should be a dict of probabilities summing up to 1."
+        raise ImproperlyConfigured(msg)
+    if choices is not None and not set(spec) <= set(choices):
+        msg = f"Simulator {name} should be some of: {', '.join(choices)}."
+        raise ImproperlyConfigured(msg)
+    return tuple(spec.items())
+
+
+def _choose(probabilities, rng):
+    value = rng.random()
+    for choice, probability in probabilities:
+        value -= probability
+        if value < 0:
+            return choice
+    return None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Compiled scenario: ``score`` is a distribution or a dict of them per
+    action, ``None`` omits the score as for reCAPTCHA v2.
+    """
+
+    score: object
+    latency: object
+    error_codes: tuple
+    faults: tuple
+    action: str | None
+    hostname: str
+
+    @classmethod
+    def from_options(  # noqa: PLR0913
+        cls,
+        *,
+        score=DEFAULT_SCORE,
+        latency=0,
+        error_codes=None,
+        faults=None,
+        action=None,
+        hostname="localhost",
+    ):
+        if isinstance(score, dict):
+            score = {
+                name: _get_distribution(f"score of action '{name}'", spec)
+                for name, spec in score.items()
+            }
+        elif score is not None:
+            score = _get_distribution("score", score)
+
+        return cls(
+            score=score,
+            latency=_get_distribution("latency", latency),
+            error_codes=_get_probabilities("error_codes", error_codes or {}),
+            faults=_get_probabilities("faults", faults or {}, FAULTS),
+            action=action,
+            hostname=hostname,
+        )
+
+    def get_score(self, action, rng):
+        score = self.score
+        if isinstance(score, dict):
+            score = score.get(action, score.get("*"))
+        if score is None:
+            return None
+        # Google returns scores rounded to a tenth.
+        return round(min(max(score(rng), 0.0), 1.0), 1)
+
+
+class SimulatorTransport(BaseTransport):
+    """
+    Transport answering with scripted siteverify responses.
+
+    Keyword arguments describe the default scenario: ``score``, ``latency``
+    in seconds, ``error_codes`` and ``faults`` probabilities, ``action`` and
+    ``hostname``. ``scenarios`` maps token prefixes to scenarios overriding
+    the default one, the longest matching prefix is used. Unless set by the
+    scenario, the action is the part of the token after the prefix up to the
+    first ``-``, e.g. ``login`` for ``bot-login-1`` with the ``bot-`` prefix.
+    ``seed`` makes runs reproducible.
+    """
+
+    def __init__(self, *, scenarios=None, seed=None, **default):
+        try:
+            self.default = Scenario.from_options(**default)
+            self.scenarios = {
+                prefix: Scenario.from_options(**{**default, **options})
+                for prefix, options in (scenarios or {}).items()
+            }
+        except TypeError as exc:
+            msg = f"SimulatorTransport options are invalid: {exc}"
+            raise ImproperlyConfigured(msg) from exc
+        self._prefixes = sorted(self.scenarios, key=len, reverse=True)
+        self._random = random.Random(seed)  # noqa: S311
+
+    def _get_scenario(self, token):
+        for prefix in self._prefixes:
+            if token.startswith(prefix):
+                return self.scenarios[prefix], token[len(prefix) :]
+        return self.default, token
+
+    def _get_payload(self, scenario, token):
+        action = scenario.action or token.split("-", 1)[0]
+        error_code = _choose(scenario.error_codes, self._random)
+        if error_code is not None:
+            return {"success": False, "error-codes": [error_code]}
+
+        payload = {
+            "success": True,
+            "challenge_ts": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "hostname": scenario.hostname,
+            "action": action,
+        }
+        score = scenario.get_score(action, self._random)
+        if score is not None:
+            payload["score"] = score
+        return payload
+
+    def simulate(self, url, body, read_timeout):
+        """
+        Return the delay in seconds and the response or exception to answer
+        with after it.
+        """
+        params = parse_qs(body.decode("utf-8"))
+        scenario, token = self._get_scenario(params.get("response", [""])[0])
+
+        delay = max(scenario.latency(self._random), 0.0)
+        fault = _choose(scenario.faults, self._random)
+        if fault == "timeout" or (read_timeout is not None and delay > read_timeout):
+            return read_timeout, URLError(TimeoutError("timed out"))
+        if fault == "connect_error":
+            return delay, ConnectError(ConnectionRefusedError("Connection refused"))
+
+        if fault == "server_error":
+            status, payload = 503, {}
+        else:
+            status, payload = 200, self._get_payload(scenario, token)
+        response = PoolResponse(
+            status,
+            "",
+            {"Content-Type": "application/json"},
+            json.dumps(payload).encode("utf-8"),
+        )
+        try:
+            return delay, _check_status(url, response)
+        except URLError as exc:
+            return delay, exc
+
+    def send(self, url, body, headers, *, connect_timeout, read_timeout):  # noqa: ARG002
+        delay, result = self.simulate(url, body, read_timeout)
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def asend(self, url, body, headers, *, connect_timeout, read_timeout):  # noqa: ARG002
+        delay, result = self.simulate(url, body, read_timeout)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+
+from drf_recaptcha import timing
+from drf_recaptcha.conf import get_settings
+
+# Concurrent verifications of the same token, e.g. on a double click or a
+# client retry, wait for the request to Google already in flight and share
+# its result instead of getting "timeout-or-duplicate" error from Google.
+# Flights are keyed by ``(cache.make_key(secret_key, token), remoteip)``.
+
+
+class _Flight:
+    def __init__(self, done):
+        self.done = done
+        self.loop = None
+        self.result = None
+        self.error = None
+        # The leader was interrupted, followers have to verify on their own.
+        self.abandoned = False
+
+    def finish(self, func):
+        try:
+            self.result = func()
+        except Exception as exc:
+            self.error = exc
+            raise
+        except BaseException:
+            self.abandoned = True
+            raise
+        return self.result
+
+    async def afinish(self, func):
+        try:
+            self.result = await func()
+        except Exception as exc:
+            self.error = exc
+            raise
+        except BaseException:
+            self.abandoned = True
+            raise
+        return self.result
+
+    def get_result(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+_flights = {}
+_async_flights = {}
+_lock = threading.Lock()
+
+
+def _join(flights, key, flight):
+    """
+    Return the flight in progress for ``key`` or ``None`` if ``flight``
+    was started.
+    """
+    with _lock:
+        current = flights.get(key)
+        if current is None:
+            flights[key] = flight
+        return current
+
+
+def _land(flights, key, flight):
+    with _lock:
+        if flights.get(key) is flight:
+            del flights[key]
+
+
+def do(key, func):
+    """
+    Return ``func()``, or the result of the call with the same ``key``
+    in progress in another thread. Errors are shared as well.
+    """
+    if not get_settings().single_flight:
+        return func()
+
+    flight = _Flight(threading.Event())
+    leader = _join(_flights, key, flight)
+    if leader is None:
+        try:
+            return flight.finish(func)
+        finally:
+            _land(_flights, key, flight)
+            flight.done.set()
+
+    with timing.measure("coalesced"):
+        leader.done.wait()
+    if leader.abandoned:
+        return func()
+    return leader.get_result()
+
+
+async def ado(key, func):
+    """
+    Same as ``do``, but for coroutine functions. Only calls in progress on
+    the same event loop are joined.
+    """
+    if not get_settings().single_flight:
+        return await func()
+
+    flight = _Flight(asyncio.Event())
+    flight.loop = asyncio.get_running_loop()
+    leader = _join(_async_flights, key, flight)
+    if leader is not None and leader.loop is not flight.loop:
+        return await func()
+    if leader is None:
+        try:
+            return await flight.afinish(func)
+        finally:
+            _land(_async_flights, key, flight)
+            flight.done.set()
+
+    with timing.measure("coalesced"):
+        await leader.done.wait()
+    if leader.abandoned:
+        return await func()
+    return leader.get_result()
+
+
+def _reset_flights_after_fork():
+    global _flights, _async_flights, _lock  # noqa: PLW0603
+    _flights = {}
+    _async_flights = {}
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_flights_after_fork)
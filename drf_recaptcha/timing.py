@@ -0,0 +1,131 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Durations in seconds of verification stages, summed up over retries:
+# "cache" - lookup and store in DRF_RECAPTCHA_CACHE,
+# "queue" - waiting for DRF_RECAPTCHA_CONCURRENCY_LIMIT,
+# "coalesced" - waiting for the same token verified concurrently,
+# "siteverify" - whole requests to Google, made up of (StdlibTransport only)
+#   "dns", "connect", "tls" - opening of a new connection,
+#   "wait" - sending of the request and waiting for the response,
+#   "read" - reading of the response,
+# "backoff" - delays between retries,
+# "parse" - decoding of responses,
+# "total" - the whole verification.
+
+SERVER_TIMING_PREFIX = "recaptcha-"
+
+_timings = ContextVar("drf_recaptcha_timings", default=None)
+# Timings are shared with background threads, e.g. by ``client.submit_many``,
+# and so are requests by background verifications.
+_lock = threading.Lock()
+
+
+@contextmanager
+def collect():
+    """
+    Collect durations of stages recorded within the block into the yielded
+    dict.
+    """
+    timings = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def get_timings():
+    """
+    Return a snapshot of durations collected so far.
+    """
+    return MappingProxyType(dict(_timings.get() or {}))
+
+
+def record(name, duration):
+    timings = _timings.get()
+    if timings is not None:
+        with _lock:
+            timings[name] = timings.get(name, 0.0) + duration
+
+
+def _get_total(timings, names):
+    return sum(timings.get(name, 0.0) for name in names)
+
+
+@contextmanager
+def measure(name, exclude=()):
+    """
+    Record duration of the block, minus durations of ``exclude`` stages
+    recorded within it.
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    excluded = _get_total(timings, exclude)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        record(name, duration - (_get_total(timings, exclude) - excluded))
+
+
+def attach(request, timings):
+    """
+    Add ``timings`` to ``request.recaptcha_timings`` of the underlying
+    ``HttpRequest``, e.g. for ``ReCaptchaServerTimingMiddleware``.
+    """
+    http_request = getattr(request, "_request", request)
+    with _lock:
+        request_timings = getattr(http_request, "recaptcha_timings", None)
+        if not isinstance(request_timings, dict):
+            request_timings = {}
+            http_request.recaptcha_timings = request_timings
+        for name, duration in timings.items():
+            request_timings[name] = request_timings.get(name, 0.0) + duration
+
+
+def format_server_timing(timings):
+    return ", ".join(
+        f"{SERVER_TIMING_PREFIX}{name};dur={duration * 1000:.3f}"
+        for name, duration in timings.items()
+    )
+
+
+def _get_tracer():
+    try:
+        trace = importlib.import_module("opentelemetry.trace")
+    except ImportError as exc:
+        msg = "DRF_RECAPTCHA_OPENTELEMETRY requires opentelemetry-api to be installed."
+        raise ImproperlyConfigured(msg) from exc
+    return trace.get_tracer("drf_recaptcha")
+
+
+def export_span(timings, attributes):
+    """
+    Export a finished verification as an OpenTelemetry span, stage
+    durations are set as ``recaptcha.timing.<stage>`` attributes.
+    """
+    end_time = time.time_ns()
+    span = _get_tracer().start_span(
+        "recaptcha.verify",
+        start_time=end_time - int(timings.get("total", 0.0) * 1e9),
+        attributes={
+            **{
+                f"recaptcha.{name}": value
+                for name, value in attributes.items()
+                if value is not None
+            },
+            **{f"recaptcha.timing.{name}": value for name, value in timings.items()},
+        },
+    )
+    span.end(end_time=end_time)
@@ -0,0 +1,375 @@
+"""
+Transports send verification requests to Google siteverify.
+
+A transport is a class with ``send`` and ``asend`` methods taking the URL,
+the form-encoded body, headers and ``connect_timeout`` and ``read_timeout``
+in seconds, and returning ``PoolResponse``. Failures to connect raise
+``ConnectError`` (the request wasn't sent and is safe to retry), responses
+with 4xx/5xx status raise ``HTTPError``, other failures raise ``URLError``.
+``DRF_RECAPTCHA_PROXY`` is honored by all transports.
+
+Select one with ``DRF_RECAPTCHA_TRANSPORT`` (a dotted path) and pass its
+keyword arguments with ``DRF_RECAPTCHA_TRANSPORT_OPTIONS``.
+"""
+
+import asyncio
+import json
+import threading
+import weakref
+from functools import partial
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, urlsplit
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from drf_recaptcha.conf import get_keyed_component, get_settings
+from drf_recaptcha.pool import ConnectError, PoolResponse, get_async_pool, get_pool
+
+
+def _import_optional(module, transport):
+    try:
+        return __import__(module)
+    except ImportError as exc:
+        msg = f"{transport} requires {module} to be installed."
+        raise ImproperlyConfigured(msg) from exc
+
+
+def _check_status(url, response):
+    if response.status >= 400:  # noqa: PLR2004
+        raise HTTPError(url, response.status, response.reason, response.headers, None)
+    return response
+
+
+class BaseTransport:
+    def send(self, url, body, headers, *, connect_timeout, read_timeout):
+        raise NotImplementedError
+
+    async def asend(self, url, body, headers, *, connect_timeout, read_timeout):
+        # Transports without asyncio support block a thread instead.
+        return await sync_to_async(self.send, thread_sensitive=False)(
+            url,
+            body,
+            headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+
+class StdlibTransport(BaseTransport):
+    """
+    Default transport over pooled ``http.client`` keep-alive connections and
+    asyncio streams, no dependencies.
+    """
+
+    def send(self, url, body, headers, *, connect_timeout, read_timeout):
+        recaptcha_settings = get_settings()
+        parts = urlsplit(url)
+        pool = get_pool(
+            parts.netloc,
+            scheme=parts.scheme,
+            proxy=recaptcha_settings.proxy,
+            maxsize=recaptcha_settings.pool_maxsize,
+            idle_timeout=recaptcha_settings.pool_idle_timeout,
+            dns_ttl=recaptcha_settings.dns_ttl,
+            happy_eyeballs_delay=recaptcha_settings.happy_eyeballs_delay,
+        )
+        return pool.urlopen(
+            "POST",
+            parts.path,
+            body=body,
+            headers=headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+    async def asend(self, url, body, headers, *, connect_timeout, read_timeout):
+        recaptcha_settings = get_settings()
+        if recaptcha_settings.proxy:
+            # The asyncio pool doesn't tunnel through proxies.
+            return await super().asend(
+                url,
+                body,
+                headers,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+            )
+
+        parts = urlsplit(url)
+        pool = get_async_pool(
+            parts.netloc,
+            scheme=parts.scheme,
+            maxsize=recaptcha_settings.pool_maxsize,
+            idle_timeout=recaptcha_settings.pool_idle_timeout,
+            dns_ttl=recaptcha_settings.dns_ttl,
+            happy_eyeballs_delay=recaptcha_settings.happy_eyeballs_delay,
+        )
+        return await pool.urlopen(
+            "POST",
+            parts.path,
+            body=body,
+            headers=headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+
+class Urllib3Transport(BaseTransport):
+    """
+    Transport over a ``urllib3.PoolManager``, keyword arguments are passed
+    to it, e.g. ``{"maxsize": 50}``.
+    """
+
+    def __init__(self, **pool_kwargs):
+        self._urllib3 = _import_optional("urllib3", "Urllib3Transport")
+        self.pool_kwargs = pool_kwargs
+        self._managers = {}
+        self._lock = threading.Lock()
+
+    def _get_manager(self, proxy):
+        manager = self._managers.get(proxy)
+        if manager is None:
+            with self._lock:
+                manager = self._managers.get(proxy)
+                if manager is None:
+                    if proxy:
+                        manager = self._urllib3.ProxyManager(proxy, **self.pool_kwargs)
+                    else:
+                        manager = self._urllib3.PoolManager(**self.pool_kwargs)
+                    self._managers[proxy] = manager
+        return manager
+
+    def send(self, url, body, headers, *, connect_timeout, read_timeout):
+        urllib3 = self._urllib3
+        manager = self._get_manager(get_settings().proxy)
+        try:
+            response = manager.request(
+                "POST",
+                url,
+                body=body,
+                headers=headers,
+                timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+                retries=False,
+            )
+        except (
+            urllib3.exceptions.ConnectTimeoutError,
+            urllib3.exceptions.NewConnectionError,
+        ) as err:
+            raise ConnectError(err) from err
+        except urllib3.exceptions.HTTPError as err:
+            raise URLError(err) from err
+
+        return _check_status(
+            url,
+            PoolResponse(
+                response.status, response.reason, response.headers, response.data
+            ),
+        )
+
+
+class RequestsTransport(BaseTransport):
+    """
+    Transport over a ``requests.Session``, keyword arguments are set as its
+    attributes, e.g. ``{"verify": "/path/to/ca.pem"}``.
+    """
+
+    def __init__(self, **session_attrs):
+        self._requests = _import_optional("requests", "RequestsTransport")
+        self._urllib3 = _import_optional("urllib3", "RequestsTransport")
+        self._session_attrs = session_attrs
+        self._local = threading.local()
+
+    def _get_session(self):
+        # Sessions aren't guaranteed to be thread-safe.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._requests.Session()
+            for name, value in self._session_attrs.items():
+                setattr(session, name, value)
+            self._local.session = session
+        return session
+
+    def send(self, url, body, headers, *, connect_timeout, read_timeout):
+        requests = self._requests
+        proxy = get_settings().proxy
+        try:
+            response = self._get_session().post(
+                url,
+                data=body,
+                headers=headers,
+                timeout=(connect_timeout, read_timeout),
+                proxies={"https": proxy, "http": proxy} if proxy else None,
+                allow_redirects=False,
+            )
+        except (requests.exceptions.ProxyError, requests.exceptions.SSLError) as err:
+            raise URLError(err) from err
+        except requests.ConnectionError as err:
+            # Refused connections, DNS failures and connect timeouts, but
+            # not connections dropped once the request was sent.
+            reason = getattr(err.args[0], "reason", None) if err.args else None
+            if isinstance(err, requests.ConnectTimeout) or isinstance(
+                reason,
+                self._urllib3.exceptions.NewConnectionError,
+            ):
+                raise ConnectError(err) from err
+            raise URLError(err) from err
+        except requests.RequestException as err:
+            raise URLError(err) from err
+
+        return _check_status(
+            url,
+            PoolResponse(
+                response.status_code,
+                response.reason,
+                response.headers,
+                response.content,
+            ),
+        )
+
+
+class HttpxTransport(BaseTransport):
+    """
+    Transport over ``httpx.Client`` and ``httpx.AsyncClient``, keyword
+    arguments are passed to them, e.g. ``{"http2": True}``.
+    """
+
+    def __init__(self, **client_kwargs):
+        self._httpx = _import_optional("httpx", "HttpxTransport")
+        self.client_kwargs = client_kwargs
+        self._client = None
+        self._lock = threading.Lock()
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _get_kwargs(self):
+        kwargs = dict(self.client_kwargs)
+        proxy = get_settings().proxy
+        if proxy:
+            kwargs.setdefault("proxy", proxy)
+        return kwargs
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._httpx.Client(**self._get_kwargs())
+        return self._client
+
+    def _get_async_client(self):
+        # Connections of an async client are bound to its event loop.
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._httpx.AsyncClient(**self._get_kwargs())
+            self._async_clients[loop] = client
+        return client
+
+    def _get_timeout(self, connect_timeout, read_timeout):
+        return self._httpx.Timeout(read_timeout, connect=connect_timeout)
+
+    def _to_response(self, url, response):
+        return _check_status(
+            url,
+            PoolResponse(
+                response.status_code,
+                response.reason_phrase,
+                response.headers,
+                response.content,
+            ),
+        )
+
+    def send(self, url, body, headers, *, connect_timeout, read_timeout):
+        httpx = self._httpx
+        try:
+            response = self._get_client().post(
+                url,
+                content=body,
+                headers=headers,
+                timeout=self._get_timeout(connect_timeout, read_timeout),
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout) as err:
+            raise ConnectError(err) from err
+        except httpx.HTTPError as err:
+            raise URLError(err) from err
+        return self._to_response(url, response)
+
+    async def asend(self, url, body, headers, *, connect_timeout, read_timeout):
+        httpx = self._httpx
+        try:
+            response = await self._get_async_client().post(
+                url,
+                content=body,
+                headers=headers,
+                timeout=self._get_timeout(connect_timeout, read_timeout),
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout) as err:
+            raise ConnectError(err) from err
+        except httpx.HTTPError as err:
+            raise URLError(err) from err
+        return self._to_response(url, response)
+
+
+class InMemoryTransport(BaseTransport):
+    """
+    Transport answering without network, e.g. for tests and benchmarks.
+
+    ``response`` is the siteverify JSON payload, or a callable getting the
+    request parameters as a dict and returning it. Parameters of sent
+    requests are collected in ``requests``.
+    """
+
+    def __init__(self, response=None, status=200):
+        self.response = {"success": True} if response is None else response
+        self.status = status
+        self.requests = []
+
+    def send(self, url, body, headers, *, connect_timeout, read_timeout):  # noqa: ARG002
+        params = {
+            name: values[0] for name, values in parse_qs(body.decode("utf-8")).items()
+        }
+        self.requests.append(params)
+
+        payload = self.response(params) if callable(self.response) else self.response
+        return _check_status(
+            url,
+            PoolResponse(
+                self.status,
+                "",
+                {"Content-Type": "application/json"},
+                json.dumps(payload).encode("utf-8"),
+            ),
+        )
+
+    async def asend(self, url, body, headers, *, connect_timeout, read_timeout):
+        return self.send(
+            url,
+            body,
+            headers,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+
+def _create_transport(path, options):
+    try:
+        transport_class = import_string(path)
+    except ImportError as exc:
+        msg = f"DRF_RECAPTCHA_TRANSPORT is invalid: {exc}"
+        raise ImproperlyConfigured(msg) from exc
+    return transport_class(**options)
+
+
+def get_transport():
+    """
+    Return the transport selected by ``DRF_RECAPTCHA_TRANSPORT``, created
+    once per process and settings.
+    """
+    recaptcha_settings = get_settings()
+    path = recaptcha_settings.transport
+    options = recaptcha_settings.transport_options
+    return get_keyed_component(
+        "transport",
+        (path, options),
+        partial(_create_transport, path, options),
+        "DRF_RECAPTCHA_TRANSPORT_OPTIONS",
+    )
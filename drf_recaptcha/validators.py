@@ -1,13 +1,33 @@
 import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import TYPE_CHECKING
-from urllib.error import HTTPError
+from urllib.error import URLError
 
-from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from ipware import get_client_ip
-from rest_framework.serializers import ValidationError
+from rest_framework.serializers import ListSerializer, ValidationError
 
-from drf_recaptcha import client
+from drf_recaptcha import (
+    client,
+    clientip,
+    negative_cache,
+    passes,
+    ratelimit,
+    shedding,
+    signals,
+    timing,
+)
+from drf_recaptcha.breaker import CircuitOpenError
+from drf_recaptcha.concurrency import ConcurrencyLimitError
+from drf_recaptcha.conf import get_settings
+from drf_recaptcha.constants import (
+    CIRCUIT_OPEN_ALLOW,
+    CIRCUIT_OPEN_REJECT,
+    SKIPPED_ALLOW,
+)
 
 if TYPE_CHECKING:
     from drf_recaptcha.client import RecaptchaResponse
@@ -15,6 +35,81 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class RecaptchaResult:
+    """
+    Immutable result of a verification, attached to the field as
+    ``recaptcha_result``.
+    """
+
+    outcome: str
+    score: float | None = None
+    action: str | None = None
+    error_codes: tuple = ()
+    cached: bool = False
+    # Durations of verification stages in seconds, see drf_recaptcha.timing.
+    timings: MappingProxyType = field(
+        default_factory=lambda: MappingProxyType({}),
+        compare=False,
+    )
+
+    @property
+    def is_valid(self):
+        return self.outcome == "pass"
+
+
+_deferred_verifications = ContextVar("drf_recaptcha_deferred", default=None)
+_background_verifications = ContextVar("drf_recaptcha_background", default=None)
+
+
+def _is_collected(serializer_field, root):
+    """
+    Whether the verification of ``serializer_field`` is collected for
+    ``root``. Fields of list items aren't: their errors couldn't be told
+    apart, as items are validated by the same child serializer.
+    """
+    if root is None:
+        return True
+    parent = serializer_field.parent
+    while parent is not None and parent is not root:
+        if isinstance(parent, ListSerializer):
+            return False
+        parent = parent.parent
+    return True
+
+
+@contextmanager
+def defer_verifications(root=None):
+    """
+    Collect ``(validator, value, serializer_field)`` of reCAPTCHA validators
+    called within the block instead of verifying them, so that they can be
+    verified later, e.g. with ``ReCaptchaValidator.acall``. If ``root`` is
+    given, fields of list items within it are verified with their item.
+    """
+    deferred = []
+    token = _deferred_verifications.set((root, deferred))
+    try:
+        yield deferred
+    finally:
+        _deferred_verifications.reset(token)
+
+
+@contextmanager
+def verify_in_background(executor, root=None):
+    """
+    Start verifications of reCAPTCHA validators called within the block on
+    ``executor`` and collect ``(serializer_field, future)`` of them. If
+    ``root`` is given, fields of list items within it are verified with
+    their item.
+    """
+    started = []
+    token = _background_verifications.set((root, executor, started))
+    try:
+        yield started
+    finally:
+        _background_verifications.reset(token)
+
+
 class ReCaptchaValidator:
     requires_context = True
 
@@ -23,8 +118,31 @@ class ReCaptchaValidator:
         "captcha_error": "Error verifying reCAPTCHA, please try again.",
     }
     default_recaptcha_secret_key = ""
+    circuit_open_policy = CIRCUIT_OPEN_REJECT
+    recaptcha_version = None
+    recaptcha_action = None
 
     def __call__(self, value, serializer_field):
+        self._check_token(value, serializer_field)
+
+        deferred = _deferred_verifications.get()
+        if deferred is not None and _is_collected(serializer_field, deferred[0]):
+            deferred[1].append((self, value, serializer_field))
+            return
+
+        background = _background_verifications.get()
+        if background is not None and _is_collected(serializer_field, background[0]):
+            _, executor, started = background
+            # In a copy of the context, e.g. with ``client.deadline``.
+            future = executor.submit(
+                copy_context().run,
+                self._verify_in_background,
+                value,
+                serializer_field,
+            )
+            started.append((serializer_field, future))
+            return
+
         if self._is_testing():
             self._run_validation_as_testing()
             return
@@ -34,35 +152,161 @@ class ReCaptchaValidator:
             serializer_field,
         )
 
-        check_captcha = self._get_captcha_response_with_payload(
-            value=value,
-            secret_key=recaptcha_secret_key,
-            client_ip=client_ip,
+        with timing.collect():
+            self._verify(value, serializer_field, client_ip, recaptcha_secret_key)
+
+    def _verify_in_background(self, value, serializer_field):
+        # Verified right away, not collected again.
+        _deferred_verifications.set(None)
+        _background_verifications.set(None)
+        self(value, serializer_field)
+
+    def _verify(self, value, serializer_field, client_ip, recaptcha_secret_key):
+        started = time.monotonic()
+        if negative_cache.is_blocked(client_ip, self.recaptcha_action):
+            self._reject_locally(serializer_field, started, "blocked", client_ip)
+        if not ratelimit.allow(client_ip):
+            self._reject_locally(serializer_field, started, "rate_limited", client_ip)
+        if not shedding.should_verify(self.recaptcha_action):
+            self._finish_verification(serializer_field, started, None, "skipped")
+            self._on_skipped()
+            return
+
+        try:
+            with client.deadline(self._get_deadline_from_context(serializer_field)):
+                check_captcha = self._get_captcha_response_with_payload(
+                    value=value,
+                    secret_key=recaptcha_secret_key,
+                    client_ip=client_ip,
+                )
+        except CircuitOpenError:
+            self._finish_verification(serializer_field, started, None, "circuit_open")
+            self._on_circuit_open()
+            return
+        except ConcurrencyLimitError:
+            self._finish_verification(serializer_field, started, None, "overloaded")
+            self._on_overloaded()
+        except ValidationError as exc:
+            self._finish_verification(
+                serializer_field, started, None, exc.get_codes()[0]
+            )
+            raise
+
+        try:
+            result = self._validate_response(serializer_field, check_captcha, started)
+        except ValidationError as exc:
+            if exc.get_codes()[0] == "captcha_invalid":
+                negative_cache.record_failure(client_ip, self.recaptcha_action)
+            raise
+        self._issue_pass(serializer_field, client_ip, result)
+
+    async def acall(self, value, serializer_field):
+        self._check_token(value, serializer_field)
+
+        if self._is_testing():
+            self._run_validation_as_testing()
+            return
+
+        client_ip = self._get_client_ip_from_context(serializer_field)
+        recaptcha_secret_key = self._get_secret_key_from_context_or_default(
+            serializer_field,
         )
 
-        self._pre_validate_response(check_captcha)
-        self._process_response(check_captcha)
+        with timing.collect():
+            await self._averify(
+                value, serializer_field, client_ip, recaptcha_secret_key
+            )
+
+    async def _averify(self, value, serializer_field, client_ip, recaptcha_secret_key):
+        started = time.monotonic()
+        if await negative_cache.ais_blocked(client_ip, self.recaptcha_action):
+            self._reject_locally(serializer_field, started, "blocked", client_ip)
+        if not await ratelimit.aallow(client_ip):
+            self._reject_locally(serializer_field, started, "rate_limited", client_ip)
+        if not shedding.should_verify(self.recaptcha_action):
+            self._finish_verification(serializer_field, started, None, "skipped")
+            self._on_skipped()
+            return
+
+        try:
+            with client.deadline(self._get_deadline_from_context(serializer_field)):
+                check_captcha = await self._aget_captcha_response_with_payload(
+                    value=value,
+                    secret_key=recaptcha_secret_key,
+                    client_ip=client_ip,
+                )
+        except CircuitOpenError:
+            self._finish_verification(serializer_field, started, None, "circuit_open")
+            self._on_circuit_open()
+            return
+        except ConcurrencyLimitError:
+            self._finish_verification(serializer_field, started, None, "overloaded")
+            self._on_overloaded()
+        except ValidationError as exc:
+            self._finish_verification(
+                serializer_field, started, None, exc.get_codes()[0]
+            )
+            raise
+
+        try:
+            result = self._validate_response(serializer_field, check_captcha, started)
+        except ValidationError as exc:
+            if exc.get_codes()[0] == "captcha_invalid":
+                await negative_cache.arecord_failure(client_ip, self.recaptcha_action)
+            raise
+        self._issue_pass(serializer_field, client_ip, result)
 
     @staticmethod
     def _is_testing() -> bool:
-        return getattr(settings, "DRF_RECAPTCHA_TESTING", False)
+        return get_settings().testing
 
     def _run_validation_as_testing(self):
-        testing_result = getattr(settings, "DRF_RECAPTCHA_TESTING_PASS", True)
+        testing_result = get_settings().testing_pass
         if not testing_result:
             raise ValidationError(
                 self.messages["captcha_invalid"],
                 code="captcha_invalid",
             )
 
+    def _check_token(self, value: str, serializer_field) -> None:
+        """
+        Reject malformed tokens without a request to Google.
+        """
+        if self._is_testing():
+            return
+
+        recaptcha_settings = get_settings()
+        if (
+            recaptcha_settings.token_min_length
+            <= len(value)
+            <= recaptcha_settings.token_max_length
+        ) and (
+            recaptcha_settings.token_pattern is None
+            or recaptcha_settings.token_pattern.fullmatch(value)
+        ):
+            return
+
+        logger.info("ReCAPTCHA validation failed due to malformed token.")
+        self._finish_verification(
+            serializer_field, time.monotonic(), None, "captcha_invalid"
+        )
+        raise ValidationError(self.messages["captcha_invalid"], code="captcha_invalid")
+
     def _get_secret_key_from_context_or_default(self, serializer_field) -> str:
         return serializer_field.context.get(
             "recaptcha_secret_key",
             self.default_recaptcha_secret_key,
         )
 
+    @staticmethod
+    def _get_deadline_from_context(serializer_field) -> float | None:
+        return serializer_field.context.get("recaptcha_deadline")
+
     @staticmethod
     def _get_client_ip_from_context(serializer_field):
+        if "recaptcha_client_ip" in serializer_field.context:
+            return serializer_field.context["recaptcha_client_ip"]
+
         request = serializer_field.context.get("request")
         if not request:
             msg = (
@@ -71,8 +315,7 @@ class ReCaptchaValidator:
             )
             raise ImproperlyConfigured(msg)
 
-        recaptcha_client_ip, _ = get_client_ip(request)
-        return recaptcha_client_ip
+        return clientip.resolve(request)
 
     def _get_captcha_response_with_payload(
         self,
@@ -86,33 +329,214 @@ class ReCaptchaValidator:
                 secret_key=secret_key,
                 remoteip=client_ip,
             )
-        except HTTPError:  # Catch timeouts, etc.
-            logger.exception("Couldn't get response, HTTPError")
+        except URLError:  # Catch HTTP errors, timeouts, etc.
+            logger.exception("Couldn't get response, URLError")
             raise ValidationError(self.messages["captcha_error"], code="captcha_error")  # noqa: B904
 
         return check_captcha
 
-    def _pre_validate_response(self, check_captcha: "RecaptchaResponse") -> None:
-        if check_captcha.is_valid:
+    async def _aget_captcha_response_with_payload(
+        self,
+        value: str,
+        secret_key: str,
+        client_ip: str,
+    ) -> "RecaptchaResponse":
+        try:
+            check_captcha = await client.asubmit(
+                recaptcha_response=value,
+                secret_key=secret_key,
+                remoteip=client_ip,
+            )
+        except URLError:  # Catch HTTP errors, timeouts, etc.
+            logger.exception("Couldn't get response, URLError")
+            raise ValidationError(self.messages["captcha_error"], code="captcha_error")  # noqa: B904
+
+        return check_captcha
+
+    def _on_circuit_open(self) -> None:
+        if self.circuit_open_policy == CIRCUIT_OPEN_ALLOW:
+            logger.warning("ReCAPTCHA circuit breaker is open, validation skipped.")
+            return
+
+        logger.warning("ReCAPTCHA circuit breaker is open, validation failed.")
+        raise ValidationError(self.messages["captcha_error"], code="captcha_error")
+
+    def _on_overloaded(self) -> None:
+        logger.warning(
+            "ReCAPTCHA validation failed, too many verifications in progress."
+        )
+        raise ValidationError(self.messages["captcha_error"], code="captcha_error")
+
+    def _on_skipped(self) -> None:
+        if shedding.get_load_shedder().skipped == SKIPPED_ALLOW:
+            logger.info("ReCAPTCHA verification skipped under load, validation passed.")
             return
 
+        logger.warning("ReCAPTCHA verification skipped under load, validation failed.")
+        raise ValidationError(self.messages["captcha_error"], code="captcha_error")
+
+    def accepts_pass(self, pass_data, serializer_field) -> bool:
+        """
+        Whether a "verified recently" pass replaces the verification.
+        """
+        return (
+            pass_data.get("ip") == self._get_client_ip_from_context(serializer_field)
+            and pass_data.get("action") == self.recaptcha_action
+        )
+
+    def _issue_pass(self, serializer_field, client_ip, result) -> None:
+        request = serializer_field.context.get("request")
+        # Without a request, e.g. with "recaptcha_client_ip" in context,
+        # there is no response to send the pass with.
+        if request is None or not passes.is_enabled():
+            return
+
+        passes.issue(
+            request,
+            client_ip=client_ip,
+            action=self.recaptcha_action,
+            score=result.score,
+        )
+
+    def _reject_locally(self, serializer_field, started, outcome, client_ip) -> None:
         logger.info(
-            "ReCAPTCHA validation failed due to: %s",
-            check_captcha.error_codes,
+            "ReCAPTCHA validation of client %s failed without verification: %s.",
+            client_ip,
+            outcome,
         )
+        self._finish_verification(serializer_field, started, None, outcome)
         raise ValidationError(self.messages["captcha_invalid"], code="captcha_invalid")
 
+    def _validate_response(
+        self,
+        serializer_field,
+        check_captcha: "RecaptchaResponse",
+        started,
+    ) -> RecaptchaResult:
+        try:
+            self._pre_validate_response(check_captcha)
+            self._process_response(check_captcha)
+        except ValidationError as exc:
+            self._finish_verification(
+                serializer_field, started, check_captcha, exc.get_codes()[0]
+            )
+            raise
+
+        return self._finish_verification(
+            serializer_field, started, check_captcha, "pass"
+        )
+
+    def _finish_verification(
+        self,
+        serializer_field,
+        started,
+        check_captcha,
+        outcome,
+    ) -> RecaptchaResult:
+        """
+        Report the outcome and attach the result to the field.
+        """
+        duration = time.monotonic() - started
+        timings = MappingProxyType({**timing.get_timings(), "total": duration})
+        if check_captcha is None:
+            result = RecaptchaResult(
+                outcome=outcome,
+                action=self.recaptcha_action,
+                timings=timings,
+            )
+        else:
+            result = RecaptchaResult(
+                outcome=outcome,
+                score=check_captcha.score,
+                action=check_captcha.action or self.recaptcha_action,
+                error_codes=tuple(check_captcha.error_codes),
+                cached=check_captcha.cached,
+                timings=timings,
+            )
+        serializer_field.recaptcha_result = result
+
+        request = serializer_field.context.get("request")
+        if request is not None:
+            timing.attach(request, timings)
+        if get_settings().opentelemetry:
+            timing.export_span(
+                timings,
+                {
+                    "version": self.recaptcha_version,
+                    "action": self.recaptcha_action,
+                    "outcome": outcome,
+                    "error_codes": result.error_codes,
+                    "score": result.score,
+                    "cached": result.cached,
+                },
+            )
+
+        signals.verification_finished.send(
+            sender=self.__class__,
+            validator=self,
+            version=self.recaptcha_version,
+            action=self.recaptcha_action,
+            outcome=outcome,
+            error_codes=list(result.error_codes),
+            score=result.score,
+            cached=result.cached,
+            duration=duration,
+            timings=timings,
+        )
+        return result
+
+    def _pre_validate_response(self, check_captcha: "RecaptchaResponse") -> None:
+        if not check_captcha.is_valid:
+            logger.info(
+                "ReCAPTCHA validation failed due to: %s",
+                check_captcha.error_codes,
+            )
+            raise ValidationError(
+                self.messages["captcha_invalid"],
+                code="captcha_invalid",
+            )
+
+        recaptcha_settings = get_settings()
+        allowed_hostnames = recaptcha_settings.allowed_hostnames
+        if allowed_hostnames is not None and (
+            (check_captcha.hostname or "").lower() not in allowed_hostnames
+        ):
+            logger.warning(
+                "ReCAPTCHA validation failed due to hostname '%s' not allowed.",
+                check_captcha.hostname,
+            )
+            raise ValidationError(
+                self.messages["captcha_invalid"],
+                code="captcha_invalid",
+            )
+
+        max_token_age = recaptcha_settings.max_token_age
+        if max_token_age is not None:
+            age = check_captcha.get_age()
+            if age is None or age > max_token_age:
+                logger.warning(
+                    "ReCAPTCHA validation failed due to token age of %s seconds"
+                    " exceeding %s.",
+                    age,
+                    max_token_age,
+                )
+                raise ValidationError(
+                    self.messages["captcha_invalid"],
+                    code="captcha_invalid",
+                )
+
     def _process_response(self, check_captcha_response): ...
 
 
 class ReCaptchaV2Validator(ReCaptchaValidator):
-    def __init__(self, secret_key):
+    recaptcha_version = "v2"
+
+    def __init__(self, secret_key, circuit_open_policy=CIRCUIT_OPEN_REJECT):
         self.default_recaptcha_secret_key = secret_key
+        self.circuit_open_policy = circuit_open_policy
 
     def _process_response(self, check_captcha_response):
-        score = check_captcha_response.extra_data.get("score", None)
-
-        if score is not None:
+        if check_captcha_response.score is not None:
             logger.error(
                 "The response contains score, reCAPTCHA v2 response doesn't"
                 " contains score, probably secret key for reCAPTCHA v3",
@@ -121,28 +545,42 @@ class ReCaptchaV2Validator(ReCaptchaValidator):
 
 
 class ReCaptchaV3Validator(ReCaptchaValidator):
-    def __init__(self, action, required_score, secret_key):
+    recaptcha_version = "v3"
+
+    def __init__(
+        self,
+        action,
+        required_score,
+        secret_key,
+        circuit_open_policy=CIRCUIT_OPEN_REJECT,
+    ):
         self.recaptcha_action = action
         self.recaptcha_required_score = required_score
-        self.score = None
         self.default_recaptcha_secret_key = secret_key
+        self.circuit_open_policy = circuit_open_policy
+
+    def accepts_pass(self, pass_data, serializer_field) -> bool:
+        score = pass_data.get("score")
+        if not super().accepts_pass(pass_data, serializer_field) or score is None:
+            return False
+        return self.recaptcha_required_score <= float(score)
 
     def _process_response(self, check_captcha_response):
-        self.score = check_captcha_response.extra_data.get("score", None)
-        if self.score is None:
+        score = check_captcha_response.score
+        if score is None:
             logger.error(
                 "The response not contains score, reCAPTCHA v3 response must"
                 " contains score, probably secret key for reCAPTCHA v2",
             )
             raise ValidationError(self.messages["captcha_error"], code="captcha_error")
 
-        action = check_captcha_response.extra_data.get("action", "")
+        action = check_captcha_response.action or ""
 
-        if self.recaptcha_required_score > float(self.score):
+        if self.recaptcha_required_score > float(score):
             logger.info(
                 "ReCAPTCHA validation failed due to score of %s"
                 " being lower than the required amount for action '%s'.",
-                self.score,
+                score,
                 action,
             )
             raise ValidationError(
@@ -1,4 +1,11 @@
+import json
+import select
+import socket
+import threading
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
 import pytest
 
@@ -26,3 +33,112 @@ def mocked_serializer_field_with_request_secret_key_context(mocker):
             "recaptcha_secret_key": "from-context",
         },
     )
+
+
+class _SiteverifyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.server.requests.append(
+            self.rfile.read(int(self.headers["Content-Length"])),
+        )
+        status, payload = self.server.response
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.server.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def siteverify_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteverifyHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.requests = []
+    server.response = (200, {"success": True})
+    server.chunked = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    """
+    HTTP proxy tunneling CONNECT requests and forwarding plain ones.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _log_request(self):
+        self.server.requests.append(
+            (self.command, self.path, self.headers.get("Proxy-Authorization")),
+        )
+
+    def do_CONNECT(self):
+        self._log_request()
+        host, port = self.path.rsplit(":", 1)
+        with socket.create_connection((host, int(port))) as upstream:
+            self.send_response(200, "Connection established")
+            self.end_headers()
+            self._relay(self.connection, upstream)
+        self.close_connection = True
+
+    def do_POST(self):
+        self._log_request()
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        upstream = HTTPConnection(url.netloc, timeout=5)
+        try:
+            upstream.request("POST", url.path, body=body)
+            response = upstream.getresponse()
+            data = response.read()
+        finally:
+            upstream.close()
+        self.send_response(response.status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _relay(client, upstream):
+        peers = {client: upstream, upstream: client}
+        while True:
+            readable, _, _ = select.select(list(peers), [], [], 5)
+            if not readable:
+                return
+            for sock in readable:
+                data = sock.recv(65536)
+                if not data:
+                    return
+                peers[sock].sendall(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def proxy_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ProxyHandler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
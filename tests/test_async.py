@@ -0,0 +1,263 @@
+import asyncio
+import socket
+from http.client import RemoteDisconnected
+from urllib.error import HTTPError, URLError
+
+import pytest
+from drf_recaptcha import client
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.fields import ReCaptchaV2Field, ReCaptchaV3Field
+from drf_recaptcha.pool import AsyncHTTPConnectionPool, get_async_pool
+from drf_recaptcha.serializers import ReCaptchaSerializerMixin
+from drf_recaptcha.validators import ReCaptchaV2Validator, ReCaptchaV3Validator
+from rest_framework.serializers import CharField, Serializer, ValidationError
+from rest_framework.test import APIRequestFactory
+
+
+def _pool(server, **kwargs):
+    return AsyncHTTPConnectionPool(
+        f"127.0.0.1:{server.server_address[1]}",
+        scheme="http",
+        **kwargs,
+    )
+
+
+async def _post(pool):
+    return await pool.urlopen(
+        "POST",
+        "/recaptcha/api/siteverify",
+        b"a=b",
+        connect_timeout=5,
+        read_timeout=5,
+    )
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_async_pool_reuses_keep_alive_connection(siteverify_server, chunked):
+    siteverify_server.chunked = chunked
+
+    async def run():
+        pool = _pool(siteverify_server)
+        return [(await _post(pool)).data for _ in range(3)]
+
+    assert asyncio.run(run()) == [b'{"success": true}'] * 3
+    assert siteverify_server.connections == 1
+    assert siteverify_server.requests == [b"a=b"] * 3
+
+
+def test_async_pool_raises_http_error(siteverify_server):
+    siteverify_server.response = (500, {})
+
+    with pytest.raises(HTTPError) as exc_info:
+        asyncio.run(_post(_pool(siteverify_server)))
+
+    assert exc_info.value.code == 500
+
+
+def test_async_pool_retries_connection_closed_by_server(siteverify_server):
+    async def run():
+        pool = _pool(siteverify_server)
+        await _post(pool)
+        _, writer, _ = pool._idle[-1]
+        writer.get_extra_info("socket").shutdown(socket.SHUT_RDWR)
+        return await _post(pool)
+
+    assert asyncio.run(run()).status == 200
+    assert siteverify_server.connections == 2
+
+
+def test_async_pool_read_timeout(siteverify_server):
+    async def run():
+        return await _pool(siteverify_server).urlopen(
+            "POST",
+            "/recaptcha/api/siteverify",
+            b"a=b",
+            read_timeout=0,
+        )
+
+    with pytest.raises(URLError) as exc_info:
+        asyncio.run(run())
+
+    assert isinstance(exc_info.value.reason, TimeoutError)
+
+
+def test_async_pool_clear(siteverify_server):
+    async def run():
+        pool = _pool(siteverify_server)
+        await _post(pool)
+        pool.clear()
+        return pool
+
+    assert not asyncio.run(run())._idle
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (b"HTTP/1.0 200 OK\r\n\r\nbody", (b"body", True)),
+        (b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\nbody", (b"body", True)),
+        (b"", RemoteDisconnected),
+    ],
+)
+def test_async_pool_read_response(data, expected):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        response, will_close = await AsyncHTTPConnectionPool._read_response(
+            reader,
+            await reader.readline(),
+        )
+        return response.data, will_close
+
+    if isinstance(expected, tuple):
+        assert asyncio.run(run()) == expected
+    else:
+        with pytest.raises(expected):
+            asyncio.run(run())
+
+
+def test_get_async_pool_is_bound_to_event_loop():
+    async def run():
+        return get_async_pool("example.com", maxsize=1, idle_timeout=1)
+
+    assert asyncio.run(run()) is not asyncio.run(run())
+
+
+def test_asubmit(siteverify_server, mocker):
+    siteverify_server.response = (200, {"success": False, "error-codes": ["bad"]})
+
+    async def run():
+        mocker.patch(
+            "drf_recaptcha.transports.get_async_pool",
+            return_value=_pool(siteverify_server),
+        )
+        return await client.asubmit("token", "secret", "4.3.2.1")
+
+    response = asyncio.run(run())
+
+    assert response.is_valid is False
+    assert response.error_codes == ["bad"]
+    assert b"response=token" in siteverify_server.requests[0]
+
+
+@pytest.mark.parametrize(
+    ("validator", "response", "error_code"),
+    [
+        (
+            ReCaptchaV2Validator(secret_key="KEY"),  # noqa: S106
+            RecaptchaResponse(is_valid=True),
+            None,
+        ),
+        (
+            ReCaptchaV2Validator(secret_key="KEY"),  # noqa: S106
+            RecaptchaResponse(is_valid=False),
+            "captcha_invalid",
+        ),
+        (
+            ReCaptchaV3Validator(action="act", required_score=0.5, secret_key="KEY"),  # noqa: S106
+            RecaptchaResponse(
+                is_valid=True, extra_data={"score": 0.4, "action": "act"}
+            ),
+            "captcha_invalid",
+        ),
+    ],
+)
+def test_validator_acall(
+    validator,
+    response,
+    error_code,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    submit = mocker.patch("drf_recaptcha.client.asubmit", return_value=response)
+
+    coroutine = validator.acall("token", mocked_serializer_field_with_request_context)
+    if error_code:
+        with pytest.raises(ValidationError) as exc_info:
+            asyncio.run(coroutine)
+        assert exc_info.value.detail[0].code == error_code
+    else:
+        asyncio.run(coroutine)
+
+    submit.assert_called_once_with(
+        recaptcha_response="token",
+        secret_key="KEY",  # noqa: S106
+        remoteip="4.3.2.1",
+    )
+
+
+def test_validator_acall_http_error(
+    mocked_serializer_field_with_request_context, mocker
+):
+    mocker.patch(
+        "drf_recaptcha.client.asubmit",
+        side_effect=HTTPError("url", 500, "error", None, None),
+    )
+    validator = ReCaptchaV2Validator(secret_key="KEY")  # noqa: S106
+
+    with pytest.raises(ValidationError) as exc_info:
+        asyncio.run(
+            validator.acall("token", mocked_serializer_field_with_request_context),
+        )
+
+    assert exc_info.value.detail[0].code == "captcha_error"
+
+
+def test_field_arun_validation_does_not_call_sync_submit(mocker):
+    submit = mocker.patch("drf_recaptcha.client.submit")
+    asubmit = mocker.patch(
+        "drf_recaptcha.client.asubmit",
+        return_value=RecaptchaResponse(
+            is_valid=True,
+            extra_data={"score": 0.9, "action": "act"},
+        ),
+    )
+    field = ReCaptchaV3Field(action="act")
+    field.bind(
+        "recaptcha",
+        Serializer(context={"request": APIRequestFactory().get("/recaptcha")}),
+    )
+
+    assert asyncio.run(field.arun_validation("token")) == "token"
+    assert field.score == 0.9
+    submit.assert_not_called()
+    asubmit.assert_called_once()
+
+
+class _AsyncSerializer(ReCaptchaSerializerMixin, Serializer):
+    recaptcha = ReCaptchaV2Field()
+    name = CharField(max_length=3)
+
+
+def test_serializer_ais_valid(mocker):
+    asubmit = mocker.patch(
+        "drf_recaptcha.client.asubmit",
+        return_value=RecaptchaResponse(is_valid=True),
+    )
+    serializer = _AsyncSerializer(
+        data={"recaptcha": "token", "name": "abc"},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert asyncio.run(serializer.ais_valid()) is True
+    assert serializer.validated_data == {"recaptcha": "token", "name": "abc"}
+    asubmit.assert_called_once()
+
+
+def test_serializer_ais_valid_merges_errors(mocker):
+    mocker.patch(
+        "drf_recaptcha.client.asubmit",
+        return_value=RecaptchaResponse(is_valid=False),
+    )
+    serializer = _AsyncSerializer(
+        data={"recaptcha": "token", "name": "abcd"},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    with pytest.raises(ValidationError):
+        asyncio.run(serializer.ais_valid(raise_exception=True))
+
+    assert serializer.validated_data == {}
+    assert set(serializer.errors) == {"recaptcha", "name"}
+    assert serializer.errors["recaptcha"][0].code == "captcha_invalid"
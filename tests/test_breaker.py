@@ -0,0 +1,215 @@
+import asyncio
+from urllib.error import URLError
+
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha import client
+from drf_recaptcha.breaker import (
+    CACHE_KEY,
+    CircuitBreaker,
+    CircuitOpenError,
+    get_breaker,
+)
+from drf_recaptcha.constants import CIRCUIT_OPEN_ALLOW
+from drf_recaptcha.pool import PoolResponse
+from drf_recaptcha.validators import ReCaptchaV2Validator, ReCaptchaV3Validator
+from rest_framework.serializers import ValidationError
+
+
+@pytest.fixture
+def monotonic(mocker):
+    return mocker.patch("drf_recaptcha.breaker.time.monotonic", return_value=100.0)
+
+
+def _fail(breaker, times):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_failure_rate(monotonic):
+    breaker = CircuitBreaker(failure_rate=0.5, minimum_calls=4)
+
+    breaker.before_call()
+    breaker.record_success(0.1)
+    _fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_counts_slow_calls_as_failures(monotonic):
+    breaker = CircuitBreaker(minimum_calls=2, slow_call_duration=1)
+
+    breaker.record_success(0.5)
+    breaker.record_success(1.5)
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_forgets_failures_out_of_window(monotonic):
+    breaker = CircuitBreaker(minimum_calls=2, window=10)
+
+    _fail(breaker, 1)
+    monotonic.return_value += 10
+    breaker.record_success(0.1)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize(
+    ("trial_failed", "expected_state"),
+    [(False, CircuitBreaker.CLOSED), (True, CircuitBreaker.OPEN)],
+)
+def test_breaker_half_open_trial(trial_failed, expected_state, monotonic):
+    breaker = CircuitBreaker(minimum_calls=1, recovery_timeout=30)
+    _fail(breaker, 1)
+
+    monotonic.return_value += 30
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    if trial_failed:
+        breaker.record_failure()
+    else:
+        breaker.record_success(0.1)
+    assert breaker.state == expected_state
+
+
+def test_breaker_state_is_shared_through_cache(monotonic):
+    caches["default"].delete(CACHE_KEY)
+    breaker = CircuitBreaker(minimum_calls=1, cache="default")
+    other_process_breaker = CircuitBreaker(cache="default")
+
+    other_process_breaker.before_call()
+    _fail(breaker, 1)
+
+    with pytest.raises(CircuitOpenError):
+        other_process_breaker.before_call()
+    caches["default"].delete(CACHE_KEY)
+
+
+def test_get_breaker(settings):
+    settings.DRF_RECAPTCHA_CIRCUIT_BREAKER = None
+    assert get_breaker() is None
+
+    settings.DRF_RECAPTCHA_CIRCUIT_BREAKER = {"minimum_calls": 5}
+    breaker = get_breaker()
+    assert breaker.minimum_calls == 5
+    assert get_breaker() is breaker
+
+    settings.DRF_RECAPTCHA_CIRCUIT_BREAKER = {"unknown": 5}
+    with pytest.raises(ImproperlyConfigured):
+        get_breaker()
+
+
+def test_submit_records_calls(settings, mocker):
+    settings.DRF_RECAPTCHA_CIRCUIT_BREAKER = {"minimum_calls": 2}
+    recaptcha_request = mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        side_effect=[
+            PoolResponse(200, "OK", {}, b'{"success": true}'),
+            URLError("timed out"),
+        ],
+    )
+
+    client.submit("token", "secret", "4.3.2.1")
+    with pytest.raises(URLError):
+        client.submit("token", "secret", "4.3.2.1")
+    with pytest.raises(CircuitOpenError):
+        client.submit("token", "secret", "4.3.2.1")
+
+    assert recaptcha_request.call_count == 2
+
+
+def test_cancelled_trial_is_released(settings, mocker, monotonic):
+    settings.DRF_RECAPTCHA_CIRCUIT_BREAKER = {
+        "minimum_calls": 1,
+        "recovery_timeout": 30,
+    }
+    breaker = get_breaker()
+    _fail(breaker, 1)
+    monotonic.return_value += 30
+    mocker.patch(
+        "drf_recaptcha.client.arecaptcha_request",
+        side_effect=asyncio.CancelledError,
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(client.asubmit("token", "secret", "4.3.2.1"))
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is True
+
+
+def test_async_breaker_uses_async_cache(monotonic, mocker):
+    cache = caches["default"]
+    cache.delete(CACHE_KEY)
+    aget = mocker.spy(cache, "aget")
+    aset = mocker.spy(cache, "aset")
+    breaker = CircuitBreaker(minimum_calls=1, cache="default")
+
+    async def run():
+        await breaker.abefore_call()
+        await breaker.arecord_failure()
+
+    asyncio.run(run())
+
+    aget.assert_called_once_with(CACHE_KEY)
+    aset.assert_called_once_with(CACHE_KEY, 1, breaker.recovery_timeout)
+    assert cache.get(CACHE_KEY) == 1
+    cache.delete(CACHE_KEY)
+
+
+@pytest.mark.parametrize(
+    ("validator_class", "params"),
+    [
+        (ReCaptchaV2Validator, {}),
+        (ReCaptchaV3Validator, {"action": "test_action", "required_score": 0.4}),
+    ],
+)
+def test_validator_rejects_while_circuit_is_open(
+    validator_class,
+    params,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocker.patch("drf_recaptcha.client.submit", side_effect=CircuitOpenError)
+    validator = validator_class(secret_key="KEY", **params)  # noqa: S106
+
+    with pytest.raises(ValidationError) as exc_info:
+        validator("token", mocked_serializer_field_with_request_context)
+
+    assert exc_info.value.detail[0].code == "captcha_error"
+
+
+def test_validator_allows_while_circuit_is_open(
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocker.patch("drf_recaptcha.client.submit", side_effect=CircuitOpenError)
+    validator = ReCaptchaV2Validator(
+        secret_key="KEY",  # noqa: S106
+        circuit_open_policy=CIRCUIT_OPEN_ALLOW,
+    )
+
+    validator("token", mocked_serializer_field_with_request_context)
+
+
+def test_validator_url_error_is_captcha_error(
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocker.patch("drf_recaptcha.client.submit", side_effect=URLError("timed out"))
+    validator = ReCaptchaV2Validator(secret_key="KEY")  # noqa: S106
+
+    with pytest.raises(ValidationError) as exc_info:
+        validator("token", mocked_serializer_field_with_request_context)
+
+    assert exc_info.value.detail[0].code == "captcha_error"
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from django.core.cache import caches
+from drf_recaptcha import client
+from drf_recaptcha.cache import make_key
+from drf_recaptcha.pool import PoolResponse
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    caches["default"].clear()
+
+
+@pytest.fixture
+def recaptcha_request(mocker):
+    return mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        return_value=PoolResponse(200, "OK", {}, b'{"success": true, "score": 0.7}'),
+    )
+
+
+def test_make_key_depends_on_secret_key_and_token():
+    key = make_key("secret", "token")
+
+    assert key.startswith("drf_recaptcha:response:")
+    assert "token" not in key.removeprefix("drf_recaptcha:response:")
+    assert key == make_key("secret", "token")
+    assert key != make_key("other", "token")
+    assert key != make_key("secret", "other")
+
+
+def test_submit_without_cache(recaptcha_request):
+    client.submit("token", "secret", "4.3.2.1")
+    client.submit("token", "secret", "4.3.2.1")
+
+    assert recaptcha_request.call_count == 2
+
+
+def test_submit_with_cache(recaptcha_request, settings):
+    settings.DRF_RECAPTCHA_CACHE = "default"
+
+    first = client.submit("token", "secret", "4.3.2.1")
+    second = client.submit("token", "secret", "4.3.2.1")
+    client.submit("token", "other-secret", "4.3.2.1")
+
+    assert recaptcha_request.call_count == 2
+    assert first.is_valid is second.is_valid is True
+    assert first.extra_data == second.extra_data == {"score": 0.7}
+
+
+@pytest.mark.parametrize(("timeout", "expected"), [(None, 120), (30, 30), (600, 120)])
+def test_cache_timeout_is_capped_by_token_lifetime(
+    timeout,
+    expected,
+    recaptcha_request,
+    settings,
+    mocker,
+):
+    settings.DRF_RECAPTCHA_CACHE = "default"
+    if timeout:
+        settings.DRF_RECAPTCHA_CACHE_TIMEOUT = timeout
+    cache_set = mocker.spy(caches["default"], "set")
+
+    client.submit("token", "secret", "4.3.2.1")
+
+    cache_set.assert_called_once_with(mocker.ANY, mocker.ANY, expected)
+
+
+def test_asubmit_with_cache(settings, mocker):
+    settings.DRF_RECAPTCHA_CACHE = "default"
+    arecaptcha_request = mocker.patch(
+        "drf_recaptcha.client.arecaptcha_request",
+        return_value=PoolResponse(200, "OK", {}, b'{"success": false}'),
+    )
+
+    async def run():
+        await client.asubmit("token", "secret", "4.3.2.1")
+        return await client.asubmit("token", "secret", "4.3.2.1")
+
+    assert asyncio.run(run()).is_valid is False
+    arecaptcha_request.assert_called_once()
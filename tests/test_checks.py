@@ -23,3 +23,27 @@ def test_warning_test_secret_key(settings):
     errors = recaptcha_system_check(None)
     assert len(errors) == 1
     assert errors[0].hint == "Update settings.DRF_RECAPTCHA_SECRET_KEY"
+
+
+def test_error_unknown_cache_alias(settings):
+    settings.DRF_RECAPTCHA_CACHE = "unknown"
+
+    errors = recaptcha_system_check(None)
+    assert len(errors) == 1
+    assert errors[0].id == "drf_recaptcha.recaptcha_cache_error"
+
+
+def test_error_unknown_rate_limit_cache_alias(settings):
+    settings.DRF_RECAPTCHA_RATE_LIMIT = {"rate": 1, "cache": "unknown"}
+
+    errors = recaptcha_system_check(None)
+    assert len(errors) == 1
+    assert errors[0].id == "drf_recaptcha.recaptcha_rate_limit_cache_error"
+
+
+def test_error_unknown_negative_cache_cache_alias(settings):
+    settings.DRF_RECAPTCHA_NEGATIVE_CACHE = {"cache": "unknown"}
+
+    errors = recaptcha_system_check(None)
+    assert len(errors) == 1
+    assert errors[0].id == "drf_recaptcha.recaptcha_negative_cache_cache_error"
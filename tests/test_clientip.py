@@ -0,0 +1,101 @@
+import ipaddress
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory
+from drf_recaptcha import clientip
+from drf_recaptcha.clientip import ClientIPResolver, NetworkSet
+from drf_recaptcha.validators import ReCaptchaV2Validator
+from rest_framework.request import Request
+
+TRUSTED_PROXIES = ["10.0.0.0/8", "192.168.1.1", "2001:db8::/32"]
+
+
+@pytest.mark.parametrize(
+    ("address", "expected"),
+    [
+        ("10.1.2.3", True),
+        ("11.0.0.1", False),
+        ("192.168.1.1", True),
+        ("192.168.1.2", False),
+        ("2001:db8::1", True),
+        ("2001:db9::1", False),
+    ],
+)
+def test_network_set(address, expected):
+    assert (ipaddress.ip_address(address) in NetworkSet(TRUSTED_PROXIES)) is expected
+
+
+@pytest.mark.parametrize(
+    ("meta", "expected"),
+    [
+        # Not from a trusted proxy, the header is ignored.
+        ({"REMOTE_ADDR": "4.3.2.1", "HTTP_X_FORWARDED_FOR": "1.1.1.1"}, "4.3.2.1"),
+        ({"REMOTE_ADDR": "10.0.0.1", "HTTP_X_FORWARDED_FOR": "1.1.1.1"}, "1.1.1.1"),
+        # Spoofed addresses left of the first untrusted one are ignored.
+        (
+            {
+                "REMOTE_ADDR": "10.0.0.1",
+                "HTTP_X_FORWARDED_FOR": "1.1.1.1, 4.3.2.1, 192.168.1.1",
+            },
+            "4.3.2.1",
+        ),
+        ({"REMOTE_ADDR": "10.0.0.1", "HTTP_X_FORWARDED_FOR": "10.0.0.2"}, "10.0.0.2"),
+        (
+            {"REMOTE_ADDR": "10.0.0.1", "HTTP_X_FORWARDED_FOR": "bad, 10.0.0.2"},
+            "10.0.0.2",
+        ),
+        ({"REMOTE_ADDR": "10.0.0.1"}, "10.0.0.1"),
+        ({"REMOTE_ADDR": "::ffff:4.3.2.1"}, "4.3.2.1"),
+        ({}, None),
+    ],
+)
+def test_resolver(meta, expected):
+    resolver = ClientIPResolver(trusted_proxies=TRUSTED_PROXIES)
+
+    assert resolver.resolve(meta) == expected
+
+
+def test_resolver_custom_header():
+    resolver = ClientIPResolver(trusted_proxies=["10.0.0.0/8"], header="HTTP_X_REAL_IP")
+
+    assert resolver.resolve(
+        {"REMOTE_ADDR": "10.0.0.1", "HTTP_X_REAL_IP": "4.3.2.1"}
+    ) == ("4.3.2.1")
+
+
+@pytest.mark.parametrize("options", [{}, {"trusted_proxies": ["10.0.0.0/33"]}])
+def test_get_client_ip_resolver_invalid(settings, options):
+    settings.DRF_RECAPTCHA_CLIENT_IP = options
+
+    with pytest.raises(ImproperlyConfigured):
+        clientip.get_client_ip_resolver()
+
+
+def test_resolve_is_memoized_on_request(settings, mocker):
+    settings.DRF_RECAPTCHA_CLIENT_IP = {"trusted_proxies": TRUSTED_PROXIES}
+    http_request = RequestFactory().get(
+        "/",
+        REMOTE_ADDR="10.0.0.1",
+        HTTP_X_FORWARDED_FOR="4.3.2.1",
+    )
+    resolve = mocker.spy(ClientIPResolver, "resolve")
+
+    assert clientip.resolve(Request(http_request)) == "4.3.2.1"
+    assert clientip.resolve(http_request) == "4.3.2.1"
+    assert http_request.recaptcha_client_ip == "4.3.2.1"
+    resolve.assert_called_once()
+
+
+def test_resolve_with_ipware():
+    http_request = RequestFactory().get("/", REMOTE_ADDR="4.3.2.1")
+
+    assert clientip.resolve(http_request) == "4.3.2.1"
+
+
+def test_validator_client_ip_from_context(mocker):
+    resolve = mocker.patch("drf_recaptcha.clientip.resolve")
+    field = mocker.Mock(context={"recaptcha_client_ip": "1.2.3.4"})
+
+    assert ReCaptchaV2Validator._get_client_ip_from_context(field) == "1.2.3.4"
+    resolve.assert_not_called()
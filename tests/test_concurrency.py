@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha import client
+from drf_recaptcha.concurrency import (
+    ConcurrencyLimiter,
+    ConcurrencyLimitError,
+    get_concurrency_limiter,
+)
+from drf_recaptcha.validators import ReCaptchaV2Validator
+from rest_framework.serializers import ValidationError
+
+
+def test_limiter_rejects_over_limit():
+    limiter = ConcurrencyLimiter(max_concurrent=1)
+
+    assert limiter.acquire() is True
+    assert limiter.acquire() is False
+    assert (limiter.active, limiter.queue_depth, limiter.rejected) == (1, 0, 1)
+
+    limiter.release()
+    assert limiter.acquire() is True
+
+
+def test_limiter_queue_times_out():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    limiter.acquire()
+
+    assert limiter.acquire() is False
+    assert (limiter.queue_depth, limiter.timed_out, limiter.rejected) == (0, 1, 0)
+
+
+def test_limiter_hands_slot_over_to_waiter():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=5)
+    limiter.acquire()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(limiter.acquire()))
+    waiter.start()
+    while limiter.queue_depth == 0:
+        pass
+
+    assert limiter.acquire() is False
+    limiter.release()
+    waiter.join()
+
+    assert results == [True]
+    assert (limiter.active, limiter.queue_depth, limiter.rejected) == (1, 0, 1)
+
+
+def test_limiter_async_waiter():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=5)
+    limiter.acquire()
+
+    def release():
+        while limiter.queue_depth == 0:
+            pass
+        limiter.release()
+
+    releaser = threading.Thread(target=release)
+    releaser.start()
+    assert asyncio.run(limiter.aacquire()) is True
+    releaser.join()
+    assert limiter.active == 1
+
+
+def test_limiter_async_queue_times_out():
+    limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    limiter.acquire()
+
+    assert asyncio.run(limiter.aacquire()) is False
+    assert (limiter.queue_depth, limiter.timed_out) == (0, 1)
+
+
+def test_get_concurrency_limiter_invalid(settings):
+    settings.DRF_RECAPTCHA_CONCURRENCY_LIMIT = {"max_queue": 1}
+
+    with pytest.raises(ImproperlyConfigured):
+        get_concurrency_limiter()
+
+
+def test_submit_releases_slot(settings, mocker):
+    settings.DRF_RECAPTCHA_CONCURRENCY_LIMIT = {"max_concurrent": 1}
+    mocker.patch(
+        "drf_recaptcha.client._verify", side_effect=[{"success": True}, OSError]
+    )
+
+    client.submit("token", "secret", "4.3.2.1")
+    with pytest.raises(OSError):  # noqa: PT011
+        client.submit("token", "secret", "4.3.2.1")
+
+    assert get_concurrency_limiter().active == 0
+
+
+def test_submit_rejected_over_limit(settings, mocker):
+    settings.DRF_RECAPTCHA_CONCURRENCY_LIMIT = {"max_concurrent": 0}
+    verify = mocker.patch("drf_recaptcha.client._verify")
+    averify = mocker.patch("drf_recaptcha.client._averify")
+
+    with pytest.raises(ConcurrencyLimitError):
+        client.submit("token", "secret", "4.3.2.1")
+    with pytest.raises(ConcurrencyLimitError):
+        asyncio.run(client.asubmit("token", "secret", "4.3.2.1"))
+
+    verify.assert_not_called()
+    averify.assert_not_called()
+    assert get_concurrency_limiter().rejected == 2
+
+
+def test_validator_fails_over_limit(
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    settings.DRF_RECAPTCHA_CONCURRENCY_LIMIT = {"max_concurrent": 0}
+    mocker.patch("drf_recaptcha.client._verify")
+    validator = ReCaptchaV2Validator(secret_key="TEST_SECRET_KEY")  # noqa: S106
+    field = mocked_serializer_field_with_request_context
+
+    with pytest.raises(ValidationError) as exc_info:
+        validator("token", field)
+
+    assert exc_info.value.detail[0].code == "captcha_error"
+    assert field.recaptcha_result.outcome == "overloaded"
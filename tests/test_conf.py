@@ -0,0 +1,124 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha import conf
+from drf_recaptcha.conf import get_component, get_keyed_component, get_settings
+
+
+def test_settings_snapshot_is_reused():
+    assert get_settings() is get_settings()
+
+
+def test_settings_snapshot_is_rebuilt_on_setting_change(settings):
+    snapshot = get_settings()
+
+    settings.DRF_RECAPTCHA_DOMAIN = "www.recaptcha.net"
+
+    assert get_settings() is not snapshot
+    assert get_settings().domain == "www.recaptcha.net"
+
+
+def test_settings_snapshot_is_immutable():
+    recaptcha_settings = get_settings()
+
+    with pytest.raises(FrozenInstanceError):
+        recaptcha_settings.testing = True
+    with pytest.raises(TypeError):
+        recaptcha_settings.action_v3_scores["login"] = 0.1
+
+
+def test_settings_snapshot_values(settings):
+    settings.DRF_RECAPTCHA_PROXY = {"https": "http://127.0.0.1:3128"}
+    settings.DRF_RECAPTCHA_ACTION_V3_SCORES = {"login": 0.6}
+    settings.DRF_RECAPTCHA_CACHE_TIMEOUT = 600
+
+    recaptcha_settings = get_settings()
+
+    assert recaptcha_settings.proxy == "http://127.0.0.1:3128"
+    assert recaptcha_settings.action_v3_scores == {"login": 0.6}
+    assert recaptcha_settings.cache_timeout == 120
+    assert recaptcha_settings.verify_request_timeout == 10
+
+
+@pytest.mark.parametrize(
+    ("environ", "expected_proxy"),
+    [
+        ({"https_proxy": "http://127.0.0.1:3128"}, "http://127.0.0.1:3128"),
+        ({"https_proxy": "127.0.0.1:3128"}, "http://127.0.0.1:3128"),
+        (
+            {"https_proxy": "http://127.0.0.1:3128", "no_proxy": ".google.com"},
+            None,
+        ),
+        ({}, None),
+    ],
+)
+def test_settings_snapshot_environment_proxy(
+    environ,
+    expected_proxy,
+    settings,
+    monkeypatch,
+):
+    for name in ("https_proxy", "HTTPS_PROXY", "no_proxy", "NO_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    settings.DRF_RECAPTCHA_PROXY = {}
+
+    assert get_settings().proxy == expected_proxy
+
+
+def test_settings_snapshot_proxy_overrides_environment(settings, monkeypatch):
+    monkeypatch.setenv("https_proxy", "http://127.0.0.1:3128")
+    settings.DRF_RECAPTCHA_PROXY = {"https": "proxy.local:8080"}
+
+    assert get_settings().proxy == "http://proxy.local:8080"
+
+
+def test_settings_snapshot_invalid_token_pattern(settings):
+    settings.DRF_RECAPTCHA_TOKEN_PATTERN = "["  # noqa: S105
+
+    with pytest.raises(ImproperlyConfigured) as exc_info:
+        get_settings()
+
+    assert str(exc_info.value).startswith("DRF_RECAPTCHA_TOKEN_PATTERN is invalid")
+
+
+class _Component:
+    def __init__(self, *, rate):
+        self.rate = rate
+
+
+def test_get_component(settings):
+    assert get_component("rate_limit", _Component, "X") is None
+
+    settings.DRF_RECAPTCHA_RATE_LIMIT = {"rate": 1}
+    component = get_component("rate_limit", _Component, "X")
+    assert component.rate == 1
+    assert get_component("rate_limit", _Component, "X") is component
+
+    settings.DRF_RECAPTCHA_RATE_LIMIT = {"rate": 2}
+    rebuilt = get_component("rate_limit", _Component, "X")
+    assert rebuilt is not component
+    assert rebuilt.rate == 2
+
+    conf._reset_components_after_fork()
+    assert get_component("rate_limit", _Component, "X") is not rebuilt
+
+
+def test_get_component_invalid(settings):
+    settings.DRF_RECAPTCHA_RATE_LIMIT = {"burst": 1}
+
+    with pytest.raises(ImproperlyConfigured, match=r"^X is invalid"):
+        get_component("rate_limit", _Component, "X")
+
+
+def test_get_keyed_component_closes_replaced(mocker):
+    close = mocker.Mock()
+
+    component = get_keyed_component("keyed", 1, object, "X", close=close)
+    assert get_keyed_component("keyed", 1, object, "X", close=close) is component
+    close.assert_not_called()
+
+    assert get_keyed_component("keyed", 2, object, "X", close=close) is not component
+    close.assert_called_once_with(component)
@@ -0,0 +1,159 @@
+import asyncio
+import socket
+import time
+
+import pytest
+from drf_recaptcha import dns
+from drf_recaptcha.pool import AsyncHTTPConnectionPool, HTTPConnectionPool
+
+
+def _info(family, address, port):
+    return (family, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, port))
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(autouse=True)
+def _clear_addresses():
+    dns.clear()
+    yield
+    dns.clear()
+
+
+def test_resolve_caches_addresses(mocker):
+    getaddrinfo = mocker.patch(
+        "socket.getaddrinfo",
+        return_value=[_info(socket.AF_INET, "1.2.3.4", 443)],
+    )
+
+    assert dns.resolve("example.com", 443, ttl=60) == dns.resolve(
+        "example.com", 443, ttl=60
+    )
+    getaddrinfo.assert_called_once()
+
+    mocker.patch("time.monotonic", return_value=time.monotonic() + 61)
+    dns.resolve("example.com", 443, ttl=60)
+    assert getaddrinfo.call_count == 2
+
+
+def test_resolve_without_ttl_does_not_cache(mocker):
+    getaddrinfo = mocker.patch(
+        "socket.getaddrinfo",
+        return_value=[_info(socket.AF_INET, "1.2.3.4", 443)],
+    )
+
+    dns.resolve("example.com", 443, ttl=None)
+    dns.resolve("example.com", 443, ttl=0)
+
+    assert getaddrinfo.call_count == 2
+
+
+def test_interleave_alternates_address_families():
+    infos = [
+        _info(socket.AF_INET6, "::1", 1),
+        _info(socket.AF_INET6, "::2", 1),
+        _info(socket.AF_INET6, "::3", 1),
+        _info(socket.AF_INET, "1.1.1.1", 1),
+    ]
+
+    assert [info[4][0] for info in dns._interleave(infos)] == [
+        "::1",
+        "1.1.1.1",
+        "::2",
+        "::3",
+    ]
+
+
+@pytest.mark.parametrize("delay", [0.05, None])
+def test_create_connection_falls_back_to_next_address(siteverify_server, mocker, delay):
+    port = siteverify_server.server_address[1]
+    mocker.patch(
+        "drf_recaptcha.dns.resolve",
+        return_value=[
+            _info(socket.AF_INET, "127.0.0.1", _closed_port()),
+            _info(socket.AF_INET, "127.0.0.1", port),
+        ],
+    )
+
+    with dns.create_connection(("example.com", port), 5, delay=delay) as sock:
+        assert sock.getpeername() == ("127.0.0.1", port)
+        assert sock.gettimeout() == 5
+
+
+def test_create_connection_raises_last_error(mocker):
+    mocker.patch(
+        "drf_recaptcha.dns.resolve",
+        return_value=[_info(socket.AF_INET, "127.0.0.1", _closed_port())],
+    )
+
+    with pytest.raises(ConnectionRefusedError):
+        dns.create_connection(("example.com", 1), 5)
+
+
+def test_create_connection_without_addresses(mocker):
+    mocker.patch("drf_recaptcha.dns.resolve", return_value=[])
+
+    with pytest.raises(OSError, match="getaddrinfo returns an empty list"):
+        dns.create_connection(("example.com", 1), 5)
+
+
+def test_create_connection_binds_source_address(siteverify_server, mocker):
+    port = siteverify_server.server_address[1]
+    mocker.patch(
+        "drf_recaptcha.dns.resolve",
+        return_value=[_info(socket.AF_INET, "127.0.0.1", port)],
+    )
+
+    with dns.create_connection(("example.com", port), 5, ("127.0.0.1", 0)) as sock:
+        assert sock.getsockname()[0] == "127.0.0.1"
+        assert sock.getpeername() == ("127.0.0.1", port)
+
+
+def test_acreate_connection_raises_last_error(mocker):
+    mocker.patch(
+        "drf_recaptcha.dns.aresolve",
+        return_value=[_info(socket.AF_INET, "127.0.0.1", _closed_port())],
+    )
+
+    with pytest.raises(ConnectionRefusedError):
+        asyncio.run(dns.acreate_connection("example.com", 1))
+
+
+def test_acreate_connection_falls_back_to_next_address(siteverify_server, mocker):
+    port = siteverify_server.server_address[1]
+    mocker.patch(
+        "drf_recaptcha.dns.aresolve",
+        return_value=[
+            _info(socket.AF_INET, "127.0.0.1", _closed_port()),
+            _info(socket.AF_INET, "127.0.0.1", port),
+        ],
+    )
+
+    async def run():
+        sock = await dns.acreate_connection("example.com", port, delay=0.05)
+        with sock:
+            return sock.getpeername()
+
+    assert asyncio.run(run()) == ("127.0.0.1", port)
+
+
+def test_pools_resolve_host_once(siteverify_server, mocker):
+    getaddrinfo = mocker.spy(socket, "getaddrinfo")
+    host = f"localhost:{siteverify_server.server_address[1]}"
+
+    async def apost():
+        pool = AsyncHTTPConnectionPool(host, scheme="http", idle_timeout=0)
+        for _ in range(2):
+            await pool.urlopen("POST", "/", b"a=b", connect_timeout=5, read_timeout=5)
+
+    pool = HTTPConnectionPool(host, scheme="http", idle_timeout=0)
+    for _ in range(2):
+        pool.urlopen("POST", "/", body=b"a=b", connect_timeout=5, read_timeout=5)
+    asyncio.run(apost())
+
+    assert siteverify_server.connections == 4
+    getaddrinfo.assert_called_once()
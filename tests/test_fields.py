@@ -1,7 +1,11 @@
 import pytest
 from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha.breaker import CircuitOpenError
+from drf_recaptcha.constants import CIRCUIT_OPEN_ALLOW
 from drf_recaptcha.fields import ReCaptchaV2Field, ReCaptchaV3Field
 from drf_recaptcha.validators import ReCaptchaV2Validator, ReCaptchaV3Validator
+from rest_framework.serializers import Serializer
+from rest_framework.test import APIRequestFactory
 
 
 @pytest.mark.parametrize(
@@ -145,3 +149,34 @@ def test_recaptcha_v3_field_valid_scores(
 
     field = ReCaptchaV3Field(action="test_action", **params)
     assert field.required_score == expected
+
+
+def test_recaptcha_v3_field_score_before_validation():
+    with pytest.raises(AssertionError):
+        ReCaptchaV3Field(action="test_action").score  # noqa: B018
+
+
+@pytest.mark.parametrize("outcome", ["circuit_open", "skipped"])
+def test_recaptcha_v3_field_score_without_verification(outcome, settings, mocker):
+    if outcome == "skipped":
+        settings.DRF_RECAPTCHA_LOAD_SHEDDING = {
+            "sample_rates": {"*": 0},
+            "max_in_flight": 0,
+        }
+    mocker.patch("drf_recaptcha.client.submit", side_effect=CircuitOpenError)
+
+    class _Serializer(Serializer):
+        recaptcha = ReCaptchaV3Field(
+            action="test_action",
+            circuit_open_policy=CIRCUIT_OPEN_ALLOW,
+        )
+
+    serializer = _Serializer(
+        data={"recaptcha": "token"},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is True
+    field = serializer.fields["recaptcha"]
+    assert field.recaptcha_result.outcome == outcome
+    assert field.score is None
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+from urllib.error import URLError
+
+import pytest
+from drf_recaptcha import client, timing
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.constants import VERIFY_BACKGROUND, VERIFY_INLINE, VERIFY_LAST
+from drf_recaptcha.fields import ReCaptchaV3Field
+from drf_recaptcha.serializers import ReCaptchaListSerializer, ReCaptchaSerializerMixin
+from rest_framework.serializers import CharField, Serializer
+from rest_framework.test import APIRequestFactory
+
+
+def _submit(recaptcha_response, secret_key, remoteip):
+    if recaptcha_response == "error":
+        msg = "error"
+        raise URLError(msg)
+    return RecaptchaResponse(is_valid=recaptcha_response == "good")
+
+
+def test_submit_many(mocker):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def submit(*args):
+        # Fails unless all requests are sent at once.
+        barrier.wait()
+        return _submit(*args)
+
+    mocker.patch("drf_recaptcha.client.submit", side_effect=submit)
+
+    results = client.submit_many(
+        [(token, "secret", "4.3.2.1") for token in ("good", "bad", "error")],
+    )
+
+    assert [result.is_valid for result in results[:2]] == [True, False]
+    assert isinstance(results[2], URLError)
+
+
+def test_asubmit_many(settings, mocker):
+    settings.DRF_RECAPTCHA_MAX_WORKERS = 2
+    running = 0
+    max_running = 0
+
+    async def asubmit(*args):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return _submit(*args)
+
+    mocker.patch("drf_recaptcha.client.asubmit", side_effect=asubmit)
+
+    results = asyncio.run(
+        client.asubmit_many(
+            [(token, "secret", "4.3.2.1") for token in ("good", "bad", "error")],
+        ),
+    )
+
+    assert [result.is_valid for result in results[:2]] == [True, False]
+    assert isinstance(results[2], URLError)
+    assert max_running == 2
+
+
+class _ItemSerializer(Serializer):
+    recaptcha = ReCaptchaV3Field(action="bulk")
+    name = CharField(max_length=3)
+
+    class Meta:
+        list_serializer_class = ReCaptchaListSerializer
+
+
+def _response(recaptcha_response):
+    return RecaptchaResponse(
+        is_valid=recaptcha_response == "good",
+        extra_data={"score": 0.9, "action": "bulk"},
+    )
+
+
+@pytest.fixture(params=[True, False], ids=["drf>=3.15", "drf3.14"])
+def has_run_child_validation(request, mocker):
+    mocker.patch(
+        "drf_recaptcha.serializers.HAS_RUN_CHILD_VALIDATION",
+        request.param,
+    )
+    return request.param
+
+
+@pytest.mark.usefixtures("has_run_child_validation")
+def test_list_serializer_verifies_items_concurrently(mocker):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def submit(recaptcha_response, **kwargs):
+        barrier.wait()
+        return _response(recaptcha_response)
+
+    mocker.patch("drf_recaptcha.client.submit", side_effect=submit)
+    data = [{"recaptcha": "good", "name": "abc"}] * 3
+    serializer = _ItemSerializer(
+        data=data,
+        many=True,
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is True
+    assert serializer.validated_data == data
+
+
+@pytest.mark.parametrize("mode", [VERIFY_INLINE, VERIFY_LAST, VERIFY_BACKGROUND])
+def test_list_serializer_keeps_context(mode, mocker):
+    class OuterSerializer(ReCaptchaSerializerMixin, Serializer):
+        recaptcha_verify_mode = mode
+
+        items = _ItemSerializer(many=True)
+
+    barrier = threading.Barrier(2, timeout=5)
+    deadlines = []
+
+    def submit(recaptcha_response, **kwargs):
+        barrier.wait()
+        deadlines.append(client._deadline.get())
+        return _response(recaptcha_response)
+
+    mocker.patch("drf_recaptcha.client.submit", side_effect=submit)
+    serializer = OuterSerializer(
+        data={"items": [{"recaptcha": "good", "name": "abc"}] * 2},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    with client.deadline(123.0):
+        assert serializer.is_valid() is True
+    assert deadlines == [123.0, 123.0]
+
+
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+@pytest.mark.parametrize("as_dict", [False, True])
+def test_list_serializer_maps_errors_to_items(
+    as_dict,
+    has_run_child_validation,
+    settings,
+    mocker,
+):
+    if as_dict and not has_run_child_validation:
+        pytest.skip("DRF 3.14 reports errors of items as a list.")
+    settings.REST_FRAMEWORK = {"LIST_SERIALIZER_ERRORS_AS_DICT": as_dict}
+    mocker.patch(
+        "drf_recaptcha.client.submit",
+        side_effect=lambda recaptcha_response, **_: _response(recaptcha_response),
+    )
+    serializer = _ItemSerializer(
+        data=[
+            {"recaptcha": "good", "name": "abc"},
+            {"recaptcha": "bad", "name": "abc"},
+            {"recaptcha": "bad", "name": "abcd"},
+        ],
+        many=True,
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is False
+
+    errors = serializer.errors
+    if as_dict:
+        assert set(errors) == {1, 2}
+    else:
+        assert errors[0] == {}
+    assert set(errors[1]) == {"recaptcha"}
+    assert set(errors[2]) == {"recaptcha", "name"}
+    assert errors[2]["recaptcha"][0].code == "captcha_invalid"
+
+
+@pytest.mark.parametrize(
+    ("data", "code"),
+    [({"recaptcha": "good"}, "not_a_list"), ([], "empty")],
+)
+def test_list_serializer_checks_data_on_drf314(data, code, mocker):
+    mocker.patch("drf_recaptcha.serializers.HAS_RUN_CHILD_VALIDATION", new=False)
+    serializer = _ItemSerializer(
+        data=data,
+        many=True,
+        allow_empty=False,
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is False
+    assert serializer.errors["non_field_errors"][0].code == code
+
+
+def test_submit_many_keeps_context(mocker):
+    def submit(*args):
+        timing.record("siteverify", 0.1)
+        return client._deadline.get()
+
+    mocker.patch("drf_recaptcha.client.submit", side_effect=submit)
+
+    with client.deadline(123.0), timing.collect() as timings:
+        results = client.submit_many([("good", "secret", "4.3.2.1")] * 2)
+
+    assert results == [123.0, 123.0]
+    assert timings == {"siteverify": pytest.approx(0.2)}
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.negative_cache import NegativeCache, get_negative_cache
+from drf_recaptcha.validators import ReCaptchaV3Validator
+from rest_framework.serializers import ValidationError
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    caches["default"].clear()
+    yield
+    caches["default"].clear()
+
+
+def test_negative_cache_blocks_after_failures():
+    negative_cache = NegativeCache(failures=2)
+
+    negative_cache.record_failure("1.2.3.4", "login")
+    assert negative_cache.is_blocked("1.2.3.4", "login") is False
+
+    negative_cache.record_failure("1.2.3.4", "login")
+    assert negative_cache.is_blocked("1.2.3.4", "login") is True
+    assert negative_cache.is_blocked("1.2.3.4", "signup") is True
+    assert negative_cache.is_blocked("1.2.3.5", "login") is False
+
+
+def test_negative_cache_per_action():
+    negative_cache = NegativeCache(failures=1, per_action=True)
+
+    negative_cache.record_failure("1.2.3.4", "login")
+
+    assert negative_cache.is_blocked("1.2.3.4", "login") is True
+    assert negative_cache.is_blocked("1.2.3.4", "signup") is False
+
+
+def test_negative_cache_unknown_client():
+    negative_cache = NegativeCache(failures=1)
+
+    negative_cache.record_failure(None, "login")
+
+    assert negative_cache.is_blocked(None, "login") is False
+
+    async def run():
+        await negative_cache.arecord_failure(None, "login")
+        return await negative_cache.ais_blocked(None, "login")
+
+    assert asyncio.run(run()) is False
+
+
+def test_negative_cache_async():
+    negative_cache = NegativeCache(failures=2)
+
+    async def run():
+        await negative_cache.arecord_failure("1.2.3.4", None)
+        blocked = [await negative_cache.ais_blocked("1.2.3.4", None)]
+        await negative_cache.arecord_failure("1.2.3.4", None)
+        blocked.append(await negative_cache.ais_blocked("1.2.3.4", None))
+        return blocked
+
+    assert asyncio.run(run()) == [False, True]
+
+
+def test_get_negative_cache_invalid(settings):
+    settings.DRF_RECAPTCHA_NEGATIVE_CACHE = {"unknown": 1}
+
+    with pytest.raises(ImproperlyConfigured) as exc_info:
+        get_negative_cache()
+
+    assert str(exc_info.value).startswith("DRF_RECAPTCHA_NEGATIVE_CACHE is invalid")
+
+
+@pytest.mark.parametrize("is_async", [False, True])
+def test_validator_blocks_failing_client(
+    is_async,
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    settings.DRF_RECAPTCHA_NEGATIVE_CACHE = {"failures": 2, "cooldown": 60}
+    response = RecaptchaResponse(
+        is_valid=True,
+        extra_data={"score": 0.1, "action": "login"},
+    )
+    submit = mocker.patch("drf_recaptcha.client.submit", return_value=response)
+    asubmit = mocker.patch("drf_recaptcha.client.asubmit", return_value=response)
+    validator = ReCaptchaV3Validator(
+        action="login",
+        required_score=0.5,
+        secret_key="KEY",  # noqa: S106
+    )
+
+    def validate():
+        if is_async:
+            asyncio.run(
+                validator.acall("token", mocked_serializer_field_with_request_context),
+            )
+        else:
+            validator("token", mocked_serializer_field_with_request_context)
+
+    for _ in range(3):
+        with pytest.raises(ValidationError) as exc_info:
+            validate()
+        assert exc_info.value.detail[0].code == "captcha_invalid"
+
+    assert (asubmit if is_async else submit).call_count == 2
+
+
+def test_validator_does_not_count_errors(
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    settings.DRF_RECAPTCHA_NEGATIVE_CACHE = {"failures": 1}
+    mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(is_valid=True, extra_data={"action": "login"}),
+    )
+    validator = ReCaptchaV3Validator(
+        action="login",
+        required_score=0.5,
+        secret_key="KEY",  # noqa: S106
+    )
+
+    with pytest.raises(ValidationError) as exc_info:
+        validator("token", mocked_serializer_field_with_request_context)
+    assert exc_info.value.detail[0].code == "captcha_error"
+
+    assert get_negative_cache().is_blocked("4.3.2.1", "login") is False
@@ -0,0 +1,177 @@
+import pytest
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from drf_recaptcha import passes
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.conf import get_settings
+from drf_recaptcha.fields import ReCaptchaV2Field, ReCaptchaV3Field
+from drf_recaptcha.middleware import ReCaptchaPassMiddleware
+from rest_framework.serializers import Serializer
+from rest_framework.test import APIRequestFactory
+
+
+@pytest.fixture(autouse=True)
+def _pass_enabled(settings):
+    settings.DRF_RECAPTCHA_PASS = {"max_age": 60, "cookie": "recaptcha_pass"}
+
+
+@pytest.fixture
+def submit(mocker):
+    return mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(
+            is_valid=True,
+            extra_data={"score": 0.7, "action": "signup"},
+        ),
+    )
+
+
+class _SignupSerializer(Serializer):
+    recaptcha = ReCaptchaV3Field(action="signup", required_score=0.5)
+
+
+def _validate(serializer_class, data=None, **request_kwargs):
+    request = APIRequestFactory().post("/recaptcha", **request_kwargs)
+    serializer = serializer_class(
+        data={"recaptcha": "token"} if data is None else data,
+        context={"request": request},
+    )
+    return serializer, request
+
+
+def _issue_pass(submit):
+    serializer, request = _validate(_SignupSerializer)
+    assert serializer.is_valid() is True
+    submit.reset_mock()
+    return request.recaptcha_pass
+
+
+def test_pass_is_issued_after_verification(submit):
+    token = _issue_pass(submit)
+
+    assert signing.loads(token, salt=passes.SALT) == {
+        "ip": "127.0.0.1",
+        "action": "signup",
+        "score": 0.7,
+    }
+
+
+def test_pass_is_not_issued_when_disabled(settings, submit):
+    settings.DRF_RECAPTCHA_PASS = None
+    serializer, request = _validate(_SignupSerializer)
+
+    assert serializer.is_valid() is True
+    assert not hasattr(request, "recaptcha_pass")
+
+
+@pytest.mark.parametrize("transport", ["header", "cookie"])
+def test_pass_skips_verification(transport, submit):
+    token = _issue_pass(submit)
+    request_kwargs = (
+        {"HTTP_X_RECAPTCHA_PASS": token}
+        if transport == "header"
+        else {"HTTP_COOKIE": f"recaptcha_pass={token}"}
+    )
+
+    serializer, _ = _validate(_SignupSerializer, data={}, **request_kwargs)
+
+    assert serializer.is_valid() is True
+    assert serializer.fields["recaptcha"].score == 0.7
+    submit.assert_not_called()
+
+
+class _LoginSerializer(Serializer):
+    recaptcha = ReCaptchaV3Field(action="login", required_score=0.5)
+
+
+class _StrictSignupSerializer(Serializer):
+    recaptcha = ReCaptchaV3Field(action="signup", required_score=0.9)
+
+
+class _V2Serializer(Serializer):
+    recaptcha = ReCaptchaV2Field()
+
+
+@pytest.mark.parametrize(
+    ("serializer_class", "request_kwargs"),
+    [
+        (_SignupSerializer, {"REMOTE_ADDR": "10.0.0.2"}),
+        (_LoginSerializer, {}),
+        (_StrictSignupSerializer, {}),
+        (_V2Serializer, {}),
+    ],
+)
+def test_pass_is_not_accepted(serializer_class, request_kwargs, submit):
+    token = _issue_pass(submit)
+
+    serializer, _ = _validate(
+        serializer_class,
+        HTTP_X_RECAPTCHA_PASS=token,
+        **request_kwargs,
+    )
+    serializer.is_valid()
+
+    submit.assert_called_once()
+
+
+@pytest.mark.parametrize("tampered", [False, True])
+def test_pass_expired_or_tampered(tampered, submit, mocker):
+    token = _issue_pass(submit)
+    if tampered:
+        token = token[:-1] + ("A" if token[-1] != "A" else "B")
+    else:
+        mocker.patch(
+            "django.core.signing.time.time",
+            return_value=signing.b62_decode(token.split(":")[1]) + 61,
+        )
+
+    serializer, _ = _validate(_SignupSerializer, HTTP_X_RECAPTCHA_PASS=token)
+    serializer.is_valid()
+
+    submit.assert_called_once()
+
+
+def test_pass_unknown_option(settings):
+    settings.DRF_RECAPTCHA_PASS = {"max_age": 60, "unknown": 1}
+
+    with pytest.raises(ImproperlyConfigured) as exc_info:
+        get_settings()
+
+    assert str(exc_info.value) == "DRF_RECAPTCHA_PASS has unknown options: unknown."
+
+
+def test_middleware_sends_pass(submit):
+    def view(request):
+        serializer = _SignupSerializer(
+            data={"recaptcha": "token"},
+            context={"request": request},
+        )
+        serializer.is_valid()
+        return HttpResponse()
+
+    request = APIRequestFactory().post("/recaptcha")
+    response = ReCaptchaPassMiddleware(view)(request)
+
+    assert response["X-Recaptcha-Pass"] == request.recaptcha_pass
+    assert response.cookies["recaptcha_pass"].value == request.recaptcha_pass
+    assert response.cookies["recaptcha_pass"]["max-age"] == 60
+    assert response.cookies["recaptcha_pass"]["httponly"] is True
+
+
+def test_middleware_without_pass():
+    request = APIRequestFactory().post("/recaptcha")
+    response = ReCaptchaPassMiddleware(lambda _: HttpResponse())(request)
+
+    assert "X-Recaptcha-Pass" not in response
+    assert not response.cookies
+
+
+def test_pass_is_not_issued_without_request(submit):
+    serializer = _SignupSerializer(
+        data={"recaptcha": "token"},
+        context={"recaptcha_client_ip": "4.3.2.1"},
+    )
+
+    assert serializer.is_valid() is True
+    submit.assert_called_once()
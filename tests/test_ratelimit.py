@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.ratelimit import RateLimiter, get_rate_limiter
+from drf_recaptcha.validators import ReCaptchaV2Validator
+from rest_framework.serializers import ValidationError
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    caches["default"].clear()
+    yield
+    caches["default"].clear()
+
+
+@pytest.fixture
+def now(mocker):
+    return mocker.patch("drf_recaptcha.ratelimit.time.time", return_value=1000.0)
+
+
+@pytest.mark.parametrize(
+    ("first", "second", "same"),
+    [
+        ("192.168.1.7", "192.168.1.200", True),
+        ("192.168.1.7", "192.168.2.7", False),
+        ("2001:db8::1", "2001:db8::ffff:1", True),
+        ("2001:db8::1", "2001:db8:0:1::1", False),
+    ],
+)
+def test_rate_limiter_aggregates_networks(first, second, same):
+    limiter = RateLimiter(rate=1, ipv4_prefix=24, ipv6_prefix=64)
+
+    assert (limiter.make_key(first) == limiter.make_key(second)) is same
+
+
+@pytest.mark.parametrize("client_ip", [None, "", "unknown"])
+def test_rate_limiter_allows_unknown_client(client_ip, now):
+    limiter = RateLimiter(rate=1, burst=0)
+
+    assert limiter.allow(client_ip) is True
+
+
+def test_rate_limiter_token_bucket(now):
+    limiter = RateLimiter(rate=1, period=10, burst=2)
+
+    assert [limiter.allow("1.2.3.4") for _ in range(3)] == [True, True, False]
+    assert limiter.allow("1.2.3.5") is True
+
+    now.return_value += 10
+    assert [limiter.allow("1.2.3.4") for _ in range(2)] == [True, False]
+
+
+def test_rate_limiter_is_shared_via_cache(now):
+    RateLimiter(rate=1).allow("1.2.3.4")
+
+    assert RateLimiter(rate=1).allow("1.2.3.4") is False
+
+
+def test_rate_limiter_async(now):
+    limiter = RateLimiter(rate=1)
+
+    async def run():
+        return [await limiter.aallow("1.2.3.4") for _ in range(2)]
+
+    assert asyncio.run(run()) == [True, False]
+
+
+def test_get_rate_limiter(settings):
+    assert get_rate_limiter() is None
+
+    settings.DRF_RECAPTCHA_RATE_LIMIT = {"rate": 5, "ipv4_prefix": 24}
+    limiter = get_rate_limiter()
+
+    assert limiter.rate == limiter.burst == 5
+    assert limiter.ipv4_prefix == 24
+    assert get_rate_limiter() is limiter
+
+
+def test_get_rate_limiter_invalid(settings):
+    settings.DRF_RECAPTCHA_RATE_LIMIT = {"unknown": 1}
+
+    with pytest.raises(ImproperlyConfigured) as exc_info:
+        get_rate_limiter()
+
+    assert str(exc_info.value).startswith("DRF_RECAPTCHA_RATE_LIMIT is invalid")
+
+
+def test_validator_rejects_rate_limited_client(
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    settings.DRF_RECAPTCHA_RATE_LIMIT = {"rate": 1}
+    submit = mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(is_valid=True),
+    )
+    asubmit = mocker.patch("drf_recaptcha.client.asubmit")
+    validator = ReCaptchaV2Validator(secret_key="KEY")  # noqa: S106
+
+    validator("token", mocked_serializer_field_with_request_context)
+
+    with pytest.raises(ValidationError) as exc_info:
+        validator("token", mocked_serializer_field_with_request_context)
+    assert exc_info.value.detail[0].code == "captcha_invalid"
+
+    with pytest.raises(ValidationError) as exc_info:
+        asyncio.run(
+            validator.acall("token", mocked_serializer_field_with_request_context),
+        )
+    assert exc_info.value.detail[0].code == "captcha_invalid"
+
+    submit.assert_called_once()
+    asubmit.assert_not_called()
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from urllib.error import HTTPError, URLError
+
+import pytest
+from drf_recaptcha import client
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.pool import ConnectError, HTTPConnectionPool, PoolResponse
+from drf_recaptcha.validators import ReCaptchaV2Validator
+
+OK = PoolResponse(200, "OK", {}, b'{"success": true}')
+
+
+@pytest.fixture(autouse=True)
+def sleep(mocker):
+    return mocker.patch("drf_recaptcha.client.time.sleep")
+
+
+@pytest.mark.parametrize(
+    ("error", "expected_calls"),
+    [
+        (ConnectError(ConnectionRefusedError()), 2),
+        (HTTPError("url", 503, "Service Unavailable", None, None), 2),
+        (HTTPError("url", 400, "Bad Request", None, None), 1),
+        (URLError(TimeoutError("timed out")), 1),
+    ],
+)
+def test_submit_retries_safe_errors(error, expected_calls, settings, mocker):
+    settings.DRF_RECAPTCHA_RETRIES = 1
+    recaptcha_request = mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        side_effect=[error, OK],
+    )
+
+    if expected_calls == 1:
+        with pytest.raises(URLError):
+            client.submit("token", "secret", "4.3.2.1")
+    else:
+        assert client.submit("token", "secret", "4.3.2.1").is_valid is True
+
+    assert recaptcha_request.call_count == expected_calls
+
+
+def test_submit_retries_with_backoff(settings, mocker, sleep):
+    settings.DRF_RECAPTCHA_RETRIES = 3
+    settings.DRF_RECAPTCHA_RETRY_BACKOFF = 0.2
+    mocker.patch("drf_recaptcha.client.random.uniform", side_effect=lambda _, b: b)
+    recaptcha_request = mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        side_effect=ConnectError(ConnectionRefusedError()),
+    )
+
+    with pytest.raises(ConnectError):
+        client.submit("token", "secret", "4.3.2.1")
+
+    assert recaptcha_request.call_count == 4
+    assert [call.args[0] for call in sleep.call_args_list] == [0.2, 0.4, 0.8]
+
+
+def test_submit_doesnt_retry_past_deadline(settings, mocker, sleep):
+    settings.DRF_RECAPTCHA_RETRIES = 3
+    settings.DRF_RECAPTCHA_RETRY_BACKOFF = 10
+    mocker.patch("drf_recaptcha.client.random.uniform", side_effect=lambda _, b: b)
+    recaptcha_request = mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        side_effect=ConnectError(ConnectionRefusedError()),
+    )
+
+    with (
+        client.deadline(time.monotonic() + 5),
+        pytest.raises(ConnectError),
+    ):
+        client.submit("token", "secret", "4.3.2.1")
+
+    recaptcha_request.assert_called_once()
+    sleep.assert_not_called()
+
+
+def test_timeouts_are_limited_by_deadline(settings):
+    settings.DRF_RECAPTCHA_CONNECT_TIMEOUT = 1
+    settings.DRF_RECAPTCHA_READ_TIMEOUT = 5
+
+    assert client._get_timeouts(None) == {"connect_timeout": 1, "read_timeout": 5}
+
+    timeouts = client._get_timeouts(time.monotonic() + 3)
+    assert timeouts["connect_timeout"] == 1
+    assert 2 < timeouts["read_timeout"] <= 3
+
+    with pytest.raises(URLError):
+        client._get_timeouts(time.monotonic() - 1)
+
+
+def test_settings_deadline(settings, mocker):
+    settings.DRF_RECAPTCHA_VERIFY_DEADLINE = 2
+    mocker.patch("drf_recaptcha.client.time.monotonic", return_value=100)
+
+    assert client._get_deadline() == 102
+    with client.deadline(101):
+        assert client._get_deadline() == 101
+    with client.deadline(103):
+        assert client._get_deadline() == 102
+
+
+def test_nested_deadlines():
+    with client.deadline(101):
+        with client.deadline(None):
+            assert client._deadline.get() == 101
+        with client.deadline(102):
+            assert client._deadline.get() == 101
+        with client.deadline(100):
+            assert client._deadline.get() == 100
+        assert client._deadline.get() == 101
+
+
+def test_asubmit_retries(settings, mocker):
+    settings.DRF_RECAPTCHA_RETRIES = 1
+    mocker.patch("drf_recaptcha.client.asyncio.sleep")
+    arecaptcha_request = mocker.patch(
+        "drf_recaptcha.client.arecaptcha_request",
+        side_effect=[ConnectError(ConnectionRefusedError()), OK],
+    )
+
+    response = asyncio.run(client.asubmit("token", "secret", "4.3.2.1"))
+
+    assert response.is_valid is True
+    assert arecaptcha_request.call_count == 2
+
+
+def test_pool_raises_connect_error(siteverify_server):
+    port = siteverify_server.server_address[1]
+    siteverify_server.shutdown()
+    siteverify_server.server_close()
+    pool = HTTPConnectionPool(f"127.0.0.1:{port}", scheme="http")
+
+    with pytest.raises(ConnectError):
+        pool.urlopen("POST", "/", connect_timeout=1, read_timeout=1)
+
+
+def test_validator_takes_deadline_from_context(
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocked_serializer_field_with_request_context.context["recaptcha_deadline"] = 42
+    deadlines = []
+
+    def submit(**kwargs):
+        deadlines.append(client._deadline.get())
+        return RecaptchaResponse(is_valid=True)
+
+    mocker.patch("drf_recaptcha.client.submit", side_effect=submit)
+    validator = ReCaptchaV2Validator(secret_key="KEY")  # noqa: S106
+
+    validator("token", mocked_serializer_field_with_request_context)
+
+    assert deadlines == [42]
+    assert client._deadline.get() is None
@@ -1,9 +1,20 @@
+import asyncio
+import threading
+
 import pytest
 from django.core.exceptions import ImproperlyConfigured
-from drf_recaptcha.constants import TEST_V2_SECRET_KEY
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.constants import (
+    TEST_V2_SECRET_KEY,
+    VERIFY_BACKGROUND,
+    VERIFY_INLINE,
+    VERIFY_LAST,
+)
+from drf_recaptcha.executor import get_executor
 from drf_recaptcha.fields import ReCaptchaV2Field, ReCaptchaV3Field
+from drf_recaptcha.serializers import ReCaptchaSerializerMixin
 from rest_framework.exceptions import ValidationError
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import CharField, Serializer
 from rest_framework.test import APIRequestFactory
 
 
@@ -57,3 +68,194 @@ def test_serializer_v3(settings):
         == "{'token': [ErrorDetail(string='Error verifying reCAPTCHA, "
         "please try again.', code='captcha_error')]}"
     )
+
+
+class _VerifyLastSerializer(ReCaptchaSerializerMixin, Serializer):
+    recaptcha_verify_mode = VERIFY_LAST
+
+    token = ReCaptchaV2Field()
+    name = CharField(max_length=3)
+
+    def validate(self, attrs):
+        if attrs["name"] == "bad":
+            msg = "bad name"
+            raise ValidationError(msg)
+        return attrs
+
+
+@pytest.mark.parametrize("name", ["abcd", "bad"])
+def test_serializer_verify_last_skips_verification(name, mocker):
+    submit = mocker.patch("drf_recaptcha.client.submit")
+    serializer = _VerifyLastSerializer(
+        data={"token": "test_token", "name": name},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is False
+    assert "token" not in serializer.errors
+    submit.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("is_valid", "errors"),
+    [(True, {}), (False, {"token": ["captcha_invalid"]})],
+)
+def test_serializer_verify_last(is_valid, errors, mocker):
+    submit = mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(is_valid=is_valid),
+    )
+    serializer = _VerifyLastSerializer(
+        data={"token": "test_token", "name": "abc"},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is is_valid
+    assert {
+        name: [error.code for error in details]
+        for name, details in serializer.errors.items()
+    } == errors
+    submit.assert_called_once()
+
+
+@pytest.mark.parametrize(("name", "called"), [("abc", True), ("abcd", False)])
+def test_serializer_verify_last_ais_valid(name, called, mocker):
+    submit = mocker.patch("drf_recaptcha.client.submit")
+    asubmit = mocker.patch(
+        "drf_recaptcha.client.asubmit",
+        return_value=RecaptchaResponse(is_valid=True),
+    )
+    serializer = _VerifyLastSerializer(
+        data={"token": "test_token", "name": name},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert asyncio.run(serializer.ais_valid()) is called
+    assert asubmit.called is called
+    submit.assert_not_called()
+
+
+def test_serializer_verify_in_background(mocker):
+    validated = threading.Event()
+
+    def submit(**kwargs):
+        # Fails unless the name is validated while waiting for Google.
+        return RecaptchaResponse(is_valid=validated.wait(5))
+
+    class BackgroundSerializer(ReCaptchaSerializerMixin, Serializer):
+        recaptcha_verify_mode = VERIFY_BACKGROUND
+
+        token = ReCaptchaV2Field()
+        name = CharField(max_length=3)
+
+        def validate_name(self, value):
+            validated.set()
+            return value
+
+    mocker.patch("drf_recaptcha.client.submit", side_effect=submit)
+    serializer = BackgroundSerializer(
+        data={"token": "test_token", "name": "abc"},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is True
+    assert serializer.validated_data == {"token": "test_token", "name": "abc"}
+
+
+def test_serializer_verify_in_background_merges_errors(mocker):
+    class BackgroundSerializer(ReCaptchaSerializerMixin, Serializer):
+        recaptcha_verify_mode = VERIFY_BACKGROUND
+
+        token = ReCaptchaV2Field()
+        name = CharField(max_length=3)
+
+    mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(is_valid=False),
+    )
+    serializer = BackgroundSerializer(
+        data={"token": "test_token", "name": "abcd"},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    assert serializer.is_valid() is False
+    assert set(serializer.errors) == {"token", "name"}
+    assert serializer.errors["token"][0].code == "captcha_invalid"
+
+
+class _InnerSerializer(Serializer):
+    token = ReCaptchaV2Field()
+
+
+@pytest.mark.parametrize("mode", [VERIFY_INLINE, VERIFY_LAST, VERIFY_BACKGROUND])
+@pytest.mark.parametrize("use_async", [False, True])
+def test_serializer_nested_field_errors(mode, use_async, mocker):
+    class OuterSerializer(ReCaptchaSerializerMixin, Serializer):
+        recaptcha_verify_mode = mode
+
+        token = CharField()
+        inner = _InnerSerializer()
+
+    response = RecaptchaResponse(is_valid=False)
+    mocker.patch("drf_recaptcha.client.submit", return_value=response)
+    mocker.patch("drf_recaptcha.client.asubmit", return_value=response)
+    serializer = OuterSerializer(
+        data={"token": "abc", "inner": {"token": "test_token"}},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    if use_async:
+        assert asyncio.run(serializer.ais_valid()) is False
+    else:
+        assert serializer.is_valid() is False
+    assert set(serializer.errors) == {"inner"}
+    assert serializer.errors["inner"]["token"][0].code == "captcha_invalid"
+
+
+@pytest.mark.parametrize("mode", [VERIFY_INLINE, VERIFY_LAST, VERIFY_BACKGROUND])
+@pytest.mark.parametrize("use_async", [False, True])
+def test_serializer_list_item_field_errors(mode, use_async, mocker):
+    class OuterSerializer(ReCaptchaSerializerMixin, Serializer):
+        recaptcha_verify_mode = mode
+
+        items = _InnerSerializer(many=True)
+
+    def submit(recaptcha_response, **kwargs):
+        return RecaptchaResponse(is_valid=recaptcha_response == "good")
+
+    mocker.patch("drf_recaptcha.client.submit", side_effect=submit)
+    mocker.patch("drf_recaptcha.client.asubmit", side_effect=submit)
+    serializer = OuterSerializer(
+        data={"items": [{"token": "bad"}, {"token": "good"}, {"token": "bad"}]},
+        context={"request": APIRequestFactory().get("/recaptcha")},
+    )
+
+    if use_async:
+        assert asyncio.run(serializer.ais_valid()) is False
+    else:
+        assert serializer.is_valid() is False
+    errors = serializer.errors["items"]
+    if isinstance(errors, list):
+        # Unless LIST_SERIALIZER_ERRORS_AS_DICT, errors of items are a list.
+        errors = {index: detail for index, detail in enumerate(errors) if detail}
+    assert set(errors) == {0, 2}
+    assert (
+        errors[0]["token"][0].code == errors[2]["token"][0].code == ("captcha_invalid")
+    )
+
+
+def test_get_executor_follows_settings(settings):
+    executor = get_executor()
+    assert get_executor() is executor
+
+    settings.DRF_RECAPTCHA_MAX_WORKERS = 2
+    assert get_executor() is not executor
+    assert get_executor()._max_workers == 2
+    assert executor._shutdown is True
+
+
+def test_get_executor_invalid(settings):
+    settings.DRF_RECAPTCHA_MAX_WORKERS = 0
+
+    with pytest.raises(ImproperlyConfigured, match=r"^DRF_RECAPTCHA_MAX_WORKERS"):
+        get_executor()
@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha import client, shedding
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.shedding import LoadShedder, get_load_shedder
+from drf_recaptcha.validators import ReCaptchaV3Validator
+from rest_framework.serializers import ValidationError
+
+
+def _record(shedder, duration, calls):
+    for _ in range(calls):
+        shedder.request_started()
+        shedder.request_finished(duration)
+
+
+def test_load_shedder_samples_under_latency_pressure(mocker):
+    shedder = LoadShedder(
+        sample_rates={"signup": 1, "newsletter": 0.2, "*": 0},
+        latency_threshold=1,
+        minimum_calls=10,
+    )
+    random = mocker.patch("drf_recaptcha.shedding.random.random", return_value=0.5)
+
+    _record(shedder, 0.1, 20)
+    assert shedder.is_under_pressure() is False
+    assert shedder.should_verify("newsletter") is True
+
+    shedder._checked_at = 0.0
+    _record(shedder, 2, 1)
+    assert shedder.is_under_pressure() is False
+
+    shedder._checked_at = 0.0
+    _record(shedder, 2, 1)
+    assert shedder.is_under_pressure() is True
+    assert shedder.should_verify("signup") is True
+    assert shedder.should_verify("newsletter") is False
+    assert shedder.should_verify("other") is False
+    random.return_value = 0.1
+    assert shedder.should_verify("newsletter") is True
+
+
+def test_load_shedder_forgets_old_durations(mocker):
+    shedder = LoadShedder(sample_rates={}, latency_threshold=1, minimum_calls=1)
+    _record(shedder, 2, 1)
+    assert shedder.is_under_pressure() is True
+
+    monotonic = mocker.patch("drf_recaptcha.shedding.time.monotonic")
+    monotonic.return_value = shedder._checked_at + 31
+
+    assert shedder.is_under_pressure() is False
+
+
+def test_load_shedder_max_in_flight():
+    shedder = LoadShedder(sample_rates={"*": 0}, max_in_flight=2)
+
+    shedder.request_started()
+    assert shedder.should_verify("login") is True
+    shedder.request_started()
+    assert shedder.in_flight == 2
+    assert shedder.should_verify("login") is False
+    shedder.request_finished(0.1)
+    assert shedder.should_verify("login") is True
+    assert len(shedder._durations) == 0
+
+
+def test_load_shedder_trims_durations_on_record(mocker):
+    shedder = LoadShedder(sample_rates={}, latency_threshold=1, window=30)
+    monotonic = mocker.patch("drf_recaptcha.shedding.time.monotonic")
+    for now in range(100):
+        monotonic.return_value = now
+        shedder.request_started()
+        shedder.request_finished(0.1)
+
+    assert len(shedder._durations) == 30
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"sample_rates": {}, "skipped": "maybe"}, {"sample_rates": {}, "x": 1}],
+)
+def test_get_load_shedder_invalid(options, settings):
+    settings.DRF_RECAPTCHA_LOAD_SHEDDING = options
+
+    with pytest.raises(ImproperlyConfigured):
+        get_load_shedder()
+
+
+def test_client_tracks_requests(settings, mocker):
+    settings.DRF_RECAPTCHA_LOAD_SHEDDING = {"sample_rates": {}, "latency_threshold": 1}
+    mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        return_value=mocker.Mock(data=b'{"success": true}'),
+    )
+
+    client.submit("token", "secret", "4.3.2.1")
+
+    shedder = get_load_shedder()
+    assert shedder.in_flight == 0
+    assert len(shedder._durations) == 1
+
+
+def test_client_tracks_cancelled_requests(settings, mocker):
+    settings.DRF_RECAPTCHA_LOAD_SHEDDING = {"sample_rates": {}, "max_in_flight": 1}
+    mocker.patch(
+        "drf_recaptcha.client.arecaptcha_request",
+        side_effect=asyncio.CancelledError,
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(client.asubmit("token", "secret", "4.3.2.1"))
+
+    shedder = get_load_shedder()
+    assert shedder.in_flight == 0
+    assert not shedder.is_under_pressure()
+
+
+@pytest.mark.parametrize(
+    ("skipped", "error_code"),
+    [("allow", None), ("reject", "captcha_error")],
+)
+def test_validator_skips_sampled_out_verification(
+    skipped,
+    error_code,
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    settings.DRF_RECAPTCHA_LOAD_SHEDDING = {
+        "sample_rates": {"newsletter": 0},
+        "max_in_flight": 0,
+        "skipped": skipped,
+    }
+    submit = mocker.patch("drf_recaptcha.client.submit")
+    asubmit = mocker.patch("drf_recaptcha.client.asubmit")
+    validator = ReCaptchaV3Validator(
+        action="newsletter",
+        required_score=0.5,
+        secret_key="TEST_SECRET_KEY",  # noqa: S106
+    )
+    field = mocked_serializer_field_with_request_context
+
+    for verify in [validator, lambda *args: asyncio.run(validator.acall(*args))]:
+        if error_code:
+            with pytest.raises(ValidationError) as exc_info:
+                verify("token", field)
+            assert exc_info.value.detail[0].code == error_code
+        else:
+            verify("token", field)
+        assert field.recaptcha_result.outcome == "skipped"
+
+    submit.assert_not_called()
+    asubmit.assert_not_called()
+
+
+def test_validator_verifies_prioritized_action(
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    settings.DRF_RECAPTCHA_LOAD_SHEDDING = {
+        "sample_rates": {"signup": 1, "*": 0},
+        "max_in_flight": 0,
+    }
+    submit = mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(
+            is_valid=True,
+            extra_data={"score": 0.9, "action": "signup"},
+        ),
+    )
+    validator = ReCaptchaV3Validator(
+        action="signup",
+        required_score=0.5,
+        secret_key="TEST_SECRET_KEY",  # noqa: S106
+    )
+
+    validator("token", mocked_serializer_field_with_request_context)
+
+    submit.assert_called_once()
+    assert shedding.should_verify("newsletter") is False
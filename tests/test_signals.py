@@ -0,0 +1,152 @@
+from urllib.error import HTTPError
+
+import pytest
+from drf_recaptcha import client, signals
+from drf_recaptcha.breaker import CircuitOpenError
+from drf_recaptcha.client import RecaptchaResponse
+from drf_recaptcha.pool import PoolResponse
+from drf_recaptcha.validators import ReCaptchaV2Validator, ReCaptchaV3Validator
+from rest_framework.serializers import ValidationError
+
+
+@pytest.fixture
+def verifications():
+    sent = []
+
+    def receiver(**kwargs):
+        sent.append(kwargs)
+
+    signals.verification_finished.connect(receiver)
+    yield sent
+    signals.verification_finished.disconnect(receiver)
+
+
+@pytest.fixture
+def requests():
+    sent = []
+
+    def receiver(**kwargs):
+        sent.append(kwargs)
+
+    signals.siteverify_request_finished.connect(receiver)
+    yield sent
+    signals.siteverify_request_finished.disconnect(receiver)
+
+
+@pytest.mark.parametrize(
+    ("validator", "response", "outcome"),
+    [
+        (
+            ReCaptchaV2Validator(secret_key="KEY"),  # noqa: S106
+            RecaptchaResponse(is_valid=True),
+            "pass",
+        ),
+        (
+            ReCaptchaV2Validator(secret_key="KEY"),  # noqa: S106
+            RecaptchaResponse(is_valid=False, error_codes=["bad"]),
+            "captcha_invalid",
+        ),
+        (
+            ReCaptchaV3Validator(action="act", required_score=0.5, secret_key="KEY"),  # noqa: S106
+            RecaptchaResponse(is_valid=True, extra_data={"action": "act"}),
+            "captcha_error",
+        ),
+    ],
+)
+def test_verification_finished(
+    validator,
+    response,
+    outcome,
+    verifications,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocker.patch("drf_recaptcha.client.submit", return_value=response)
+
+    if outcome == "pass":
+        validator("token", mocked_serializer_field_with_request_context)
+    else:
+        with pytest.raises(ValidationError):
+            validator("token", mocked_serializer_field_with_request_context)
+
+    [sent] = verifications
+    assert sent["validator"] is validator
+    assert sent["version"] == validator.recaptcha_version
+    assert sent["action"] == validator.recaptcha_action
+    assert sent["outcome"] == outcome
+    assert sent["error_codes"] == response.error_codes
+    assert sent["cached"] is False
+    assert sent["duration"] >= 0
+
+
+def test_verification_finished_v3_score(
+    verifications,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(
+            is_valid=True,
+            extra_data={"score": 0.9, "action": "act"},
+            cached=True,
+        ),
+    )
+    validator = ReCaptchaV3Validator(
+        action="act",
+        required_score=0.5,
+        secret_key="KEY",  # noqa: S106
+    )
+
+    validator("token", mocked_serializer_field_with_request_context)
+
+    [sent] = verifications
+    assert sent["version"] == "v3"
+    assert sent["action"] == "act"
+    assert sent["outcome"] == "pass"
+    assert sent["score"] == 0.9
+    assert sent["cached"] is True
+
+
+@pytest.mark.parametrize(
+    ("side_effect", "outcome"),
+    [
+        (HTTPError("url", 500, "error", None, None), "captcha_error"),
+        (CircuitOpenError, "circuit_open"),
+    ],
+)
+def test_verification_finished_without_response(
+    side_effect,
+    outcome,
+    verifications,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocker.patch("drf_recaptcha.client.submit", side_effect=side_effect)
+    validator = ReCaptchaV2Validator(secret_key="KEY")  # noqa: S106
+
+    with pytest.raises(ValidationError):
+        validator("token", mocked_serializer_field_with_request_context)
+
+    [sent] = verifications
+    assert sent["outcome"] == outcome
+    assert sent["error_codes"] == []
+    assert sent["score"] is None
+
+
+def test_siteverify_request_finished(requests, settings, mocker):
+    settings.DRF_RECAPTCHA_RETRIES = 1
+    settings.DRF_RECAPTCHA_RETRY_BACKOFF = 0
+    error = HTTPError("url", 503, "error", None, None)
+    mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        side_effect=[error, PoolResponse(200, "OK", {}, b'{"success": true}')],
+    )
+
+    assert client.submit("token", "secret", "4.3.2.1").is_valid is True
+
+    assert [(sent["attempt"], sent["error"]) for sent in requests] == [
+        (0, error),
+        (1, None),
+    ]
+    assert all(sent["duration"] >= 0 for sent in requests)
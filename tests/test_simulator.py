@@ -0,0 +1,136 @@
+import asyncio
+from urllib.error import HTTPError, URLError
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha.pool import ConnectError
+from drf_recaptcha.simulator import SimulatorTransport
+from drf_recaptcha.transports import get_transport
+from drf_recaptcha.validators import ReCaptchaV3Validator
+from rest_framework.serializers import ValidationError
+
+URL = "https://www.google.com/recaptcha/api/siteverify"
+
+
+def _simulate(transport, token, read_timeout=10):
+    return transport.simulate(URL, f"response={token}".encode(), read_timeout)
+
+
+@pytest.fixture
+def simulator(settings):
+    settings.DRF_RECAPTCHA_TRANSPORT = "drf_recaptcha.simulator.SimulatorTransport"
+    settings.DRF_RECAPTCHA_TRANSPORT_OPTIONS = {
+        "score": {"login": 0.9, "*": 0.6},
+        "scenarios": {
+            "bot-": {"score": ["uniform", 0.0, 0.2]},
+            "fail-": {"error_codes": {"timeout-or-duplicate": 1}},
+            "down-": {"faults": {"server_error": 1}},
+        },
+        "seed": 1,
+    }
+    return get_transport()
+
+
+@pytest.mark.parametrize(
+    ("token", "error_code"),
+    [
+        ("login-1", None),
+        ("bot-login-1", "captcha_invalid"),
+        ("fail-login-1", "captcha_invalid"),
+        ("down-login-1", "captcha_error"),
+    ],
+)
+def test_simulator_runs_through_validator(
+    simulator,
+    token,
+    error_code,
+    mocked_serializer_field_with_request_context,
+):
+    validator = ReCaptchaV3Validator(
+        action="login",
+        required_score=0.5,
+        secret_key="TEST_SECRET_KEY",  # noqa: S106
+    )
+
+    if error_code:
+        with pytest.raises(ValidationError) as exc_info:
+            validator(token, mocked_serializer_field_with_request_context)
+        assert exc_info.value.detail[0].code == error_code
+    else:
+        validator(token, mocked_serializer_field_with_request_context)
+
+    assert isinstance(simulator, SimulatorTransport)
+
+
+def test_simulator_scores_per_action(simulator):
+    _, login = _simulate(simulator, "login-1")
+    _, other = _simulate(simulator, "signup-1")
+    _, bot = _simulate(simulator, "bot-signup-1")
+
+    assert login.status == 200
+    assert b'"action": "login"' in login.data
+    assert b'"score": 0.9' in login.data
+    assert b'"score": 0.6' in other.data
+    assert b'"action": "signup"' in bot.data
+
+
+def test_simulator_latency_and_faults():
+    transport = SimulatorTransport(
+        latency=0.5,
+        scenarios={
+            "slow-": {"latency": 20},
+            "timeout-": {"faults": {"timeout": 1}},
+            "refused-": {"faults": {"connect_error": 1}},
+            "down-": {"faults": {"server_error": 1}},
+        },
+    )
+
+    delay, response = _simulate(transport, "act-1")
+    assert delay == 0.5
+    assert response.status == 200
+
+    for token, expected_delay, error_class in [
+        ("slow-act-1", 10, URLError),
+        ("timeout-act-1", 10, URLError),
+        ("refused-act-1", 0.5, ConnectError),
+        ("down-act-1", 0.5, HTTPError),
+    ]:
+        delay, error = _simulate(transport, token)
+        assert delay == expected_delay
+        assert isinstance(error, error_class)
+
+
+def test_simulator_is_reproducible_with_seed():
+    def run():
+        transport = SimulatorTransport(
+            seed=42, score=["normal", 0.5, 0.3], latency=["exponential", 0.1]
+        )
+        return [_simulate(transport, "act")[0] for _ in range(10)]
+
+    assert run() == run()
+
+
+def test_simulator_asend_raises_fault():
+    transport = SimulatorTransport(faults={"connect_error": 1})
+
+    with pytest.raises(ConnectError):
+        asyncio.run(
+            transport.asend(
+                URL, b"response=act", {}, connect_timeout=1, read_timeout=1
+            ),
+        )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"latency": ["lognormal", 1, 2]},
+        {"score": ["uniform", 1]},
+        {"faults": {"boom": 0.5}},
+        {"error_codes": {"bad": 0.7, "worse": 0.7}},
+        {"unknown": 1},
+    ],
+)
+def test_simulator_invalid_options(options):
+    with pytest.raises(ImproperlyConfigured):
+        SimulatorTransport(**options)
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+from urllib.error import URLError
+
+import pytest
+from drf_recaptcha import client, singleflight
+from drf_recaptcha.pool import PoolResponse
+
+
+def _run_concurrently(func, count, join):
+    """
+    Call ``func`` in ``count`` threads, return results or raised errors.
+    """
+    results = [None] * count
+
+    def call(index):
+        try:
+            results[index] = func()
+        except Exception as exc:  # noqa: BLE001
+            results[index] = exc
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    while join.call_count < count:
+        pass
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.fixture(autouse=True)
+def _single_flight(settings):
+    settings.DRF_RECAPTCHA_SINGLE_FLIGHT = True
+
+
+@pytest.fixture
+def join(mocker):
+    return mocker.spy(singleflight, "_join")
+
+
+def test_do_shares_result(join):
+    calls = []
+
+    def func():
+        calls.append(1)
+        while join.call_count < 3:
+            pass
+        return {"success": True}
+
+    results = _run_concurrently(lambda: singleflight.do("key", func), 3, join)
+
+    assert calls == [1]
+    assert results == [{"success": True}] * 3
+    assert singleflight._flights == {}
+
+
+def test_do_shares_error(join):
+    error = URLError("timed out")
+
+    def func():
+        while join.call_count < 2:
+            pass
+        raise error
+
+    results = _run_concurrently(lambda: singleflight.do("key", func), 2, join)
+
+    assert results == [error, error]
+    assert singleflight._flights == {}
+
+
+def test_do_disabled(settings, mocker):
+    settings.DRF_RECAPTCHA_SINGLE_FLIGHT = False
+    join = mocker.spy(singleflight, "_join")
+
+    assert singleflight.do("key", lambda: 1) == 1
+    join.assert_not_called()
+
+
+def test_ado_shares_result():
+    calls = []
+    release = asyncio.Event()
+
+    async def func():
+        calls.append(1)
+        await release.wait()
+        return {"success": True}
+
+    async def run():
+        tasks = [asyncio.ensure_future(singleflight.ado("key", func)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(run()) == [{"success": True}] * 3
+    assert calls == [1]
+    assert singleflight._async_flights == {}
+
+
+def test_ado_shares_error():
+    error = URLError("timed out")
+    release = asyncio.Event()
+
+    async def func():
+        await release.wait()
+        raise error
+
+    async def run():
+        tasks = [asyncio.ensure_future(singleflight.ado("key", func)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert asyncio.run(run()) == [error, error]
+    assert singleflight._async_flights == {}
+
+
+def test_ado_followers_verify_if_leader_cancelled():
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.01 if len(calls) > 1 else 5)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.ensure_future(singleflight.ado("key", func))
+        follower = asyncio.ensure_future(singleflight.ado("key", func))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == 2
+    assert singleflight._async_flights == {}
+
+
+def test_concurrent_submits_share_request(join, mocker):
+    def recaptcha_request(*args, **kwargs):
+        while join.call_count < 2:
+            pass
+        return PoolResponse(200, "OK", {}, b'{"success": true, "score": 0.7}')
+
+    request = mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        side_effect=recaptcha_request,
+    )
+
+    first, second = _run_concurrently(
+        lambda: client.submit("token", "secret", "4.3.2.1"),
+        2,
+        join,
+    )
+
+    request.assert_called_once()
+    assert first is not second
+    assert first.is_valid is second.is_valid is True
+    assert first.extra_data == second.extra_data == {"score": 0.7}
+
+
+def test_submits_from_other_ips_do_not_share_request(join, mocker):
+    def recaptcha_request(*args, **kwargs):
+        while join.call_count < 2:
+            pass
+        return PoolResponse(200, "OK", {}, b'{"success": true}')
+
+    request = mocker.patch(
+        "drf_recaptcha.client.recaptcha_request",
+        side_effect=recaptcha_request,
+    )
+    remoteips = iter(["4.3.2.1", "1.2.3.4"])
+
+    _run_concurrently(
+        lambda: client.submit("token", "secret", next(remoteips)),
+        2,
+        join,
+    )
+
+    assert request.call_count == 2
+
+
+def test_single_flight_disabled_by_default(settings, mocker):
+    del settings.DRF_RECAPTCHA_SINGLE_FLIGHT
+    join = mocker.spy(singleflight, "_join")
+
+    assert singleflight.do("key", lambda: 1) == 1
+    join.assert_not_called()
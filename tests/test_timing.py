@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from drf_recaptcha import timing
+from drf_recaptcha.fields import ReCaptchaV3Field
+from drf_recaptcha.middleware import ReCaptchaServerTimingMiddleware
+from rest_framework.serializers import Serializer
+from rest_framework.test import APIRequestFactory
+
+
+@pytest.fixture
+def local_siteverify(settings, siteverify_server):
+    settings.DRF_RECAPTCHA_SCHEME = "http"
+    settings.DRF_RECAPTCHA_DOMAIN = f"127.0.0.1:{siteverify_server.server_address[1]}"
+    siteverify_server.response = (
+        200,
+        {"success": True, "score": 0.9, "action": "signup"},
+    )
+    return siteverify_server
+
+
+def _bound_field():
+    request = APIRequestFactory().post("/recaptcha")
+    field = ReCaptchaV3Field(action="signup")
+    field.bind("recaptcha", Serializer(context={"request": request}))
+    return field, request
+
+
+def test_measure_excludes_nested_stages():
+    with timing.collect() as timings, timing.measure("outer", exclude=("inner",)):
+        with timing.measure("inner"):
+            time.sleep(0.05)
+        time.sleep(0.01)
+
+    assert timings["inner"] >= 0.05
+    assert 0.01 <= timings["outer"] < 0.05
+
+
+def test_measure_without_collect_records_nothing():
+    with timing.measure("stage"):
+        pass
+
+    assert timing.get_timings() == {}
+
+
+@pytest.mark.usefixtures("local_siteverify")
+def test_result_has_timing_breakdown():
+    field, request = _bound_field()
+
+    field.run_validation("token")
+
+    timings = field.recaptcha_result.timings
+    assert set(timings) == {
+        "dns",
+        "connect",
+        "wait",
+        "read",
+        "siteverify",
+        "parse",
+        "total",
+    }
+    assert timings["siteverify"] >= timings["wait"] + timings["read"]
+    assert timings["total"] >= timings["siteverify"]
+    assert request.recaptcha_timings == dict(timings)
+
+
+@pytest.mark.usefixtures("local_siteverify")
+def test_result_has_timing_breakdown_async():
+    field, _ = _bound_field()
+
+    asyncio.run(field.arun_validation("token"))
+
+    assert {"dns", "connect", "wait", "read", "parse", "total"} <= set(
+        field.recaptcha_result.timings,
+    )
+
+
+def test_server_timing_middleware():
+    def view(request):
+        timing.attach(request, {"siteverify": 0.1, "total": 0.2})
+        timing.attach(request, {"total": 0.05})
+        response = HttpResponse()
+        response["Server-Timing"] = "db;dur=5"
+        return response
+
+    response = ReCaptchaServerTimingMiddleware(view)(
+        APIRequestFactory().post("/recaptcha"),
+    )
+
+    assert response["Server-Timing"] == (
+        "db;dur=5, recaptcha-siteverify;dur=100.000, recaptcha-total;dur=250.000"
+    )
+
+
+def test_server_timing_middleware_without_verification():
+    response = ReCaptchaServerTimingMiddleware(lambda _: HttpResponse())(
+        APIRequestFactory().post("/recaptcha"),
+    )
+
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.usefixtures("local_siteverify")
+def test_opentelemetry_span(settings, mocker):
+    settings.DRF_RECAPTCHA_OPENTELEMETRY = True
+    tracer = mocker.patch("drf_recaptcha.timing._get_tracer").return_value
+    field, _ = _bound_field()
+
+    field.run_validation("token")
+
+    name = tracer.start_span.call_args.args[0]
+    attributes = tracer.start_span.call_args.kwargs["attributes"]
+    assert name == "recaptcha.verify"
+    assert attributes["recaptcha.outcome"] == "pass"
+    assert attributes["recaptcha.score"] == 0.9
+    assert "recaptcha.timing.siteverify" in attributes
+    tracer.start_span.return_value.end.assert_called_once()
+
+
+def test_opentelemetry_requires_package(mocker):
+    mocker.patch("importlib.import_module", side_effect=ImportError)
+
+    with pytest.raises(ImproperlyConfigured):
+        timing.export_span({"total": 0.1}, {})
@@ -0,0 +1,233 @@
+import asyncio
+import socket
+import sys
+import threading
+from urllib.error import HTTPError, URLError
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from drf_recaptcha import client
+from drf_recaptcha.pool import ConnectError
+from drf_recaptcha.transports import (
+    HttpxTransport,
+    InMemoryTransport,
+    RequestsTransport,
+    StdlibTransport,
+    Urllib3Transport,
+    get_transport,
+)
+from drf_recaptcha.validators import ReCaptchaV2Validator
+from rest_framework.serializers import ValidationError
+
+IN_MEMORY = "drf_recaptcha.transports.InMemoryTransport"
+TRANSPORTS = [
+    "drf_recaptcha.transports.StdlibTransport",
+    "drf_recaptcha.transports.Urllib3Transport",
+    "drf_recaptcha.transports.RequestsTransport",
+    "drf_recaptcha.transports.HttpxTransport",
+]
+
+
+def test_get_transport_default():
+    transport = get_transport()
+
+    assert isinstance(transport, StdlibTransport)
+    assert get_transport() is transport
+
+
+def test_get_transport_follows_settings(settings):
+    settings.DRF_RECAPTCHA_TRANSPORT = IN_MEMORY
+    settings.DRF_RECAPTCHA_TRANSPORT_OPTIONS = {"status": 503}
+
+    transport = get_transport()
+
+    assert isinstance(transport, InMemoryTransport)
+    assert transport.status == 503
+
+
+@pytest.mark.parametrize(
+    ("name", "value", "message"),
+    [
+        (
+            "DRF_RECAPTCHA_TRANSPORT",
+            "drf_recaptcha.transports.Missing",
+            "DRF_RECAPTCHA_TRANSPORT is invalid",
+        ),
+        (
+            "DRF_RECAPTCHA_TRANSPORT_OPTIONS",
+            [],
+            "DRF_RECAPTCHA_TRANSPORT_OPTIONS should be a dict.",
+        ),
+        (
+            "DRF_RECAPTCHA_TRANSPORT_OPTIONS",
+            {"unknown": 1},
+            "DRF_RECAPTCHA_TRANSPORT_OPTIONS is invalid",
+        ),
+    ],
+)
+def test_get_transport_invalid(name, value, message, settings):
+    setattr(settings, name, value)
+
+    with pytest.raises(ImproperlyConfigured) as exc_info:
+        get_transport()
+
+    assert str(exc_info.value).startswith(message)
+
+
+@pytest.mark.parametrize(
+    ("transport_class", "module"),
+    [
+        (Urllib3Transport, "urllib3"),
+        (RequestsTransport, "requests"),
+        (HttpxTransport, "httpx"),
+    ],
+)
+def test_transport_requires_dependency(transport_class, module, monkeypatch):
+    monkeypatch.setitem(sys.modules, module, None)
+
+    with pytest.raises(ImproperlyConfigured) as exc_info:
+        transport_class()
+
+    assert str(exc_info.value) == (
+        f"{transport_class.__name__} requires {module} to be installed."
+    )
+
+
+def test_in_memory_transport(settings):
+    settings.DRF_RECAPTCHA_TRANSPORT = IN_MEMORY
+    settings.DRF_RECAPTCHA_TRANSPORT_OPTIONS = {
+        "response": lambda params: {"success": params["response"] == "good"},
+    }
+
+    assert client.submit("good", "secret", "4.3.2.1").is_valid is True
+    assert asyncio.run(client.asubmit("bad", "secret", "4.3.2.1")).is_valid is False
+    assert get_transport().requests == [
+        {"secret": "secret", "response": "good", "remoteip": "4.3.2.1"},
+        {"secret": "secret", "response": "bad", "remoteip": "4.3.2.1"},
+    ]
+
+
+def test_in_memory_transport_error_status(
+    settings,
+    mocked_serializer_field_with_request_context,
+):
+    settings.DRF_RECAPTCHA_TRANSPORT = IN_MEMORY
+    settings.DRF_RECAPTCHA_TRANSPORT_OPTIONS = {"status": 500}
+
+    with pytest.raises(HTTPError):
+        client.submit("token", "secret", "4.3.2.1")
+
+    validator = ReCaptchaV2Validator(secret_key="KEY")  # noqa: S106
+    with pytest.raises(ValidationError) as exc_info:
+        validator("token", mocked_serializer_field_with_request_context)
+
+    assert exc_info.value.detail[0].code == "captcha_error"
+
+
+def _use_transport(transport, settings):
+    module = {
+        "Urllib3Transport": "urllib3",
+        "RequestsTransport": "requests",
+        "HttpxTransport": "httpx",
+    }.get(transport.rsplit(".", 1)[1])
+    if module:
+        pytest.importorskip(module)
+    settings.DRF_RECAPTCHA_TRANSPORT = transport
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_transport_sends_to_siteverify(transport, siteverify_server, settings):
+    _use_transport(transport, settings)
+    settings.DRF_RECAPTCHA_SCHEME = "http"
+    settings.DRF_RECAPTCHA_DOMAIN = f"127.0.0.1:{siteverify_server.server_address[1]}"
+    siteverify_server.response = (200, {"success": True, "score": 0.9})
+
+    response = client.submit("token", "secret", "4.3.2.1")
+    aresponse = asyncio.run(client.asubmit("token", "secret", "4.3.2.1"))
+
+    assert response.is_valid is aresponse.is_valid is True
+    assert response.extra_data == aresponse.extra_data == {"score": 0.9}
+    assert b"response=token" in siteverify_server.requests[0]
+
+    siteverify_server.response = (503, {})
+    with pytest.raises(HTTPError) as exc_info:
+        client.submit("token", "secret", "4.3.2.1")
+    assert exc_info.value.code == 503
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_transport_refused_connection_is_connect_error(transport, settings):
+    # Connect errors are retried, so all transports have to report them alike.
+    _use_transport(transport, settings)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    settings.DRF_RECAPTCHA_SCHEME = "http"
+    settings.DRF_RECAPTCHA_DOMAIN = f"127.0.0.1:{port}"
+
+    with pytest.raises(ConnectError):
+        client.recaptcha_request(b"response=token")
+    with pytest.raises(ConnectError):
+        asyncio.run(client.arecaptcha_request(b"response=token"))
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_transport_sends_through_proxy(
+    transport,
+    siteverify_server,
+    proxy_server,
+    settings,
+):
+    _use_transport(transport, settings)
+    settings.DRF_RECAPTCHA_SCHEME = "http"
+    settings.DRF_RECAPTCHA_DOMAIN = f"127.0.0.1:{siteverify_server.server_address[1]}"
+    settings.DRF_RECAPTCHA_PROXY = {
+        "https": f"http://127.0.0.1:{proxy_server.server_address[1]}",
+    }
+
+    assert client.submit("token", "secret", "4.3.2.1").is_valid is True
+    assert asyncio.run(client.asubmit("token", "secret", "4.3.2.1")).is_valid is True
+
+    assert proxy_server.requests
+    assert len(siteverify_server.requests) == 2
+
+
+@pytest.fixture
+def dropping_server():
+    """
+    Server closing connections without a response once a request is read.
+    """
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            with connection:
+                connection.recv(65536)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server
+    server.close()
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_transport_dropped_connection_is_url_error(
+    transport,
+    dropping_server,
+    settings,
+):
+    _use_transport(transport, settings)
+    settings.DRF_RECAPTCHA_SCHEME = "http"
+    settings.DRF_RECAPTCHA_DOMAIN = f"127.0.0.1:{dropping_server.getsockname()[1]}"
+
+    # The request was sent, so it isn't safe to retry.
+    with pytest.raises(URLError) as exc_info:
+        client.recaptcha_request(b"response=token")
+    assert not isinstance(exc_info.value, ConnectError)
+    with pytest.raises(URLError) as exc_info:
+        asyncio.run(client.arecaptcha_request(b"response=token"))
+    assert not isinstance(exc_info.value, ConnectError)
@@ -1,6 +1,15 @@
+import contextlib
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from drf_recaptcha.client import RecaptchaResponse
-from drf_recaptcha.validators import ReCaptchaV2Validator, ReCaptchaV3Validator
+from drf_recaptcha.validators import (
+    RecaptchaResult,
+    ReCaptchaV2Validator,
+    ReCaptchaV3Validator,
+)
 from rest_framework.serializers import ValidationError
 
 
@@ -167,3 +176,189 @@ def test_recaptcha_validator_takes_secret_key_from_context(
         client_ip=mocker.ANY,
         value="test_token",
     )
+
+
+@pytest.mark.parametrize(
+    ("value", "overrides"),
+    [
+        ("x" * 8193, {}),
+        ("token with spaces", {}),
+        ("token.with.dots", {}),
+        ("short", {"DRF_RECAPTCHA_TOKEN_MIN_LENGTH": 10}),
+        ("long_token", {"DRF_RECAPTCHA_TOKEN_MAX_LENGTH": 5}),
+        ("Token", {"DRF_RECAPTCHA_TOKEN_PATTERN": r"[a-z]+"}),
+    ],
+)
+def test_validator_rejects_malformed_token(
+    value,
+    overrides,
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    for name, setting_value in overrides.items():
+        setattr(settings, name, setting_value)
+    submit = mocker.patch("drf_recaptcha.client.submit")
+    validator = ReCaptchaV2Validator(secret_key="TEST_SECRET_KEY")  # noqa: S106
+
+    with pytest.raises(ValidationError) as exc_info:
+        validator(value, mocked_serializer_field_with_request_context)
+
+    assert exc_info.value.detail[0].code == "captcha_invalid"
+    submit.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("value", "overrides"),
+    [
+        ("03AFcWeA6-_" * 100, {}),
+        ("token.with.dots", {"DRF_RECAPTCHA_TOKEN_PATTERN": None}),
+        ("token with spaces", {"DRF_RECAPTCHA_TESTING": True}),
+    ],
+)
+def test_validator_accepts_well_formed_token(
+    value,
+    overrides,
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    for name, setting_value in overrides.items():
+        setattr(settings, name, setting_value)
+    mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(is_valid=True),
+    )
+    validator = ReCaptchaV2Validator(secret_key="TEST_SECRET_KEY")  # noqa: S106
+
+    validator(value, mocked_serializer_field_with_request_context)
+
+
+def test_validator_attaches_result_to_field(
+    mocked_serializer_field_with_request_context,
+    mocker,
+):
+    mocker.patch(
+        "drf_recaptcha.client.submit",
+        return_value=RecaptchaResponse(
+            is_valid=True,
+            extra_data={"score": 0.6, "action": "act"},
+        ),
+    )
+    validator = ReCaptchaV3Validator(
+        action="act",
+        required_score=0.5,
+        secret_key="TEST_SECRET_KEY",  # noqa: S106
+    )
+
+    validator("token", mocked_serializer_field_with_request_context)
+
+    result = mocked_serializer_field_with_request_context.recaptcha_result
+    assert result == RecaptchaResult(outcome="pass", score=0.6, action="act")
+    assert result.is_valid is True
+    assert not hasattr(validator, "score")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.score = 1.0
+
+
+def test_validator_is_shared_across_threads(mocker):
+    mocker.patch(
+        "drf_recaptcha.client.submit",
+        side_effect=lambda recaptcha_response, **_: RecaptchaResponse(
+            is_valid=True,
+            extra_data={"score": int(recaptcha_response) / 100, "action": "act"},
+        ),
+    )
+    validator = ReCaptchaV3Validator(
+        action="act",
+        required_score=0.5,
+        secret_key="TEST_SECRET_KEY",  # noqa: S106
+    )
+    fields = [
+        mocker.Mock(context={"request": mocker.Mock(META={"REMOTE_ADDR": "4.3.2.1"})})
+        for _ in range(100)
+    ]
+
+    def verify(index):
+        with contextlib.suppress(ValidationError):
+            validator(str(index), fields[index])
+        return fields[index].recaptcha_result
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(verify, range(100)))
+
+    for index, result in enumerate(results):
+        assert result.score == index / 100
+        assert result.is_valid is (index >= 50)
+
+
+def test_recaptcha_response_fields():
+    response = RecaptchaResponse(
+        is_valid=True,
+        extra_data={
+            "score": 0.7,
+            "action": "login",
+            "hostname": "example.com",
+            "challenge_ts": "2026-10-18T12:00:00Z",
+        },
+    )
+
+    assert (response.score, response.action, response.hostname) == (
+        0.7,
+        "login",
+        "example.com",
+    )
+    assert response.challenge_ts == datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+    assert response.get_age(datetime(2026, 10, 18, 12, 1, tzinfo=timezone.utc)) == 60
+    assert not hasattr(response, "__dict__")
+
+
+def test_recaptcha_response_without_fields():
+    response = RecaptchaResponse(is_valid=True, extra_data={"challenge_ts": "bad"})
+
+    assert response.score is response.action is response.hostname is None
+    assert response.challenge_ts is None
+    assert response.get_age() is None
+
+
+def _solved_ago(seconds, hostname="example.com"):
+    challenge_ts = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    return RecaptchaResponse(
+        is_valid=True,
+        extra_data={
+            "hostname": hostname,
+            "challenge_ts": challenge_ts.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    ("allowed_hostnames", "max_token_age", "response", "is_valid"),
+    [
+        (["Example.com"], None, _solved_ago(10), True),
+        (["example.org"], None, _solved_ago(10), False),
+        (["example.com"], None, RecaptchaResponse(is_valid=True), False),
+        (None, 60, _solved_ago(10), True),
+        (None, 60, _solved_ago(90), False),
+        (None, 60, RecaptchaResponse(is_valid=True), False),
+    ],
+)
+def test_recaptcha_validator_local_checks(
+    settings,
+    mocked_serializer_field_with_request_context,
+    mocker,
+    allowed_hostnames,
+    max_token_age,
+    response,
+    is_valid,
+):
+    settings.DRF_RECAPTCHA_ALLOWED_HOSTNAMES = allowed_hostnames
+    settings.DRF_RECAPTCHA_MAX_TOKEN_AGE = max_token_age
+    validator = ReCaptchaV2Validator(secret_key="TEST_SECRET_KEY")  # noqa: S106
+    validator._get_captcha_response_with_payload = mocker.Mock(return_value=response)
+    field = mocked_serializer_field_with_request_context
+
+    with contextlib.nullcontext() if is_valid else pytest.raises(ValidationError):
+        validator("test_token", field)
+
+    assert field.recaptcha_result.outcome == ("pass" if is_valid else "captcha_invalid")